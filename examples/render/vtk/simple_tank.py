@@ -2,10 +2,9 @@ from math import sin, pi, cos, sqrt
 
 import numpy as np
 
-from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.revolution import RevolutionCreator, cylinder_profile
 from mesh.creators.transfinite import TransfiniteGridCreator
 from mesh.creators.union import SimpleUnion
-from mesh.node import NodeType
 from render.file.txt.plane import PlaneTextRenderer
 from render.file.vtk.plane import VtkXmlRenderer
 from render.graphic.vtk.plane import PlaneVtkRenderer
@@ -77,47 +76,17 @@ if __name__ == "__main__":
     N = 25
     creator = SimpleUnion([central_mesh(r, N), right_mesh(r, N), top_mesh(r, N)])
     bottom = creator.create()
-    top = bottom.copy()
+    top = bottom.copy()  # shares the topology, coordinates are replaced below
     bottom.reverse_elements()
-    for node in bottom.nodes:
-        coords = node.coords
-        z = -sqrt(R ** 2 - node.x ** 2 - node.y ** 2) + o1
-        node.coords = [node.x, node.y, z]
-    for node in top.nodes:
-        coords = node.coords
-        z = sqrt(R ** 2 - node.x ** 2 - node.y ** 2) + o2
-        node.coords = [node.x, node.y, z]
-    creator = PlaneGridCreator(0, l1, 1.0, L - l2 - l1, N * 2 - 1, N * 4)
-    central = creator.create()
-    for node in central.nodes:
-        coords = node.coords
-        phi = node.x * pi / 2
-        x = r * cos(phi)
-        y = r * sin(phi)
-        z = node.y
-        node.coords = [x, y, z]
-    creator = PlaneGridCreator(0, 0, 1.0, l1, N * 2 - 1, N)
-    bottom_j = creator.create()
-    for node in bottom_j.nodes:
-        coords = node.coords
-        phi = node.x * pi / 2
-        x = r * cos(phi)
-        y = r * sin(phi)
-        z = node.y
-        node.coords = [x, y, z]
-    creator = PlaneGridCreator(0, L - l2, 1.0, l2, N * 2 - 1, N)
-    top_j = creator.create()
-    for node in top_j.nodes:
-        coords = node.coords
-        phi = node.x * pi / 2
-        x = r * cos(phi)
-        y = r * sin(phi)
-        z = node.y
-        node.coords = [x, y, z]
+    height = np.sqrt(R ** 2 - np.sum(bottom.coordinates[:, :2] ** 2, axis=1))
+    bottom.transform(lambda coordinates: np.column_stack((coordinates[:, :2], o1 - height)))
+    top.transform(lambda coordinates: np.column_stack((coordinates[:, :2], o2 + height)))
+    # quarters of the shell: N * 2 - 1 nodes around the axis
+    central = RevolutionCreator(cylinder_profile(r, L - l2 - l1, N * 4, l1), N * 2 - 2, angle=pi / 2).create()
+    bottom_j = RevolutionCreator(cylinder_profile(r, l1, N), N * 2 - 2, angle=pi / 2).create()
+    top_j = RevolutionCreator(cylinder_profile(r, l2, N, L - l2), N * 2 - 2, angle=pi / 2).create()
     creator = SimpleUnion([top, top_j, bottom, bottom_j, central])
     mesh = creator.create()
-    for node in mesh.nodes:
-        node.node_type = NodeType.BORDER
     renderer = PlaneVtkRenderer("Rectangular Grid", values=[mesh.power(n) for n in mesh.nodes])
     renderer.render(mesh)
     text_render = PlaneTextRenderer(f"tank_n{N}.txt")
@@ -1,4 +1,5 @@
-from typing import List
+from abc import ABC, abstractmethod
+from typing import List, Tuple
 
 import numpy as np
 
@@ -7,7 +8,30 @@ from fem.quadrature.quadrature import QuadraturePoint
 from mesh.node import Node
 
 
-class IsoBeam2(FeaElement):
+class IsoBeam(FeaElement, ABC):
+    """The base of 1D isoparametric elements for a beam with calculations for many elements at once."""
+
+    @staticmethod
+    @abstractmethod
+    def parametric(xi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        pass
+
+    @classmethod
+    def batch_build(cls, x: np.ndarray, xi: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate shape functions, Jacobians and derivatives of shape functions of many elements.
+
+        :param x: an (E, k) array of local coordinates of nodes along axes of elements
+        :param xi: a (P,) array of parametric coordinates
+        :return: shape functions (P, k), Jacobians (E, P) and derivatives in x (E, P, k)
+        """
+        shapes, shape_dxi = cls.parametric(np.asarray(xi, dtype=float))
+        jacobian = np.asarray(x, dtype=float) @ shape_dxi.T  # j = l / 2 for evenly placed nodes
+        derivatives = shape_dxi[np.newaxis, :, :] / jacobian[:, :, np.newaxis]
+        return shapes, jacobian, derivatives
+
+
+class IsoBeam2(IsoBeam):
     """1D 2-nodes isoparametric element for a beam."""
     def __init__(self, nodes: List[Node]):
         super().__init__(nodes)
@@ -17,15 +41,22 @@ class IsoBeam2(FeaElement):
         self._jacobian = 0.0
         self._shapes = []
         self._derivatives = []
-        self._x = np.array([node.x for node in self._nodes])
+        self._x = np.array([node.x for node in self._nodes], dtype=float)
+
+    @staticmethod
+    def parametric(xi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate linear shape functions and their derivatives at parametric points.
+
+        :param xi: parametric coordinates of the shape S
+        :return: shape functions and derivatives in xi; every array has the shape S + (2,)
+        """
+        xi = np.asarray(xi, dtype=float)[..., np.newaxis]
+        signs = np.array([-1.0, 1.0])
+        return (1.0 + signs * xi) / 2.0, np.broadcast_to(signs / 2.0, xi.shape[:-1] + (2,))
 
     def build(self, point: QuadraturePoint):
-        xi = point.xi
-        self._shapes = [
-            (1.0 - xi) / 2.0,
-            (1.0 + xi) / 2.0
-        ]  # linear shape functions
-        shape_dxi = np.array([-0.5, 0.5])  # derivatives of the shape functions in the first parametric direction
+        self._shapes, shape_dxi = self.parametric(point.xi)  # linear shape functions and their derivatives
         jacobi = np.sum(shape_dxi * self._x)
         self._jacobian = jacobi  # j = l / 2
         inverted_jacobi = 1.0 / jacobi  # j^-1 = 2 / l
@@ -42,7 +73,7 @@ class IsoBeam2(FeaElement):
         return np.array(self._derivatives)
 
 
-class IsoBeam3(FeaElement):
+class IsoBeam3(IsoBeam):
     """1D 3-nodes isoparametric element for a beam. Order is following a__(a+b)/2__b: 0 - a, 1 - b, 2 - (a+b)/2"""
 
     def __init__(self, nodes: List[Node]):
@@ -58,20 +89,23 @@ class IsoBeam3(FeaElement):
         self._jacobian = 0.0
         self._shapes = []
         self._derivatives = []
-        self._x = np.array([node.x for node in self._nodes])
+        self._x = np.array([node.x for node in self._nodes], dtype=float)
+
+    @staticmethod
+    def parametric(xi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate quadratic shape functions and their derivatives at parametric points.
+
+        :param xi: parametric coordinates of the shape S
+        :return: shape functions and derivatives in xi; every array has the shape S + (3,)
+        """
+        xi = np.asarray(xi, dtype=float)
+        shapes = np.stack((xi * (xi - 1.0) / 2.0, xi * (xi + 1.0) / 2.0, 1.0 - xi * xi), axis=-1)
+        shape_dxi = np.stack((xi - 0.5, xi + 0.5, -2.0 * xi), axis=-1)
+        return shapes, shape_dxi
 
     def build(self, point: QuadraturePoint):
-        xi = point.xi
-        self._shapes = [
-            xi * (xi - 1.0) / 2.0,
-            xi * (xi + 1.0) / 2.0,
-            1.0 - xi * xi
-        ]  # quadratic shape functions
-        shape_dxi = np.array([
-            xi - 0.5,
-            xi + 0.5,
-            -2.0 * xi
-        ])  # derivatives of the shape functions in the first parametric direction
+        self._shapes, shape_dxi = self.parametric(point.xi)  # quadratic shape functions and their derivatives
         jacobi = np.sum(shape_dxi * self._x)
         self._jacobian = jacobi  # j = l / 2
         inverted_jacobi = 1.0 / jacobi  # j^-1 = 2 / l
@@ -86,3 +120,9 @@ class IsoBeam3(FeaElement):
 
     def derivatives(self) -> np.ndarray:
         return np.array(self._derivatives)
+
+
+BEAMS = {
+    2: IsoBeam2,
+    3: IsoBeam3
+}  # isoparametric elements for beams by the number of nodes
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 
@@ -29,3 +29,50 @@ class FeaElement(ABC):
 
     def nodes(self) -> List[Node]:
         return self._nodes
+
+
+class IsoPlane(FeaElement, ABC):
+    """The base of plane isoparametric elements (quadrilaterals, triangles) with batched evaluations for many elements."""
+
+    @staticmethod
+    @abstractmethod
+    def parametric(xi: np.ndarray, eta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        pass
+
+    @classmethod
+    def batch_jacobi(cls, coords: np.ndarray, xi: np.ndarray, eta: np.ndarray) -> np.ndarray:
+        """
+        Calculate Jacobi matrices of a batch of elements at a batch of parametric points.
+
+        :param coords: an (E, k, 2) array of coordinates of element nodes
+        :param xi: a (P,) array of the first parametric coordinates
+        :param eta: a (P,) array of the second parametric coordinates
+        :return: an (E, P, 2, 2) array, every matrix is [[dx/dxi, dy/dxi], [dx/deta, dy/deta]] as in `build`
+        """
+        _, shape_dxi, shape_deta = cls.parametric(xi, eta)
+        coords = np.asarray(coords, dtype=np.float64)  # Jacobi matrices are inverted in double precision
+        return np.stack(
+            (np.einsum("pk,ekd->epd", shape_dxi, coords), np.einsum("pk,ekd->epd", shape_deta, coords)),
+            axis=2
+        )
+
+    @classmethod
+    def batch_build(cls, coords: np.ndarray, xi: np.ndarray, eta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The batched version of `build`: evaluate shape functions, Jacobians and derivatives of shape functions
+        for a batch of elements at a batch of parametric points.
+
+        :param coords: an (E, k, 2) array of coordinates of element nodes
+        :param xi: a (P,) array of the first parametric coordinates
+        :param eta: a (P,) array of the second parametric coordinates
+        :return: shape functions (P, k), Jacobians (E, P) and derivatives in x and y (E, P, 2, k)
+        """
+        shapes, shape_dxi, shape_deta = cls.parametric(xi, eta)
+        jacobi = cls.batch_jacobi(coords, xi, eta)
+        jacobian = jacobi[..., 0, 0] * jacobi[..., 1, 1] - jacobi[..., 0, 1] * jacobi[..., 1, 0]
+        inverted = np.stack((
+            np.stack((jacobi[..., 1, 1], -jacobi[..., 0, 1]), axis=-1),
+            np.stack((-jacobi[..., 1, 0], jacobi[..., 0, 0]), axis=-1)
+        ), axis=-2) / jacobian[..., np.newaxis, np.newaxis]
+        derivatives = np.einsum("epij,jpk->epik", inverted, np.stack((shape_dxi, shape_deta)))
+        return shapes, jacobian, derivatives
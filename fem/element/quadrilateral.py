@@ -1,13 +1,18 @@
-from typing import List
+from abc import ABC
+from typing import List, Tuple
 
 import numpy as np
 
-from fem.element.element import FeaElement
+from fem.element.element import IsoPlane
 from fem.quadrature.quadrature import QuadraturePoint
 from mesh.node import Node
 
 
-class IsoQuad4(FeaElement):
+class IsoQuad(IsoPlane, ABC):
+    """The base of plane isoparametric elements for quadrilaterals with batched evaluations for many elements."""
+
+
+class IsoQuad4(IsoQuad):
     """The plane 4-nodes isoparametric element for a quadrilateral."""
 
     def __init__(self, nodes: List[Node]):
@@ -23,30 +28,31 @@ class IsoQuad4(FeaElement):
         self._jacobian = 0.0
         self._shapes = []
         self._derivatives = []
-        self._x = np.array([node.x for node in self._nodes])
-        self._y = np.array([node.y for node in self._nodes])
+        self._x = np.array([node.x for node in self._nodes], dtype=float)
+        self._y = np.array([node.y for node in self._nodes], dtype=float)
+
+    @staticmethod
+    def parametric(xi: np.ndarray, eta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the shape functions and their parametric derivatives at a batch of points.
+
+        :param xi: the first parametric coordinates as an array of any shape S
+        :param eta: the second parametric coordinates as an array of the same shape S
+        :return: shape functions, derivatives in xi, derivatives in eta; every array has the shape S + (4,)
+        """
+        xi = np.asarray(xi, dtype=float)[..., np.newaxis]
+        eta = np.asarray(eta, dtype=float)[..., np.newaxis]
+        sign_xi = np.array([-1.0, 1.0, 1.0, -1.0])
+        sign_eta = np.array([-1.0, -1.0, 1.0, 1.0])
+        shapes = (1.0 + sign_xi * xi) * (1.0 + sign_eta * eta) / 4.0  # bilinear shape functions
+        shape_dxi = sign_xi * (1.0 + sign_eta * eta) / 4.0
+        shape_deta = sign_eta * (1.0 + sign_xi * xi) / 4.0
+        return shapes, shape_dxi, shape_deta
 
     def build(self, point: QuadraturePoint):
         xi = point.xi
         eta = point.eta
-        self._shapes = [
-            (1.0 - xi) * (1.0 - eta) / 4.0,
-            (1.0 + xi) * (1.0 - eta) / 4.0,
-            (1.0 + xi) * (1.0 + eta) / 4.0,
-            (1.0 - xi) * (1.0 + eta) / 4.0
-        ]  # bilinear shape functions
-        shape_dxi = np.array([
-            -(1.0 - eta) / 4.0,
-            (1.0 - eta) / 4.0,
-            (1.0 + eta) / 4.0,
-            -(1.0 + eta) / 4.0
-        ])  # derivatives of the shape functions in the first parametric direction
-        shape_deta = np.array([
-            -(1.0 - xi) / 4.0,
-            -(1.0 + xi) / 4.0,
-            (1.0 + xi) / 4.0,
-            (1.0 - xi) / 4.0
-        ])  # derivatives of the shape functions in the second parametric direction
+        self._shapes, shape_dxi, shape_deta = self.parametric(xi, eta)  # bilinear shape functions and derivatives
         jacobi = np.array([
             [np.sum(shape_dxi * self._x), np.sum(shape_dxi * self._y)],
             [np.sum(shape_deta * self._x), np.sum(shape_deta * self._y)]
@@ -67,9 +73,23 @@ class IsoQuad4(FeaElement):
         return np.array(self._derivatives)
 
 
-class IsoQuad8(FeaElement):
+class IsoQuad8(IsoQuad):
     """The plane 8-nodes isoparametric element for a quadrilateral."""
 
+    WEIGHTS = np.array(
+        [
+            [-0.25,    0,    0,  0.25,    0.25,    0.25, -0.25, -0.25],
+            [-0.25,    0,    0, -0.25,    0.25,    0.25, -0.25,  0.25],
+            [-0.25,    0,    0,  0.25,    0.25,    0.25,  0.25,  0.25],
+            [-0.25,    0,    0, -0.25,    0.25,    0.25,  0.25, -0.25],
+            [0.5,      0, -0.5,     0,    -0.5,       0,   0.5,     0],
+            [0.5,    0.5,    0,     0,       0,    -0.5,      0, -0.5],
+            [0.5,      0,  0.5,     0,    -0.5,       0,   -0.5,    0],
+            [0.5,   -0.5,    0,     0,       0,    -0.5,      0,  0.5]
+        ],
+        dtype=float
+    )  # coefficients of the shape functions in the monomial basis
+
     def __init__(self, nodes: List[Node]):
         """
         Create an isoparametric element for a quadrilateral.
@@ -83,41 +103,42 @@ class IsoQuad8(FeaElement):
         self._jacobian = 0.0
         self._shapes = []
         self._derivatives = []
-        self._x = np.array([node.x for node in self._nodes])
-        self._y = np.array([node.y for node in self._nodes])
-        self._weights = np.array(
-            [
-                [-0.25,    0,    0,  0.25,    0.25,    0.25, -0.25, -0.25],
-                [-0.25,    0,    0, -0.25,    0.25,    0.25, -0.25,  0.25],
-                [-0.25,    0,    0,  0.25,    0.25,    0.25,  0.25,  0.25],
-                [-0.25,    0,    0, -0.25,    0.25,    0.25,  0.25, -0.25],
-                [0.5,      0, -0.5,     0,    -0.5,       0,   0.5,     0],
-                [0.5,    0.5,    0,     0,       0,    -0.5,      0, -0.5],
-                [0.5,      0,  0.5,     0,    -0.5,       0,   -0.5,    0],
-                [0.5,   -0.5,    0,     0,       0,    -0.5,      0,  0.5]
-            ],
-            dtype=float
-        )
+        self._x = np.array([node.x for node in self._nodes], dtype=float)
+        self._y = np.array([node.y for node in self._nodes], dtype=float)
+        self._weights = self.WEIGHTS
 
-    def build(self, point: QuadraturePoint):
-        xi = point.xi
-        eta = point.eta
-        n = np.array(
-            [1, xi, eta, xi * eta, xi * xi, eta * eta, xi * xi * eta, xi * eta * eta],
-            dtype=float
+    @staticmethod
+    def parametric(xi: np.ndarray, eta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the shape functions and their parametric derivatives at a batch of points.
+
+        :param xi: the first parametric coordinates as an array of any shape S
+        :param eta: the second parametric coordinates as an array of the same shape S
+        :return: shape functions, derivatives in xi, derivatives in eta; every array has the shape S + (8,)
+        """
+        xi = np.asarray(xi, dtype=float)
+        eta = np.asarray(eta, dtype=float)
+        zero = np.zeros_like(xi)
+        one = np.ones_like(xi)
+        n = np.stack(
+            [one, xi, eta, xi * eta, xi * xi, eta * eta, xi * xi * eta, xi * eta * eta],
+            axis=-1
         )  # 1,	x,	y,	xy,	x^2,	y^2,	x^2 y,	x y^2
-        dndxi = np.array(
-            [0, 1, 0, eta, 2.0 * xi, 0, 2.0 * xi * eta, eta * eta],
-            dtype=float
+        dndxi = np.stack(
+            [zero, one, zero, eta, 2.0 * xi, zero, 2.0 * xi * eta, eta * eta],
+            axis=-1
         )  # 0,	1,	0,	y,	2x,	0,	2xy,	y^2
-        dndeta = np.array(
-            [0, 0, 1, xi, 0, 2.0 * eta, xi * xi, 2.0 * xi * eta],
-            dtype=float
+        dndeta = np.stack(
+            [zero, zero, one, xi, zero, 2.0 * eta, xi * xi, 2.0 * xi * eta],
+            axis=-1
         )  # 0,	0,	1,	x,	0,	2y,	x^2,	2xy
+        weights = IsoQuad8.WEIGHTS.T
+        return np.dot(n, weights), np.dot(dndxi, weights), np.dot(dndeta, weights)
 
-        self._shapes = np.dot(self._weights, n)  # shape functions
-        shape_dxi = np.dot(self._weights, dndxi)  # derivatives of the shape functions in the first parametric direction
-        shape_deta = np.dot(self._weights, dndeta)  # derivatives of the shape functions in the second parametric direction
+    def build(self, point: QuadraturePoint):
+        xi = point.xi
+        eta = point.eta
+        self._shapes, shape_dxi, shape_deta = self.parametric(xi, eta)  # shape functions and derivatives
         jacobi = np.array([
             [np.sum(shape_dxi * self._x), np.sum(shape_dxi * self._y)],
             [np.sum(shape_deta * self._x), np.sum(shape_deta * self._y)]
@@ -136,3 +157,9 @@ class IsoQuad8(FeaElement):
 
     def derivatives(self) -> np.ndarray:
         return np.array(self._derivatives)
+
+
+QUADRILATERALS = {
+    4: IsoQuad4,
+    8: IsoQuad8
+}  # isoparametric elements for quadrilaterals by the number of nodes
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 
@@ -10,8 +10,8 @@ class PlaneBeamTransformer:
         self._nodes = nodes
         if len(nodes) < 2:
             raise Exception("At least 2 nodes are necessary to transform element.")
-        a = nodes[0].coords
-        b = nodes[1].coords
+        a = np.asarray(nodes[0].coords, dtype=float)
+        b = np.asarray(nodes[1].coords, dtype=float)
         ab = b - a
         l = np.linalg.norm(ab)
         x = ab[0]
@@ -23,19 +23,21 @@ class PlaneBeamTransformer:
                 [-y / l, x / l]
             ]
         )
-        self._local_nodes = [
-            Node(
-                coords=self.to_local(node.coords),
-                node_type=node.node_type,
-                id=node.id
-            ) for node in nodes
-        ]
+        self._local_nodes = None  # local nodes are created on demand
         self._inv_transform_matrix = np.linalg.inv(self._transform_matrix)
 
     def nodes(self):
         return self._nodes
 
     def local_nodes(self):
+        if self._local_nodes is None:
+            self._local_nodes = [
+                Node(
+                    coords=self.to_local(node.coords),
+                    node_type=node.node_type,
+                    id=node.id
+                ) for node in self._nodes
+            ]
         return self._local_nodes
 
     def transform_matrix(self):
@@ -50,28 +52,63 @@ class PlaneBeamTransformer:
     def to_global(self, coords: np.ndarray):
         return np.dot(self._inv_transform_matrix, coords) + self._origin
 
+    @staticmethod
+    def batch(coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Transform many beams at once: the axis x of a beam goes from its first node to the second one.
+
+        :param coords: an (E, k, 2) array of coordinates of nodes of beams
+        :return: transform matrices (E, 2, 2) as `transform_matrix`, local coordinates of nodes (E, k, 2)
+        and lengths of beams (E,)
+        """
+        coords = np.asarray(coords, dtype=float)[..., :2]
+        ab = coords[:, 1] - coords[:, 0]
+        lengths = np.hypot(ab[:, 0], ab[:, 1])
+        if np.any(lengths == 0.0):
+            raise Exception("Beams of zero length can't be transformed.")
+        c = ab[:, 0] / lengths
+        s = ab[:, 1] / lengths
+        matrices = np.stack((np.stack((c, s), axis=1), np.stack((-s, c), axis=1)), axis=1)
+        local = np.matmul(coords - coords[:, :1], np.swapaxes(matrices, 1, 2))
+        return matrices, local, lengths
+
+    @staticmethod
+    def batch_to_global(matrices: np.ndarray, origins: np.ndarray, local: np.ndarray) -> np.ndarray:
+        """
+        Transform local coordinates of many beams back to global ones.
+
+        :param matrices: an (E, 2, 2) array of transform matrices
+        :param origins: an (E, 2) array of first nodes of beams
+        :param local: an (E, P, 2) array of local coordinates of points
+        :return: an (E, P, 2) array of global coordinates
+        """
+        return np.matmul(local, matrices) + origins[:, np.newaxis, :]
+
 
 class ShellElementTransformer:
     def __init__(self, nodes: List[Node]):
         self._nodes = nodes
         if len(nodes) < 3:
             raise Exception("At least 3 nodes are necessary to transform element.")
-        a = nodes[0].coords
-        b = nodes[1].coords
-        c = nodes[2].coords
+        a = np.asarray(nodes[0].coords, dtype=float)
+        b = np.asarray(nodes[1].coords, dtype=float)
+        c = np.asarray(nodes[2].coords, dtype=float)
         self._transform_matrix = self.cosine(a, b, c)
-        self._local_nodes = [
-            Node(
-                coords=np.dot(self._transform_matrix, node.coords - a),
-                node_type=node.node_type,
-                id=node.id
-            ) for node in nodes
-        ]
+        self._local_nodes = None  # local nodes are created on demand
 
     def nodes(self):
         return self._nodes
 
     def local_nodes(self):
+        if self._local_nodes is None:
+            a = np.asarray(self._nodes[0].coords, dtype=float)
+            self._local_nodes = [
+                Node(
+                    coords=np.dot(self._transform_matrix, node.coords - a),
+                    node_type=node.node_type,
+                    id=node.id
+                ) for node in self._nodes
+            ]
         return self._local_nodes
 
     def transform_matrix(self):
@@ -99,3 +136,59 @@ class ShellElementTransformer:
             [vz[0], vz[1], vz[2]]
         ])
         return cosine_matrix
+
+    @staticmethod
+    def batch_cosine(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+        """
+        Build direction cosine matrices of many triangles at once as `cosine`.
+
+        :param a: an (E, 3) array of first vertices
+        :param b: an (E, 3) array of second vertices
+        :param c: an (E, 3) array of third vertices
+        :return: an (E, 3, 3) array, rows of a matrix are the local axes x, y, z
+        """
+        ab = b - a
+        n = np.cross(ab, c - a)
+        ab_norm = np.linalg.norm(ab, axis=1)
+        n_norm = np.linalg.norm(n, axis=1)
+        if np.any(ab_norm == 0.0) or np.any(n_norm == 0.0):
+            raise Exception("Degenerated elements can't be transformed.")
+        vx = ab / ab_norm[:, np.newaxis]
+        vz = n / n_norm[:, np.newaxis]
+        vy = np.cross(vz, vx)
+        return np.stack((vx, vy, vz), axis=1)
+
+    @staticmethod
+    def batch(coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Transform many elements at once: the origin is the first node, the axis x goes to the second node and the axis z
+        is normal to the plane of the first three nodes.
+
+        :param coords: an (E, k, 2 or 3) array of coordinates of nodes of elements
+        :return: transform matrices (E, 3, 3) as `transform_matrix` and local coordinates of nodes (E, k, 3)
+        """
+        coords = np.asarray(coords, dtype=float)
+        if coords.shape[2] < 3:
+            coords = np.concatenate((coords, np.zeros(coords.shape[:2] + (3 - coords.shape[2],))), axis=2)
+        matrices = ShellElementTransformer.batch_cosine(coords[:, 0], coords[:, 1], coords[:, 2])
+        local = np.matmul(coords - coords[:, :1], np.swapaxes(matrices, 1, 2))
+        return matrices, local
+
+    @staticmethod
+    def from_mesh(mesh, chunk: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Transform all elements of the surface mesh of one element type.
+
+        :param mesh: the mesh
+        :param chunk: the number of elements processed at once
+        :return: transform matrices (E, 3, 3) and local coordinates of nodes (E, k, 3)
+        """
+        coordinates = mesh.coordinates
+        connectivity = mesh.connectivity
+        matrices = np.empty((len(connectivity), 3, 3))
+        local = np.empty(connectivity.shape + (3,))
+        for start in range(0, len(connectivity), chunk):
+            matrices[start:start + chunk], local[start:start + chunk] = ShellElementTransformer.batch(
+                coordinates[connectivity[start:start + chunk]]
+            )
+        return matrices, local
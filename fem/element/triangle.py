@@ -0,0 +1,114 @@
+from abc import ABC
+from typing import List, Tuple
+
+import numpy as np
+
+from fem.element.element import IsoPlane
+from fem.quadrature.quadrature import QuadraturePoint
+from mesh.node import Node
+
+
+class IsoTri(IsoPlane, ABC):
+    """
+    The base of plane isoparametric elements for triangles. Parametric coordinates are the ones of the unit triangle
+    (0, 0), (1, 0), (0, 1) as of TriangleQuadrature.
+    """
+
+    nodes_number = 0  # the number of nodes of the element
+
+    def __init__(self, nodes: List[Node]):
+        """
+        Create an isoparametric element for a triangle.
+
+        :param nodes: a list of corners in the counterclockwise direction followed by mid-edge nodes if any
+        """
+        super().__init__(nodes)
+        if len(nodes) != self.nodes_number:
+            raise Exception(f"{type(self).__name__} requires {self.nodes_number} nodes to be built.")
+        self._jacobian = 0.0
+        self._shapes = []
+        self._derivatives = []
+        self._x = np.array([node.x for node in self._nodes], dtype=float)
+        self._y = np.array([node.y for node in self._nodes], dtype=float)
+
+    def build(self, point: QuadraturePoint):
+        self._shapes, shape_dxi, shape_deta = self.parametric(point.xi, point.eta)
+        jacobi = np.array([
+            [np.sum(shape_dxi * self._x), np.sum(shape_dxi * self._y)],
+            [np.sum(shape_deta * self._x), np.sum(shape_deta * self._y)]
+        ])  # Jacobi matrix
+        self._jacobian = np.linalg.det(jacobi)
+        inverted_jacobi = np.linalg.inv(jacobi)
+        shape_dx = inverted_jacobi[0, 0] * shape_dxi + inverted_jacobi[0, 1] * shape_deta
+        shape_dy = inverted_jacobi[1, 0] * shape_dxi + inverted_jacobi[1, 1] * shape_deta
+        self._derivatives = [shape_dx, shape_dy]
+
+    def jacobian(self) -> float:
+        return self._jacobian
+
+    def shapes(self) -> np.ndarray:
+        return np.array(self._shapes)
+
+    def derivatives(self) -> np.ndarray:
+        return np.array(self._derivatives)
+
+
+class IsoTri3(IsoTri):
+    """The plane 3-nodes isoparametric element for a triangle (the constant strain triangle)."""
+
+    nodes_number = 3
+
+    @staticmethod
+    def parametric(xi: np.ndarray, eta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the shape functions and their parametric derivatives at a batch of points.
+
+        :param xi: the first parametric coordinates as an array of any shape S
+        :param eta: the second parametric coordinates as an array of the same shape S
+        :return: shape functions, derivatives in xi, derivatives in eta; every array has the shape S + (3,)
+        """
+        xi = np.asarray(xi, dtype=float)
+        eta = np.asarray(eta, dtype=float)
+        shapes = np.stack((1.0 - xi - eta, xi, eta), axis=-1)
+        shape_dxi = np.broadcast_to(np.array([-1.0, 1.0, 0.0]), shapes.shape)
+        shape_deta = np.broadcast_to(np.array([-1.0, 0.0, 1.0]), shapes.shape)
+        return shapes, shape_dxi, shape_deta
+
+
+class IsoTri6(IsoTri):
+    """The plane 6-nodes isoparametric element for a triangle, the node 3 + j is the middle of the edge j, j + 1."""
+
+    nodes_number = 6
+
+    @staticmethod
+    def parametric(xi: np.ndarray, eta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the shape functions and their parametric derivatives at a batch of points.
+
+        :param xi: the first parametric coordinates as an array of any shape S
+        :param eta: the second parametric coordinates as an array of the same shape S
+        :return: shape functions, derivatives in xi, derivatives in eta; every array has the shape S + (6,)
+        """
+        xi = np.asarray(xi, dtype=float)
+        eta = np.asarray(eta, dtype=float)
+        zeta = 1.0 - xi - eta  # barycentric coordinates zeta, xi, eta of corners 0, 1, 2
+        zero = np.zeros_like(xi)
+        shapes = np.stack((
+            zeta * (2.0 * zeta - 1.0), xi * (2.0 * xi - 1.0), eta * (2.0 * eta - 1.0),
+            4.0 * zeta * xi, 4.0 * xi * eta, 4.0 * eta * zeta
+        ), axis=-1)
+        shape_dxi = np.stack((
+            1.0 - 4.0 * zeta, 4.0 * xi - 1.0, zero,
+            4.0 * (zeta - xi), 4.0 * eta, -4.0 * eta
+        ), axis=-1)
+        shape_deta = np.stack((
+            1.0 - 4.0 * zeta, zero, 4.0 * eta - 1.0,
+            -4.0 * xi, 4.0 * xi, 4.0 * (zeta - eta)
+        ), axis=-1)
+        return shapes, shape_dxi, shape_deta
+
+
+TRIANGLES = {
+    3: IsoTri3,
+    6: IsoTri6
+}  # isoparametric elements for triangles by the number of nodes
@@ -0,0 +1,119 @@
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+from fem.element.beam import BEAMS
+from fem.element.transformer import PlaneBeamTransformer
+from fem.mass import assemble_mass
+from fem.quadrature.legendre import IntervalQuadrature
+
+
+class PlaneFrame:
+    """
+    Members of a plane frame as Timoshenko beams: every node has the axial displacement u, the transverse displacement w
+    and the rotation theta. Shape functions of IsoBeam2 or IsoBeam3 interpolate all of them, the shear stiffness
+    is integrated by the reduced rule to avoid the shear locking.
+    """
+
+    dofs = 3  # the number of unknowns per node: u, w and theta
+
+    def __init__(self, young: float, area: float, inertia: float, poisson: float = 0.3, shear_factor: float = 5.0 / 6.0):
+        """
+        Create the frame section.
+
+        :param young: the Young's modulus
+        :param area: the area of the section
+        :param inertia: the second moment of the area of the section
+        :param poisson: the Poisson's ratio
+        :param shear_factor: the shear correction factor, 5 / 6 for rectangles
+        """
+        self.young = young
+        self.area = area
+        self.inertia = inertia
+        self.shear = young / (2.0 * (1.0 + poisson)) * shear_factor * area  # kGA
+
+    def local_stiffness(self, x: np.ndarray) -> np.ndarray:
+        """
+        Calculate stiffness matrices of members in their local axes.
+
+        :param x: an (E, k) array of local coordinates of nodes along axes of members
+        :return: an (E, 3 * k, 3 * k) array, unknowns of a node are u, w, theta
+        """
+        nodes_number = x.shape[1]
+        if nodes_number not in BEAMS:
+            raise Exception(f"beams with {nodes_number} nodes aren't supported")
+        element = BEAMS[nodes_number]
+        stiffness = np.zeros((len(x), nodes_number, 3, nodes_number, 3))
+        points, weights = IntervalQuadrature(nodes_number).arrays()
+        _, jacobian, derivatives = element.batch_build(x, points[:, 0])
+        weighted = weights * jacobian  # (E, P)
+        product = np.einsum("ep,epa,epb->eab", weighted, derivatives, derivatives)
+        stiffness[:, :, 0, :, 0] = self.young * self.area * product
+        stiffness[:, :, 2, :, 2] = self.young * self.inertia * product
+        # the shear strain w' - theta by the reduced rule
+        points, weights = IntervalQuadrature(nodes_number - 1).arrays()
+        shapes, jacobian, derivatives = element.batch_build(x, points[:, 0])
+        weighted = self.shear * weights * jacobian
+        stiffness[:, :, 1, :, 1] += np.einsum("ep,epa,epb->eab", weighted, derivatives, derivatives)
+        coupling = np.einsum("ep,epa,pb->eab", weighted, derivatives, shapes)
+        stiffness[:, :, 1, :, 2] -= coupling
+        stiffness[:, :, 2, :, 1] -= np.swapaxes(coupling, 1, 2)
+        stiffness[:, :, 2, :, 2] += np.einsum("ep,pa,pb->eab", weighted, shapes, shapes)
+        return stiffness.reshape(len(x), 3 * nodes_number, 3 * nodes_number)
+
+    def stiffness(self, coords: np.ndarray) -> np.ndarray:
+        """
+        Calculate stiffness matrices of members in global axes: K = T^T K' T.
+
+        :param coords: an (E, k, 2) array of coordinates of nodes, the order of IsoBeam2 or IsoBeam3
+        :return: an (E, 3 * k, 3 * k) array, unknowns of a node are u_x, u_y, theta
+        """
+        matrices, local, _ = PlaneBeamTransformer.batch(coords)
+        nodes_number = local.shape[1]
+        rotation = np.zeros((len(matrices), 3, 3))
+        rotation[:, :2, :2] = matrices
+        rotation[:, 2, 2] = 1.0
+        stiffness = self.local_stiffness(local[:, :, 0]).reshape(len(local), nodes_number, 3, nodes_number, 3)
+        stiffness = np.einsum("emi,eambn,enj->eaibj", rotation, stiffness, rotation, optimize=True)
+        return stiffness.reshape(len(local), 3 * nodes_number, 3 * nodes_number)
+
+    def assemble(self, coordinates: np.ndarray, connectivity: np.ndarray) -> csr_matrix:
+        """
+        Assemble the global stiffness matrix of the frame.
+
+        :param coordinates: an (N, 2) array of coordinates of nodes
+        :param connectivity: an (E, k) array of nodes of members
+        :return: the sparse (3 * N, 3 * N) matrix
+        """
+        connectivity = np.asarray(connectivity)
+        stiffness = self.stiffness(np.asarray(coordinates, dtype=float)[connectivity])
+        indices = (connectivity[:, :, None] * 3 + np.arange(3)).reshape(len(connectivity), -1)
+        size = indices.shape[1]
+        rows = np.repeat(indices, size, axis=1).ravel()
+        columns = np.tile(indices, (1, size)).ravel()
+        count = 3 * len(coordinates)
+        return coo_matrix((stiffness.ravel(), (rows, columns)), shape=(count, count)).tocsr()
+
+    def assemble_mass(
+            self, coordinates: np.ndarray, connectivity: np.ndarray, density: float, lumping: str = "consistent"
+    ) -> csr_matrix:
+        """
+        Assemble the global mass matrix of the frame: the translational mass rho A and the rotary inertia rho I
+        interpolated by shape functions of members. Both displacements have the same mass, so the matrix
+        doesn't depend on directions of members.
+
+        :param coordinates: an (N, 2) array of coordinates of nodes
+        :param connectivity: an (E, k) array of nodes of members
+        :param density: the density of the material
+        :param lumping: "consistent", "row_sum" or "hrz" (see fem.mass.LUMPINGS), lumped masses are diagonal
+        :return: the sparse (3 * N, 3 * N) matrix
+        """
+        connectivity = np.asarray(connectivity)
+        nodes_number = connectivity.shape[1]
+        if nodes_number not in BEAMS:
+            raise Exception(f"beams with {nodes_number} nodes aren't supported")
+        _, local, _ = PlaneBeamTransformer.batch(np.asarray(coordinates, dtype=float)[connectivity])
+        points, weights = IntervalQuadrature(nodes_number).arrays()
+        shapes, jacobian, _ = BEAMS[nodes_number].batch_build(local[:, :, 0], points[:, 0])
+        matrices = np.einsum("ep,pa,pb->eab", weights * jacobian, shapes, shapes)
+        densities = density * np.array([self.area, self.area, self.inertia])
+        return assemble_mass(matrices, connectivity, densities, len(coordinates), lumping)
@@ -0,0 +1,312 @@
+from typing import Callable, Tuple, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from fem.element.quadrilateral import QUADRILATERALS
+from fem.element.triangle import TRIANGLES
+from mesh.mesh import Mesh
+
+REFERENCES = {
+    "quadrilateral": (np.zeros(2), np.array([[a, b] for a in (-1.0, 0.0, 1.0) for b in (-1.0, 0.0, 1.0)])),
+    "triangle": (
+        np.full(2, 1.0 / 3.0), np.array([[a, b] for a in (0.0, 0.5, 1.0) for b in (0.0, 0.5, 1.0) if a + b <= 1.0])
+    )
+}  # parametric centers and points checking the affinity of mappings by reference elements
+
+
+def invert_mapping(
+        parametric: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        coords: np.ndarray,
+        points: np.ndarray,
+        tolerance: float = 1.0E-8,
+        max_iterations: int = 12,
+        initial: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find parametric coordinates of points by the Newton method applied to a batch of plane isoparametric elements.
+
+    :param parametric: the batched shape functions of the element type, e.g. `IsoQuad4.parametric`
+    :param coords: a (P, k, 2) array of coordinates of element nodes, one element per point
+    :param points: a (P, 2) array of points
+    :param tolerance: the tolerance of the Newton step in parametric coordinates
+    :param max_iterations: the maximal number of Newton iterations
+    :param initial: a (P, 2) array of the initial guess, the centers of elements by default
+    :return: a (P, 2) array of parametric coordinates (xi, eta) and the (P,) boolean array of converged points
+    """
+    count = len(points)
+    local = np.zeros((count, 2)) if initial is None else np.array(initial, dtype=float)
+    converged = np.zeros(count, dtype=bool)
+    bounded = np.zeros(count, dtype=bool)
+    active = np.arange(count)
+    x = coords[..., 0]
+    y = coords[..., 1]
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        xi = local[active, 0]
+        eta = local[active, 1]
+        shapes, shape_dxi, shape_deta = parametric(xi, eta)
+        xa = x[active]
+        ya = y[active]
+        rx = np.einsum("pk,pk->p", shapes, xa) - points[active, 0]
+        ry = np.einsum("pk,pk->p", shapes, ya) - points[active, 1]
+        x_xi = np.einsum("pk,pk->p", shape_dxi, xa)
+        y_xi = np.einsum("pk,pk->p", shape_dxi, ya)
+        x_eta = np.einsum("pk,pk->p", shape_deta, xa)
+        y_eta = np.einsum("pk,pk->p", shape_deta, ya)
+        det = x_xi * y_eta - x_eta * y_xi
+        det = np.where(np.abs(det) > 0.0, det, np.inf)
+        d_xi = -(y_eta * rx - x_eta * ry) / det
+        d_eta = -(x_xi * ry - y_xi * rx) / det
+        local[active, 0] = np.clip(xi + d_xi, -3.0, 3.0)  # keep far points of neighbor elements bounded
+        local[active, 1] = np.clip(eta + d_eta, -3.0, 3.0)
+        done = np.abs(d_xi) + np.abs(d_eta) < tolerance
+        clipped = np.any(np.abs(local[active]) >= 3.0, axis=1)
+        escaped = clipped & bounded[active]  # the point stays far outside the element
+        bounded[active] = clipped
+        converged[active[done & ~escaped]] = True
+        active = active[~(done | escaped)]
+    return local, converged
+
+
+class PointLocator:
+    """
+    The point location index of a plane mesh of isoparametric triangles and quadrilaterals (3, 4, 6 or 8 nodes,
+    types can be mixed). The index is a uniform grid of cells, every cell lists elements whose bounding boxes overlap
+    the cell. A point is tested only against elements of its cell. Parametric coordinates are the ones of the element
+    type: (xi, eta) in [-1; 1] x [-1; 1] for quadrilaterals, xi, eta >= 0 and xi + eta <= 1 for triangles.
+    """
+
+    def __init__(self, mesh: Mesh, elements_per_cell: float = 0.25, tolerance: float = 1.0E-8, chunk: int = 65536):
+        """
+        Build the index of the mesh.
+
+        :param mesh: the plane mesh of triangles and quadrilaterals
+        :param elements_per_cell: the mean number of elements in a cell of the grid
+        :param tolerance: the relative tolerance of parametric coordinates to accept a point as inner one
+        :param chunk: the number of points processed at once
+        """
+        self._mesh = mesh
+        self._coordinates = mesh.coordinates[:, :2]
+        self._tolerance = tolerance
+        self._chunk = chunk
+        elements_count = mesh.elements_count
+        self._blocks = mesh.blocks
+        self._nodes_number = max((block.nodes_number for block in self._blocks), default=0)
+        self._connectivity = np.full((elements_count, self._nodes_number), -1, dtype=np.int64)  # padded by -1
+        self._block_of = np.zeros(elements_count, dtype=np.int64)
+        self._triangles = np.zeros(elements_count, dtype=bool)
+        self._lower = np.zeros((elements_count, 2))
+        self._upper = np.zeros((elements_count, 2))
+        self._centers = np.zeros((elements_count, 2))
+        self._inverse_jacobi = np.zeros((elements_count, 2, 2))
+        self._affine = np.zeros(elements_count, dtype=bool)
+        for b, block in enumerate(self._blocks):
+            nodes_number = block.nodes_number
+            if nodes_number not in QUADRILATERALS and nodes_number not in TRIANGLES:
+                raise Exception(f"elements with {nodes_number} nodes aren't supported by the point locator")
+            ids = block.elements
+            self._connectivity[ids, :nodes_number] = block.connectivity
+            self._block_of[ids] = b
+            self._triangles[ids] = nodes_number in TRIANGLES
+            element_coords = self._coordinates[block.connectivity]
+            lower = element_coords.min(axis=1)
+            upper = element_coords.max(axis=1)
+            curved = nodes_number not in (3, 4)
+            padding = 0.05 * (upper - lower).max(axis=1, keepdims=True) if curved else 0.0  # curved edges
+            self._lower[ids] = lower - padding
+            self._upper[ids] = upper + padding
+            self._build_linearization(ids, self._parametric(b), self._reference(b), element_coords)
+        self._origin = self._lower.min(axis=0) if elements_count > 0 else np.zeros(2)
+        extent = np.maximum(self._upper.max(axis=0) - self._origin, np.finfo(float).tiny) if elements_count > 0 \
+            else np.ones(2)
+        cell = np.sqrt(np.prod(extent) * elements_per_cell / max(elements_count, 1))
+        cell = max(cell, extent.max() / 4096.0)
+        self._shape = np.maximum(np.ceil(extent / cell).astype(np.int64), 1)
+        self._cell = extent / self._shape
+        first = self._cell_index(self._lower)
+        last = self._cell_index(self._upper)
+        spans = last - first + 1
+        counts = spans[:, 0] * spans[:, 1]
+        elements = np.repeat(np.arange(elements_count), counts)
+        offsets = np.arange(len(elements)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells_x = first[elements, 0] + offsets // spans[elements, 1]
+        cells_y = first[elements, 1] + offsets % spans[elements, 1]
+        cells = cells_x * self._shape[1] + cells_y
+        order = np.argsort(cells, kind="stable")
+        self._cell_elements = elements[order]
+        self._cell_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(cells, minlength=int(np.prod(self._shape)))))
+        )
+        self._boxes = np.concatenate((self._lower, self._upper), axis=1)
+
+    def _parametric(self, block: int) -> Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """The batched shape functions of elements of the block"""
+        nodes_number = self._blocks[block].nodes_number
+        return (TRIANGLES if nodes_number in TRIANGLES else QUADRILATERALS)[nodes_number].parametric
+
+    def _reference(self, block: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The parametric center and sample points of the reference element of the block"""
+        return REFERENCES["triangle" if self._blocks[block].nodes_number in TRIANGLES else "quadrilateral"]
+
+    def _build_linearization(self, ids: np.ndarray, parametric, reference, element_coords: np.ndarray):
+        """
+        Linearize the mapping of every element of a block at its center. The linearization gives the first Newton step
+        at once and it is exact for affine elements (straight-sided triangles and parallelograms) which need no further
+        iterations.
+        """
+        center, samples = reference
+        shapes, _, _ = parametric(center[:1], center[1:])
+        _, shape_dxi, shape_deta = parametric(samples[:, 0], samples[:, 1])
+        _, center_dxi, center_deta = parametric(center[:1], center[1:])
+        dx = np.einsum("gk,ekd->egd", shape_dxi, element_coords)  # derivatives in xi at sample points
+        de = np.einsum("gk,ekd->egd", shape_deta, element_coords)  # derivatives in eta
+        self._centers[ids] = np.einsum("k,ekd->ed", shapes[0], element_coords)
+        jacobi = np.stack(
+            (np.einsum("k,ekd->ed", center_dxi[0], element_coords),
+             np.einsum("k,ekd->ed", center_deta[0], element_coords)),
+            axis=2
+        )  # columns are derivatives in xi and eta
+        det = jacobi[:, 0, 0] * jacobi[:, 1, 1] - jacobi[:, 0, 1] * jacobi[:, 1, 0]
+        regular = np.abs(det) > 0.0
+        det = np.where(regular, det, 1.0)
+        self._inverse_jacobi[ids] = np.stack((
+            np.stack((jacobi[:, 1, 1], -jacobi[:, 0, 1]), axis=1),
+            np.stack((-jacobi[:, 1, 0], jacobi[:, 0, 0]), axis=1)
+        ), axis=1) / det[:, np.newaxis, np.newaxis] * regular[:, np.newaxis, np.newaxis]
+        scale = np.abs(jacobi).max(axis=(1, 2))
+        deviation = np.maximum(
+            np.abs(dx - jacobi[:, np.newaxis, :, 0]).max(axis=(1, 2)),
+            np.abs(de - jacobi[:, np.newaxis, :, 1]).max(axis=(1, 2))
+        )
+        self._affine[ids] = regular & (deviation <= 1.0E-12 * scale)
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    def _cell_index(self, points: np.ndarray) -> np.ndarray:
+        index = np.floor((points - self._origin) / self._cell).astype(np.int64)
+        return np.clip(index, 0, self._shape - 1)
+
+    def locate(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find elements containing points and parametric coordinates of points in these elements.
+
+        :param points: a (P, 2) array of points, further coordinates are ignored
+        :return: a (P,) array of element indices (-1 for points outside the mesh) and a (P, 2) array of (xi, eta)
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))[:, :2]
+        elements = np.full(len(points), -1, dtype=np.int64)
+        local = np.full((len(points), 2), np.nan)
+        for start in range(0, len(points), self._chunk):
+            stop = min(start + self._chunk, len(points))
+            elements[start:stop], local[start:stop] = self._locate_chunk(points[start:stop])
+        return elements, local
+
+    def _locate_chunk(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        elements = np.full(len(points), -1, dtype=np.int64)
+        local = np.full((len(points), 2), np.nan)
+        inside = np.all((points >= self._origin) & (points <= self._origin + self._cell * self._shape), axis=1)
+        candidates = np.flatnonzero(inside)
+        index = self._cell_index(points[candidates])
+        cells = index[:, 0] * self._shape[1] + index[:, 1]
+        counts = self._cell_offsets[cells + 1] - self._cell_offsets[cells]
+        pairs_points = np.repeat(candidates, counts)
+        pairs_elements = self._cell_elements[
+            np.repeat(self._cell_offsets[cells] - np.cumsum(counts) + counts, counts) + np.arange(np.sum(counts))
+        ]
+        pairs_coords = points[pairs_points]
+        boxes = self._boxes[pairs_elements]
+        in_box = (pairs_coords[:, 0] >= boxes[:, 0]) & (pairs_coords[:, 1] >= boxes[:, 1]) & \
+                 (pairs_coords[:, 0] <= boxes[:, 2]) & (pairs_coords[:, 1] <= boxes[:, 3])
+        pairs_points = pairs_points[in_box]
+        pairs_elements = pairs_elements[in_box]
+        pairs_coords = pairs_coords[in_box]
+        pairs_local = self._centers_local(pairs_elements) + np.einsum(
+            "pij,pj->pi", self._inverse_jacobi[pairs_elements], pairs_coords - self._centers[pairs_elements]
+        )
+        converged = self._affine[pairs_elements]
+        for b, block in enumerate(self._blocks):
+            curved = np.flatnonzero(~converged & (self._block_of[pairs_elements] == b))
+            if len(curved) == 0:
+                continue
+            pairs_local[curved], converged[curved] = invert_mapping(
+                self._parametric(b),
+                self._coordinates[self._connectivity[pairs_elements[curved], :block.nodes_number]],
+                pairs_coords[curved],
+                initial=np.clip(pairs_local[curved], -3.0, 3.0)
+            )
+        accepted = converged & self._inside(pairs_elements, pairs_local)
+        pairs_points = pairs_points[accepted]
+        found, first = np.unique(pairs_points, return_index=True)
+        elements[found] = pairs_elements[accepted][first]
+        local[found] = pairs_local[accepted][first]
+        return elements, local
+
+    def _centers_local(self, elements: np.ndarray) -> np.ndarray:
+        """Parametric coordinates of centers of elements"""
+        return np.where(self._triangles[elements, np.newaxis], REFERENCES["triangle"][0], 0.0)
+
+    def _inside(self, elements: np.ndarray, local: np.ndarray) -> np.ndarray:
+        """Check if parametric coordinates are inside reference elements of elements with the tolerance"""
+        tolerance = self._tolerance
+        square = np.all(np.abs(local) <= 1.0 + tolerance, axis=1)
+        triangle = np.all(local >= -tolerance, axis=1) & (local.sum(axis=1) <= 1.0 + tolerance)
+        return np.where(self._triangles[elements], triangle, square)
+
+    def shapes(self, elements: np.ndarray, local: np.ndarray) -> np.ndarray:
+        """
+        Evaluate shape functions of located points.
+
+        :param elements: a (P,) array of element indices, -1 for points outside the mesh
+        :param local: a (P, 2) array of parametric coordinates
+        :return: a (P, k) array of shape functions padded by zeros (k is the largest number of nodes of elements),
+        zeros for points outside the mesh
+        """
+        result = np.zeros((len(elements), self._nodes_number))
+        blocks = np.where(elements >= 0, self._block_of[np.maximum(elements, 0)], -1)
+        for b, block in enumerate(self._blocks):
+            selected = np.flatnonzero(blocks == b)
+            shapes, _, _ = self._parametric(b)(local[selected, 0], local[selected, 1])
+            result[selected, :block.nodes_number] = shapes
+        return result
+
+    def _element_nodes(self, elements: np.ndarray) -> np.ndarray:
+        """Nodes of located elements padded by the node 0 with zero shape functions"""
+        return np.maximum(self._connectivity[np.maximum(elements, 0)], 0)
+
+    def interpolation_matrix(self, points: np.ndarray) -> Tuple[csr_matrix, np.ndarray]:
+        """
+        Build the sparse matrix of shape functions at points, so interpolation of any nodal field is a product.
+
+        :param points: a (P, 2) array of points
+        :return: the (P, N) interpolation matrix and the (P,) array of elements (-1 for points outside the mesh)
+        """
+        elements, local = self.locate(points)
+        shapes = self.shapes(elements, local)
+        nodes = self._element_nodes(elements)
+        matrix = csr_matrix(
+            (shapes.ravel(), nodes.ravel(), np.arange(0, shapes.size + 1, max(shapes.shape[1], 1))),
+            shape=(len(elements), len(self._coordinates))
+        )
+        matrix.eliminate_zeros()  # rows of outer points and padding
+        return matrix, elements
+
+    def interpolate(self, values: np.ndarray, points: np.ndarray, fill: float = np.nan) -> np.ndarray:
+        """
+        Interpolate nodal values at points by the shape functions of elements.
+
+        :param values: an (N,) or (N, c) array of nodal values
+        :param points: a (P, 2) array of points
+        :param fill: the value for points outside the mesh
+        :return: a (P,) or (P, c) array of interpolated values
+        """
+        values = np.asarray(values)
+        elements, local = self.locate(points)
+        shapes = self.shapes(elements, local)
+        nodes = self._element_nodes(elements)
+        result = np.einsum("pk,pk...->p...", shapes, values[nodes])
+        result[elements < 0] = fill
+        return result
@@ -0,0 +1,64 @@
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, diags
+
+
+def row_sum(matrices: np.ndarray) -> np.ndarray:
+    """
+    Lump element mass matrices by sums of rows. The total mass is kept, but masses of corners of quadratic
+    serendipity elements (e.g. IsoQuad8) are negative.
+
+    :param matrices: an (E, k, k) array of consistent element matrices of a scalar field
+    :return: an (E, k) array of lumped masses of nodes
+    """
+    return matrices.sum(axis=2)
+
+
+def hrz(matrices: np.ndarray) -> np.ndarray:
+    """
+    Lump element mass matrices by the Hinton-Rock-Zienkiewicz rule: diagonals scaled to keep the total mass.
+    Masses are always positive.
+
+    :param matrices: an (E, k, k) array of consistent element matrices of a scalar field
+    :return: an (E, k) array of lumped masses of nodes
+    """
+    diagonal = np.diagonal(matrices, axis1=1, axis2=2)
+    return diagonal * (matrices.sum(axis=(1, 2)) / diagonal.sum(axis=1))[:, np.newaxis]
+
+
+LUMPINGS = {
+    "row_sum": row_sum,
+    "hrz": hrz
+}  # lumpings of element mass matrices by names, "consistent" keeps matrices as they are
+
+
+def assemble_mass(
+        matrices: np.ndarray, connectivity: np.ndarray, densities, nodes_count: int, lumping: str = "consistent"
+) -> csr_matrix:
+    """
+    Assemble the global mass matrix of elements of one type. Every unknown of a node has the same shape functions,
+    so element matrices are the ones of a scalar field multiplied by densities of unknowns.
+
+    :param matrices: an (E, k, k) array of element matrices of the scalar field with the unit density
+    :param connectivity: an (E, k) array of nodes of elements
+    :param densities: a (dofs,) array of densities of unknowns of a node, e.g. (rho A, rho A, rho I) for beams
+    :param nodes_count: the number of nodes
+    :param lumping: "consistent" or a lumping from LUMPINGS
+    :return: the sparse (N * dofs, N * dofs) matrix, diagonal for lumpings
+    """
+    if lumping != "consistent" and lumping not in LUMPINGS:
+        raise Exception(f"unknown mass lumping {lumping}, use consistent or one of {tuple(LUMPINGS)}")
+    densities = np.atleast_1d(np.asarray(densities, dtype=float))
+    dofs = len(densities)
+    size = nodes_count * dofs
+    if lumping == "consistent":
+        # only the same unknowns of nodes are coupled: entries [e, a, c, b] of rows a * dofs + c, columns b * dofs + c
+        shape = (len(matrices), matrices.shape[1], dofs, matrices.shape[2])
+        components = np.arange(dofs)[:, np.newaxis]
+        rows = np.broadcast_to(connectivity[:, :, np.newaxis, np.newaxis] * dofs + components, shape)
+        columns = np.broadcast_to(connectivity[:, np.newaxis, np.newaxis, :] * dofs + components, shape)
+        local = np.einsum("eab,c->eacb", matrices, densities)
+        return coo_matrix((local.ravel(), (rows.ravel(), columns.ravel())), shape=(size, size)).tocsr()
+    lumped = np.einsum("ea,c->eac", LUMPINGS[lumping](matrices), densities)
+    indices = connectivity[:, :, np.newaxis] * dofs + np.arange(dofs)
+    diagonal = np.bincount(indices.ravel(), lumped.ravel(), minlength=size)
+    return diags(diagonal, format="csr")
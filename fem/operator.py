@@ -0,0 +1,274 @@
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, diags
+from scipy.sparse.linalg import LinearOperator
+
+from fem.element.quadrilateral import IsoQuad4, IsoQuad8
+from fem.element.triangle import IsoTri3, IsoTri6
+from fem.mass import assemble_mass
+from fem.quadrature.legendre import QuadrilateralQuadrature, TriangleQuadrature
+from mesh.mesh import Mesh
+
+PLANE_ELEMENTS = {
+    3: (IsoTri3, TriangleQuadrature, 1),
+    4: (IsoQuad4, QuadrilateralQuadrature, 2),
+    6: (IsoTri6, TriangleQuadrature, 2),
+    8: (IsoQuad8, QuadrilateralQuadrature, 3)
+}  # plane isoparametric elements, their quadrature rules and default orders by the number of nodes
+
+MASS_ORDERS = {
+    3: 2,
+    4: 2,
+    6: 4,
+    8: 3
+}  # orders of rules integrating products of shape functions exactly
+
+
+class OperatorBlock:
+    """Geometric data of elements of one type at quadrature points."""
+
+    def __init__(self, connectivity: np.ndarray, shapes: np.ndarray, reference: np.ndarray):
+        self.connectivity = connectivity  # (E, k)
+        self.shapes = shapes  # (Q, k)
+        self.reference = reference  # (Q, 2, k) derivatives of shape functions in xi and eta
+        self.inverse = np.empty((len(connectivity), len(shapes), 2, 2))  # inverse Jacobi matrices
+        self.weights = np.empty((len(connectivity), len(shapes)))  # weights multiplied by Jacobians and the thickness
+
+
+class MatrixFreeOperator(LinearOperator):
+    """
+    The stiffness operator K of a plane mesh of triangles and quadrilaterals (3, 4, 6 or 8 nodes, types can be mixed)
+    applied without assembling. Only the inverse Jacobi matrices and the weighted Jacobians at quadrature points
+    are stored: O(E * Q) memory. Elements are processed by blocks of one type (see `Mesh.blocks`).
+    An application gathers nodal values of elements, calculates gradients at quadrature points, applies
+    the physics and scatters element residuals back to nodes. Unknowns are interleaved: [u0x, u0y, u1x, u1y, ...].
+    Fixed unknowns are eliminated symmetrically: their rows and columns are replaced by the identity.
+    """
+
+    def __init__(self, mesh: Mesh, physics, order: Optional[int] = None, fixed=None, chunk: int = 65536):
+        """
+        Create the operator.
+
+        :param mesh: the plane mesh of triangles and quadrilaterals
+        :param physics: the problem, e.g. Poisson or PlaneElasticity from fem.physics
+        :param order: the order of quadrature rules of all blocks, by default 2 for 4-nodes, 3 for 8-nodes
+        quadrilaterals, 1 for 3-nodes and 2 for 6-nodes triangles (see PLANE_ELEMENTS)
+        :param fixed: indices or a boolean mask of the fixed (Dirichlet) unknowns
+        :param chunk: the number of elements processed at once
+        """
+        self._physics = physics
+        self._chunk = chunk
+        self._nodes_count = mesh.nodes_count
+        coordinates = mesh.coordinates[:, :2]
+        self._coordinates = coordinates
+        self._blocks = []
+        for block in mesh.blocks:
+            if block.nodes_number not in PLANE_ELEMENTS:
+                raise Exception(
+                    f"elements with {block.nodes_number} nodes aren't supported by the matrix-free operator"
+                )
+            element, quadrature, default = PLANE_ELEMENTS[block.nodes_number]
+            points, weights = quadrature(default if order is None else order).arrays()
+            shapes, shape_dxi, shape_deta = element.parametric(points[:, 0], points[:, 1])
+            data = OperatorBlock(block.connectivity, shapes, np.stack((shape_dxi, shape_deta), axis=1))
+            for start in range(0, len(block), chunk):
+                connectivity = block.connectivity[start:start + chunk]
+                jacobi = element.batch_jacobi(coordinates[connectivity], points[:, 0], points[:, 1])
+                det = jacobi[..., 0, 0] * jacobi[..., 1, 1] - jacobi[..., 0, 1] * jacobi[..., 1, 0]
+                if np.any(det <= 0.0):
+                    raise Exception("the mesh has degenerated or inverted elements")
+                data.inverse[start:start + chunk, :, 0, 0] = jacobi[..., 1, 1] / det
+                data.inverse[start:start + chunk, :, 0, 1] = -jacobi[..., 0, 1] / det
+                data.inverse[start:start + chunk, :, 1, 0] = -jacobi[..., 1, 0] / det
+                data.inverse[start:start + chunk, :, 1, 1] = jacobi[..., 0, 0] / det
+                data.weights[start:start + chunk] = det * weights * physics.thickness
+            self._blocks.append(data)
+        size = self._nodes_count * physics.dofs
+        self._fixed = np.zeros(size, dtype=bool)
+        if fixed is not None:
+            self._fixed[fixed] = True
+        super().__init__(dtype=np.float64, shape=(size, size))
+
+    @property
+    def physics(self):
+        return self._physics
+
+    @property
+    def fixed(self) -> np.ndarray:
+        """The boolean mask of fixed unknowns"""
+        return self._fixed
+
+    @property
+    def blocks(self):
+        """Data of blocks of elements at quadrature points"""
+        return self._blocks
+
+    def _chunks(self) -> Iterator[Tuple[OperatorBlock, slice]]:
+        """Iterate over chunks of elements of all blocks"""
+        for block in self._blocks:
+            for start in range(0, len(block.connectivity), self._chunk):
+                yield block, slice(start, start + self._chunk)
+
+    def _scatter_indices(self, connectivity: np.ndarray) -> np.ndarray:
+        """Indices of unknowns of elements: (E, k * dofs)"""
+        dofs = self._physics.dofs
+        return (connectivity[:, :, None] * dofs + np.arange(dofs)).reshape(len(connectivity), -1)
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """
+        Apply the stiffness operator without constraints.
+
+        :param values: an array of N * dofs nodal values
+        :return: an array of N * dofs residuals
+        """
+        dofs = self._physics.dofs
+        values = np.asarray(values, dtype=float).reshape(self._nodes_count, dofs)
+        result = np.zeros(self.shape[0])
+        for block, part in self._chunks():
+            reference = block.reference.reshape(-1, block.reference.shape[-1])  # (Q * 2, k)
+            inverse = block.inverse[part]  # (E, Q, 2, 2)
+            local = values[block.connectivity[part]]  # (E, k, dofs)
+            # gradients in xi and eta by one product for all elements, then the 2 x 2 transformation to x and y
+            gradient = np.matmul(reference, local).reshape(len(local), -1, 2, dofs)  # (E, Q, 2, dofs)
+            gradient = np.matmul(inverse, gradient)
+            flux = self._physics.flux(gradient) * block.weights[part, :, None, None]
+            flux = np.matmul(np.swapaxes(inverse, -1, -2), flux)
+            residual = np.matmul(reference.T, flux.reshape(len(local), -1, dofs))  # (E, k, dofs)
+            indices = self._scatter_indices(block.connectivity[part])
+            result += np.bincount(indices.ravel(), residual.ravel(), minlength=len(result))
+        return result
+
+    def _matvec(self, x):
+        x = np.asarray(x, dtype=float)
+        free = x.ravel().copy()
+        free[self._fixed] = 0.0
+        result = self.apply(free)
+        result[self._fixed] = x.ravel()[self._fixed]
+        return result.reshape(x.shape)
+
+    def _rmatvec(self, x):
+        return self._matvec(x)  # the operator is symmetric
+
+    def diagonal(self) -> np.ndarray:
+        """
+        Calculate the diagonal of the constrained operator, e.g. for the Jacobi preconditioner.
+
+        :return: an array of N * dofs diagonal entries
+        """
+        tensor = self._physics.tensor
+        result = np.zeros(self.shape[0])
+        for block, part in self._chunks():
+            derivatives = np.matmul(block.inverse[part], block.reference)  # (E, Q, 2, k)
+            local = np.einsum(
+                "eq,eqik,icjc,eqjk->ekc", block.weights[part], derivatives, tensor, derivatives, optimize=True
+            )
+            indices = self._scatter_indices(block.connectivity[part])
+            result += np.bincount(indices.ravel(), local.ravel(), minlength=len(result))
+        result[self._fixed] = 1.0
+        return result
+
+    def block_diagonal(self) -> np.ndarray:
+        """
+        Calculate the nodal blocks of the constrained operator, e.g. for the block Jacobi preconditioner.
+
+        :return: an (N, dofs, dofs) array of blocks coupling unknowns of every node
+        """
+        dofs = self._physics.dofs
+        tensor = self._physics.tensor
+        result = np.zeros((self._nodes_count, dofs * dofs))
+        for block, part in self._chunks():
+            derivatives = np.matmul(block.inverse[part], block.reference)
+            local = np.einsum(
+                "eq,eqik,icjd,eqjk->ekcd", block.weights[part], derivatives, tensor, derivatives, optimize=True
+            )
+            connectivity = block.connectivity[part].ravel()
+            for component in range(dofs * dofs):
+                result[:, component] += np.bincount(
+                    connectivity, local.reshape(-1, dofs * dofs)[:, component], minlength=self._nodes_count
+                )
+        result = result.reshape(self._nodes_count, dofs, dofs)
+        fixed = self._fixed.reshape(self._nodes_count, dofs)
+        result[fixed[:, :, None] | fixed[:, None, :]] = 0.0
+        nodes, components = np.nonzero(fixed)
+        result[nodes, components, components] = 1.0
+        return result
+
+    def to_sparse(self) -> csr_matrix:
+        """
+        Assemble the constrained operator, e.g. for small meshes, direct solvers or preconditioners.
+
+        :return: the sparse (N * dofs, N * dofs) matrix
+        """
+        tensor = self._physics.tensor
+        rows, columns, data = [], [], []
+        for block, part in self._chunks():
+            derivatives = np.matmul(block.inverse[part], block.reference)
+            local = np.einsum(
+                "eq,eqik,icjd,eqjm->ekcmd", block.weights[part], derivatives, tensor, derivatives, optimize=True
+            )
+            indices = self._scatter_indices(block.connectivity[part])
+            size = indices.shape[1]
+            rows.append(np.repeat(indices, size, axis=1).ravel())
+            columns.append(np.tile(indices, (1, size)).ravel())
+            data.append(local.ravel())
+        rows = np.concatenate(rows)
+        columns = np.concatenate(columns)
+        data = np.concatenate(data)
+        keep = ~(self._fixed[rows] | self._fixed[columns])
+        matrix = coo_matrix((data[keep], (rows[keep], columns[keep])), shape=self.shape).tocsr()
+        return matrix + diags(self._fixed.astype(float), format="csr")
+
+    def mass(self, density: float = 1.0, lumping: str = "consistent") -> csr_matrix:
+        """
+        Assemble the mass matrix by shape functions at points of MASS_ORDERS rules, e.g. for the modal analysis.
+        Rows and columns of fixed unknowns are zero, so their modes are infinite and aren't found by shift-invert.
+
+        :param density: the density of the material, the thickness of the physics is applied
+        :param lumping: "consistent", "row_sum" or "hrz" (see fem.mass.LUMPINGS), lumped masses are diagonal
+        :return: the sparse (N * dofs, N * dofs) matrix
+        """
+        densities = np.full(self._physics.dofs, density)
+        matrix = csr_matrix(self.shape)
+        for block, part in self._chunks():
+            nodes_number = block.connectivity.shape[1]
+            element, quadrature, _ = PLANE_ELEMENTS[nodes_number]
+            points, weights = quadrature(MASS_ORDERS[nodes_number]).arrays()
+            shapes, _, _ = element.parametric(points[:, 0], points[:, 1])
+            connectivity = block.connectivity[part]
+            jacobi = element.batch_jacobi(self._coordinates[connectivity], points[:, 0], points[:, 1])
+            det = jacobi[..., 0, 0] * jacobi[..., 1, 1] - jacobi[..., 0, 1] * jacobi[..., 1, 0]
+            matrices = np.einsum("eq,qa,qb->eab", det * weights * self._physics.thickness, shapes, shapes)
+            matrix += assemble_mass(matrices, connectivity, densities, self._nodes_count, lumping)
+        free = diags((~self._fixed).astype(float), format="csr")
+        return (free @ matrix @ free).tocsr()
+
+    def load(self, source) -> np.ndarray:
+        """
+        Calculate the consistent nodal load of the uniform source, e.g. the heat source or the body force.
+
+        :param source: a scalar or a vector of dofs components per area
+        :return: an array of N * dofs nodal loads
+        """
+        dofs = self._physics.dofs
+        source = np.broadcast_to(np.asarray(source, dtype=float), (dofs,))
+        result = np.zeros(self.shape[0])
+        for block, part in self._chunks():
+            local = np.einsum("eq,qk,c->ekc", block.weights[part], block.shapes, source)
+            indices = self._scatter_indices(block.connectivity[part])
+            result += np.bincount(indices.ravel(), local.ravel(), minlength=len(result))
+        return result
+
+    def constrain(self, rhs: np.ndarray, values=0.0) -> np.ndarray:
+        """
+        Lift the prescribed values of fixed unknowns to the right hand side.
+
+        :param rhs: an array of N * dofs loads
+        :param values: a scalar or an array of N * dofs prescribed values, only fixed entries are used
+        :return: the right hand side of the constrained system
+        """
+        prescribed = np.zeros(self.shape[0])
+        prescribed[self._fixed] = np.broadcast_to(np.asarray(values, dtype=float), self.shape[:1])[self._fixed]
+        result = np.asarray(rhs, dtype=float) - self.apply(prescribed)
+        result[self._fixed] = prescribed[self._fixed]
+        return result
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class Poisson:
+    """The scalar diffusion problem -div(k grad(u)) = f, e.g. the heat conduction or the potential flow."""
+
+    dofs = 1  # the number of unknowns per node
+
+    def __init__(self, conductivity: float = 1.0):
+        self._conductivity = conductivity
+        self.thickness = 1.0
+
+    @property
+    def conductivity(self) -> float:
+        return self._conductivity
+
+    @property
+    def tensor(self) -> np.ndarray:
+        """The constitutive tensor C[i, c, j, d] mapping the gradient g[j, d] = du_d / dx_j to the flux"""
+        return self._conductivity * np.eye(2).reshape(2, 1, 2, 1)
+
+    def flux(self, gradient: np.ndarray) -> np.ndarray:
+        """
+        Calculate fluxes by gradients.
+
+        :param gradient: a (..., 2, 1) array of gradients of the solution
+        :return: a (..., 2, 1) array of fluxes
+        """
+        return self._conductivity * gradient
+
+
+class PlaneElasticity:
+    """The linear elasticity of a plane body in the plane stress or the plane strain state."""
+
+    dofs = 2  # the number of unknowns per node: displacements along x and y
+
+    def __init__(self, young: float, poisson: float, thickness: float = 1.0, plane_stress: bool = True):
+        """
+        Create the plane elasticity problem.
+
+        :param young: the Young's modulus
+        :param poisson: the Poisson's ratio
+        :param thickness: the thickness of the plate
+        :param plane_stress: the plane stress state if True, the plane strain state otherwise
+        """
+        self._young = young
+        self._poisson = poisson
+        self.thickness = thickness
+        self._plane_stress = plane_stress
+        self._mu = young / (2.0 * (1.0 + poisson))
+        if plane_stress:
+            self._lambda = young * poisson / (1.0 - poisson * poisson)
+        else:
+            self._lambda = young * poisson / ((1.0 + poisson) * (1.0 - 2.0 * poisson))
+
+    @property
+    def young(self) -> float:
+        return self._young
+
+    @property
+    def poisson(self) -> float:
+        return self._poisson
+
+    @property
+    def plane_stress(self) -> bool:
+        return self._plane_stress
+
+    @property
+    def lame(self):
+        """The Lame parameters (lambda, mu) of the plane state"""
+        return self._lambda, self._mu
+
+    @property
+    def tensor(self) -> np.ndarray:
+        """The constitutive tensor C[i, c, j, d] mapping the gradient g[j, d] = du_d / dx_j to the stress"""
+        delta = np.eye(2)
+        return self._lambda * np.einsum("ic,jd->icjd", delta, delta) + \
+            self._mu * (np.einsum("ij,cd->icjd", delta, delta) + np.einsum("id,jc->icjd", delta, delta))
+
+    def flux(self, gradient: np.ndarray) -> np.ndarray:
+        """
+        Calculate stresses by gradients of displacements.
+
+        :param gradient: a (..., 2, 2) array of gradients g[j, d] = du_d / dx_j
+        :return: a (..., 2, 2) array of stress tensors
+        """
+        trace = gradient[..., 0, 0] + gradient[..., 1, 1]
+        stress = self._mu * (gradient + np.swapaxes(gradient, -1, -2))
+        stress[..., 0, 0] += self._lambda * trace
+        stress[..., 1, 1] += self._lambda * trace
+        return stress
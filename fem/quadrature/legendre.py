@@ -65,14 +65,16 @@ class TriangleQuadrature(Quadrature):
                 QuadraturePoint([1.0 / 5.0, 1.0 / 5.0], 25.0 / 96.0)
             ])
         else:
+            # the 6-points rule of Strang and Fix (Dunavant) exact for polynomials of the fourth degree
+            a, b = 0.445948490915965, 0.091576213509771
+            wa, wb = 0.223381589678011 / 2.0, 0.109951743655322 / 2.0
             p = array([
-                QuadraturePoint([0.0, 0.0], 1.0 / 40.0),
-                QuadraturePoint([0.5, 0.0], 1.0 / 15.0),
-                QuadraturePoint([1.0, 0.0], 1.0 / 40.0),
-                QuadraturePoint([0.5, 0.5], 1.0 / 15.0),
-                QuadraturePoint([0.0, 1.0], 1.0 / 40.0),
-                QuadraturePoint([0.0, 0.5], 1.0 / 15.0),
-                QuadraturePoint([1.0 / 3.0, 1.0 / 3.0], 9.0 / 40.0)
+                QuadraturePoint([a, a], wa),
+                QuadraturePoint([1.0 - 2.0 * a, a], wa),
+                QuadraturePoint([a, 1.0 - 2.0 * a], wa),
+                QuadraturePoint([b, b], wb),
+                QuadraturePoint([1.0 - 2.0 * b, b], wb),
+                QuadraturePoint([b, 1.0 - 2.0 * b], wb)
             ])
         return p
 
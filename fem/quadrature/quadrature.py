@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
 
 
 class QuadraturePoint:
     """The abstract of a point with a weight"""
 
+    __slots__ = ("_point", "_weight")
+
     def __init__(self, point: List[float], weight: float):
         self._point = point
         self._weight = weight
@@ -54,3 +58,12 @@ class Quadrature(ABC):
     @abstractmethod
     def points(self) -> List[QuadraturePoint]:
         pass
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the points of the rule into arrays for batched evaluations.
+
+        :return: a (P, dimension) array of coordinates and a (P,) array of weights
+        """
+        points = self.points()
+        return np.array([p.point for p in points], dtype=float), np.array([p.weight for p in points], dtype=float)
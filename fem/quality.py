@@ -0,0 +1,157 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from fem.element.quadrilateral import QUADRILATERALS
+from fem.element.triangle import TRIANGLES
+from fem.quadrature.legendre import QuadrilateralQuadrature, TriangleQuadrature
+from mesh.mesh import Mesh
+
+
+class QualityReport:
+    """Quality metrics of all elements of a mesh with histograms and the worst elements."""
+
+    WORST = {
+        "scaled_jacobian": np.argsort,
+        "aspect_ratio": lambda v: np.argsort(-v),
+        "skew": lambda v: np.argsort(-v),
+        "min_angle": np.argsort,
+        "max_angle": lambda v: np.argsort(-v)
+    }  # ordering of elements from the worst one for every metric
+
+    def __init__(self, metrics: Dict[str, np.ndarray]):
+        self._metrics = metrics
+
+    @property
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """Arrays of metrics by names, every array has a value per element"""
+        return self._metrics
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._metrics[name]
+
+    def histogram(self, name: str, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the histogram of the metric.
+
+        :param name: the name of the metric
+        :param bins: the number of bins
+        :return: counts of elements in bins and edges of bins
+        """
+        return np.histogram(self._metrics[name], bins=bins)
+
+    def worst(self, name: str, count: int = 10) -> np.ndarray:
+        """
+        Find the worst elements by the metric.
+
+        :param name: the name of the metric
+        :param count: the number of elements
+        :return: indices of elements from the worst one
+        """
+        return self.WORST[name](self._metrics[name])[:count]
+
+    def summary(self) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Summarize metrics.
+
+        :return: the minimum, the mean and the maximum of every metric
+        """
+        return {name: (float(np.min(v)), float(np.mean(v)), float(np.max(v))) for name, v in self._metrics.items()}
+
+    def __str__(self):
+        lines = [f"{'metric':<16} {'min':>12} {'mean':>12} {'max':>12} {'worst':>8}"]
+        for name, (low, mean, high) in self.summary().items():
+            lines.append(f"{name:<16} {low:12.6g} {mean:12.6g} {high:12.6g} {self.worst(name, 1)[0]:8d}")
+        return "\n".join(lines)
+
+
+def element_quality(mesh: Mesh, order: int = 2, chunk: int = 65536) -> QualityReport:
+    """
+    Calculate quality metrics of all triangles and quadrilaterals of a plane mesh at once, types can be mixed:
+    the scaled Jacobian (the minimum over corners and Gauss points, normalized to 1 for squares and equilateral
+    triangles), the aspect ratio (the longest edge by the shortest one), the skew (the cosine of the angle between
+    principal axes, 0 for triangles), the minimal and the maximal corner angles in degrees.
+
+    :param mesh: the plane mesh of 3-nodes or 6-nodes triangles and 4-nodes or 8-nodes quadrilaterals
+    :param order: the order of the Gauss rule for the scaled Jacobian
+    :param chunk: the number of elements processed at once
+    :return: the quality report
+    """
+    coordinates = mesh.coordinates[:, :2]
+    elements_count = mesh.elements_count
+    metrics = {name: np.empty(elements_count) for name in QualityReport.WORST}
+    for block in mesh.blocks:
+        nodes_number = block.nodes_number
+        if nodes_number in QUADRILATERALS:
+            block_metrics = _quadrilateral_quality(coordinates, block.connectivity, QUADRILATERALS[nodes_number], order,
+                                                   chunk)
+        elif nodes_number in TRIANGLES:
+            block_metrics = _triangle_quality(coordinates, block.connectivity, TRIANGLES[nodes_number], order, chunk)
+        else:
+            raise Exception(f"elements with {nodes_number} nodes aren't supported by quality metrics")
+        for name, values in block_metrics.items():
+            metrics[name][block.elements] = values
+    return QualityReport(metrics)
+
+
+def _corner_metrics(corners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Lengths of edges and corner angles in degrees of (E, c, 2) arrays of corners of polygons"""
+    edges = np.roll(corners, -1, axis=1) - corners  # the edge j goes from the corner j to the corner j + 1
+    lengths = np.linalg.norm(edges, axis=2)
+    forward = edges
+    backward = -np.roll(edges, 1, axis=1)
+    cross = forward[..., 0] * backward[..., 1] - forward[..., 1] * backward[..., 0]
+    dot = np.einsum("ejd,ejd->ej", forward, backward)
+    return lengths, np.degrees(np.arctan2(cross, dot)) % 360.0
+
+
+def _min_determinants(coordinates: np.ndarray, connectivity: np.ndarray, element, xi: np.ndarray, eta: np.ndarray,
+                      chunk: int, scaled: bool) -> np.ndarray:
+    """Minimal (scaled) determinants of Jacobi matrices of elements at parametric points"""
+    result = np.empty(len(connectivity))
+    for start in range(0, len(connectivity), chunk):
+        jacobi = element.batch_jacobi(coordinates[connectivity[start:start + chunk]], xi, eta)
+        det = jacobi[..., 0, 0] * jacobi[..., 1, 1] - jacobi[..., 0, 1] * jacobi[..., 1, 0]
+        if scaled:
+            det = det / (np.linalg.norm(jacobi[..., 0, :], axis=-1) * np.linalg.norm(jacobi[..., 1, :], axis=-1))
+        result[start:start + chunk] = np.min(det, axis=1)
+    return result
+
+
+def _quadrilateral_quality(coordinates: np.ndarray, connectivity: np.ndarray, element, order: int,
+                           chunk: int) -> Dict[str, np.ndarray]:
+    corners = coordinates[connectivity[:, :4]]
+    lengths, angles = _corner_metrics(corners)
+    axis_xi = corners[:, 1] + corners[:, 2] - corners[:, 0] - corners[:, 3]
+    axis_eta = corners[:, 2] + corners[:, 3] - corners[:, 0] - corners[:, 1]
+    skew = np.abs(np.einsum("ed,ed->e", axis_xi, axis_eta)) / (
+        np.linalg.norm(axis_xi, axis=1) * np.linalg.norm(axis_eta, axis=1)
+    )
+    gauss, _ = QuadrilateralQuadrature(order).arrays()
+    xi = np.concatenate(([-1.0, 1.0, 1.0, -1.0], gauss[:, 0]))
+    eta = np.concatenate(([-1.0, -1.0, 1.0, 1.0], gauss[:, 1]))
+    return {
+        "scaled_jacobian": _min_determinants(coordinates, connectivity, element, xi, eta, chunk, True),
+        "aspect_ratio": lengths.max(axis=1) / lengths.min(axis=1),
+        "skew": skew,
+        "min_angle": angles.min(axis=1),
+        "max_angle": angles.max(axis=1)
+    }
+
+
+def _triangle_quality(coordinates: np.ndarray, connectivity: np.ndarray, element, order: int,
+                      chunk: int) -> Dict[str, np.ndarray]:
+    corners = coordinates[connectivity[:, :3]]
+    lengths, angles = _corner_metrics(corners)
+    scaled = np.sin(np.radians(angles)).min(axis=1) * 2.0 / np.sqrt(3.0)
+    gauss, _ = TriangleQuadrature(order).arrays()
+    xi = np.concatenate(([0.0, 1.0, 0.0], gauss[:, 0]))
+    eta = np.concatenate(([0.0, 0.0, 1.0], gauss[:, 1]))
+    inverted = _min_determinants(coordinates, connectivity, element, xi, eta, chunk, False) <= 0.0
+    return {
+        "scaled_jacobian": np.where(inverted, -np.abs(scaled), scaled),
+        "aspect_ratio": lengths.max(axis=1) / lengths.min(axis=1),
+        "skew": np.zeros(len(connectivity)),
+        "min_angle": angles.min(axis=1),
+        "max_angle": angles.max(axis=1)
+    }
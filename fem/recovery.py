@@ -0,0 +1,186 @@
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, diags
+
+from fem.operator import MatrixFreeOperator
+from mesh.field import CellField, NodeField
+from mesh.mesh import Mesh
+
+BASES = {
+    1: lambda x, y: [np.ones_like(x), x, y],
+    2: lambda x, y: [np.ones_like(x), x, y, x * x, x * y, y * y]
+}  # polynomial bases of patches by degrees, the first term is the value at the node of the patch
+
+
+class GradientRecovery:
+    """
+    The recovery of nodal gradients and fluxes (e.g. stresses) from quadrature points of elements and error indicators
+    of elements by the difference of recovered and computed fluxes (the Zienkiewicz-Zhu estimator).
+    Quadrature points are the ones of the operator, they are numbered block by block, element by element.
+    The incidence of nodes and quadrature points of their elements is a sparse matrix built once: averaging is one
+    sparse product, the superconvergent patch recovery fits polynomials to all patches at once.
+    """
+
+    def __init__(self, mesh: Mesh, operator: MatrixFreeOperator, chunk: int = 65536):
+        """
+        Prepare the recovery.
+
+        :param mesh: the plane mesh of the operator
+        :param operator: the operator of the problem
+        :param chunk: the number of elements processed at once
+        """
+        self._mesh = mesh
+        self._operator = operator
+        self._chunk = chunk
+        self._coordinates = mesh.coordinates[:, :2]
+        points, weights, elements, rows, columns, shapes = [], [], [], [], [], []
+        offset = 0
+        for element_block, block in zip(mesh.blocks, operator.blocks):
+            count, size = block.weights.shape
+            connectivity = block.connectivity
+            points.append(np.einsum("qk,ekd->eqd", block.shapes, self._coordinates[connectivity]).reshape(-1, 2))
+            weights.append(block.weights.ravel())
+            elements.append(np.repeat(element_block.elements, size))
+            indices = offset + np.arange(count * size).reshape(count, size)
+            rows.append(np.broadcast_to(connectivity[:, np.newaxis, :], (count, size, connectivity.shape[1])).ravel())
+            columns.append(np.broadcast_to(indices[:, :, np.newaxis], (count, size, connectivity.shape[1])).ravel())
+            shapes.append(np.broadcast_to(block.shapes, (count,) + block.shapes.shape).ravel())
+            offset += count * size
+        self._points = np.concatenate(points) if points else np.zeros((0, 2))
+        self._weights = np.concatenate(weights) if weights else np.zeros(0)
+        self._elements = np.concatenate(elements) if elements else np.zeros(0, dtype=np.int64)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        columns = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+        shape = (mesh.nodes_count, offset)
+        # nodes by quadrature points of their elements: sorted by nodes, so rows are patches
+        self._incidence = coo_matrix((np.ones(len(rows)), (rows, columns)), shape=shape).tocsr()
+        # averaging weighted by areas of quadrature points
+        weighted = self._incidence @ diags(self._weights)
+        total = np.asarray(weighted.sum(axis=1)).ravel()
+        self._averaging = diags(np.divide(1.0, total, out=np.zeros_like(total), where=total > 0.0)) @ weighted
+        # interpolation of nodal values at quadrature points by shape functions
+        self._interpolation = csr_matrix(
+            (np.concatenate(shapes) if shapes else np.zeros(0), (columns, rows)), shape=shape[::-1]
+        )
+
+    @property
+    def points(self) -> np.ndarray:
+        """The (P, 2) array of coordinates of quadrature points"""
+        return self._points
+
+    @property
+    def weights(self) -> np.ndarray:
+        """The (P,) array of weights of quadrature points multiplied by Jacobians and the thickness"""
+        return self._weights
+
+    @property
+    def incidence(self) -> csr_matrix:
+        """The sparse (N, P) matrix of ones: a row is the patch of quadrature points of elements of the node"""
+        return self._incidence
+
+    def gradients(self, solution: np.ndarray) -> np.ndarray:
+        """
+        Calculate gradients of the solution at quadrature points of all elements.
+
+        :param solution: an array of N * dofs nodal values
+        :return: a (P, 2, dofs) array of gradients g[j, d] = du_d / dx_j
+        """
+        dofs = self._operator.physics.dofs
+        values = np.asarray(solution, dtype=float).reshape(self._mesh.nodes_count, dofs)
+        result = []
+        for block in self._operator.blocks:
+            for start in range(0, len(block.connectivity), self._chunk):
+                local = values[block.connectivity[start:start + self._chunk]]  # (E, k, dofs)
+                gradient = np.einsum("qik,ekd->eqid", block.reference, local)
+                result.append(np.matmul(block.inverse[start:start + self._chunk], gradient).reshape(-1, 2, dofs))
+        return np.concatenate(result) if result else np.zeros((0, 2, dofs))
+
+    def fluxes(self, solution: np.ndarray) -> np.ndarray:
+        """
+        Calculate fluxes (e.g. stresses) of the solution at quadrature points of all elements by the physics.
+
+        :param solution: an array of N * dofs nodal values
+        :return: a (P, 2, dofs) array of fluxes
+        """
+        return self._operator.physics.flux(self.gradients(solution))
+
+    def average(self, values: np.ndarray, name: str = "") -> NodeField:
+        """
+        Average values of quadrature points at nodes weighted by areas of quadrature points of adjacent elements.
+
+        :param values: a (P, ...) array of values at quadrature points, e.g. gradients or fluxes
+        :param name: the name of the field
+        :return: the (N,) field of scalars or the (N, c) field of flattened values
+        """
+        values = np.asarray(values, dtype=float)
+        averaged = self._averaging @ values.reshape(len(values), -1)
+        return NodeField(self._mesh, averaged.ravel() if values.ndim == 1 else averaged, name)
+
+    def patch(self, values: np.ndarray, degree: int = 1, name: str = "") -> NodeField:
+        """
+        Recover nodal values by the superconvergent patch recovery: a polynomial is fitted to values of quadrature
+        points of elements of every node by least squares, the value of the polynomial at the node is the recovered
+        one. Nodes with too few points (e.g. corners of the boundary) get averaged values.
+
+        :param values: a (P, ...) array of values at quadrature points, e.g. gradients or fluxes
+        :param degree: the degree of polynomials: 1 (linear) or 2 (quadratic, for quadratic elements)
+        :param name: the name of the field
+        :return: the (N,) field of scalars or the (N, c) field of flattened values
+        """
+        if degree not in BASES:
+            raise Exception(f"patches of degree {degree} aren't supported, the degrees are {', '.join(map(str, BASES))}")
+        values = np.asarray(values, dtype=float)
+        flat = values.reshape(len(values), -1)
+        count = self._mesh.nodes_count
+        indptr = self._incidence.indptr
+        counts = np.maximum(np.diff(indptr), 1)
+        nodes = np.repeat(np.arange(count), np.diff(indptr))
+        points = self._incidence.indices
+        # the sum over patches: pairs (node, point) are sorted by nodes, so a patch is a row of consecutive pairs
+        patches = csr_matrix((np.ones(len(points)), np.arange(len(points)), indptr), shape=(count, len(points)))
+        # local coordinates of points scaled by the size of the patch
+        offsets = self._points[points] - self._coordinates[nodes]
+        sizes = np.sqrt(patches @ np.sum(offsets * offsets, axis=1) / counts)
+        offsets /= np.where(sizes > 0.0, sizes, 1.0)[nodes, np.newaxis]
+        basis = np.stack(BASES[degree](offsets[:, 0], offsets[:, 1]), axis=1)  # (pairs, m)
+        terms = basis.shape[1]
+        matrices = (patches @ (basis[:, :, np.newaxis] * basis[:, np.newaxis, :]).reshape(-1, terms * terms))
+        matrices = matrices.reshape(count, terms, terms)
+        rhs = (patches @ (basis[:, :, np.newaxis] * flat[points][:, np.newaxis, :]).reshape(len(points), -1))
+        rhs = rhs.reshape(count, terms, flat.shape[1])
+        recovered = self._averaging @ flat
+        # a patch is solvable if the matrix of the scaled basis averaged over points isn't singular
+        solvable = np.abs(np.linalg.det(matrices / counts[:, np.newaxis, np.newaxis])) > 1.0E-8
+        if np.any(solvable):
+            recovered[solvable] = np.linalg.solve(matrices[solvable], rhs[solvable])[:, 0, :]
+        return NodeField(self._mesh, recovered.ravel() if values.ndim == 1 else recovered, name)
+
+    def indicators(self, values: np.ndarray, recovered: NodeField, name: str = "error") -> CellField:
+        """
+        Estimate errors of elements by the L2 norm of the difference of recovered values interpolated by shape
+        functions and values of quadrature points, e.g. to select elements for `Mesh.refine`.
+
+        :param values: a (P, ...) array of values at quadrature points, e.g. fluxes
+        :param recovered: the field recovered from the values by `average` or `patch`
+        :param name: the name of the field
+        :return: the (E,) field of errors of elements, the global error is the square root of the sum of squares
+        """
+        values = np.asarray(values, dtype=float)
+        flat = values.reshape(len(values), -1)
+        difference = self._interpolation @ np.asarray(recovered).reshape(self._mesh.nodes_count, -1) - flat
+        squares = np.bincount(
+            self._elements, self._weights * np.sum(difference * difference, axis=1), minlength=self._mesh.elements_count
+        )
+        return CellField(self._mesh, np.sqrt(squares), name)
+
+    def relative_error(self, values: np.ndarray, recovered: NodeField) -> float:
+        """
+        Estimate the global relative error: the estimated error by the norm of the recovered field and the error.
+
+        :param values: a (P, ...) array of values at quadrature points
+        :param recovered: the field recovered from the values
+        :return: the relative error
+        """
+        error = np.sum(self.indicators(values, recovered).values ** 2)
+        star = self._interpolation @ np.asarray(recovered).reshape(self._mesh.nodes_count, -1)
+        norm = np.sum(self._weights * np.sum(star * star, axis=1))
+        return float(np.sqrt(error / (norm + error))) if norm + error > 0.0 else 0.0
@@ -0,0 +1,118 @@
+import weakref
+from collections import OrderedDict
+from time import perf_counter
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+
+
+class DirectStatistics:
+    """Timings of a direct solution."""
+
+    def __init__(self, factorization_time: float, solve_time: float, cached: bool, right_hand_sides: int):
+        self.factorization_time = factorization_time  # seconds, 0 if the factor was taken from the cache
+        self.solve_time = solve_time  # seconds spent on forward and backward substitutions
+        self.cached = cached  # True if the factor was taken from the cache
+        self.right_hand_sides = right_hand_sides
+
+    def __str__(self):
+        return (
+            f"factorization: {self.factorization_time:.3f} s{' (cached)' if self.cached else ''}, "
+            f"solve: {self.solve_time:.3f} s for {self.right_hand_sides} right hand sides"
+        )
+
+
+class DirectSolver:
+    """
+    The sparse LU solver factorizing a matrix once for many load cases. Factors are cached by the identity of
+    the matrix object while it is alive, so a matrix modified in place must be refreshed by `forget`.
+    Rows and columns are reordered to reduce the fill-in; symmetric orderings keep the diagonal pivots.
+    """
+
+    ORDERINGS = {
+        "natural": "NATURAL",
+        "mmd_at_plus_a": "MMD_AT_PLUS_A",
+        "mmd_ata": "MMD_ATA",
+        "colamd": "COLAMD"
+    }  # SuperLU column permutations: multiple minimum degree of A^T + A or A^T A, column approximate minimum degree
+
+    SYMMETRIC = ("mmd_at_plus_a", "natural")  # orderings keeping the symmetry of the matrix
+
+    def __init__(self, ordering: str = "mmd_at_plus_a", cache_size: int = 4):
+        """
+        Create the solver.
+
+        :param ordering: the fill-reducing ordering from ORDERINGS, "mmd_at_plus_a" suits symmetric matrices
+        :param cache_size: the number of factors kept, the least recently used factor is dropped first
+        """
+        if ordering not in self.ORDERINGS:
+            raise Exception(f"unknown ordering {ordering}, use one of {tuple(self.ORDERINGS)}")
+        self._ordering = ordering
+        self._cache_size = cache_size
+        self._factors = OrderedDict()  # id of a matrix -> (the weak reference, the factor)
+
+    def __len__(self):
+        return len(self._factors)
+
+    def factorize(self, matrix):
+        """
+        Factorize the matrix or take its factor from the cache.
+
+        :param matrix: the sparse square matrix
+        :return: the factor with the `solve` method and the time of the factorization, None for the cached one
+        """
+        key = id(matrix)
+        entry = self._factors.get(key)
+        if entry is not None and entry[0]() is matrix:
+            self._factors.move_to_end(key)
+            return entry[1], None
+        if matrix.shape[0] != matrix.shape[1]:
+            raise Exception("the direct solver requires a square matrix")
+        start = perf_counter()
+        options = dict(permc_spec=self.ORDERINGS[self._ordering])
+        if self._ordering in self.SYMMETRIC:
+            options.update(diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+        factor = splu(csc_matrix(matrix, dtype=float), **options)
+        elapsed = perf_counter() - start
+        self._factors[key] = (weakref.ref(matrix, self._expire), factor)
+        while len(self._factors) > self._cache_size:
+            self._factors.popitem(last=False)
+        return factor, elapsed
+
+    def _expire(self, reference):
+        """Drop the factor of the collected matrix unless its identifier is reused by another one"""
+        for key, (stored, _) in list(self._factors.items()):
+            if stored is reference:
+                del self._factors[key]
+
+    def forget(self, matrix=None):
+        """
+        Drop the cached factor of the matrix or all factors.
+
+        :param matrix: the matrix or None to drop all factors
+        """
+        if matrix is None:
+            self._factors.clear()
+        else:
+            self._factors.pop(id(matrix), None)
+
+    def solve(self, matrix, rhs: np.ndarray):
+        """
+        Solve A X = B for a block of right hand sides at once.
+
+        :param matrix: the sparse square matrix
+        :param rhs: an (n,) or an (n, k) array of right hand sides
+        :return: the solution of the shape of rhs and statistics
+        """
+        factor, factorization_time = self.factorize(matrix)
+        rhs = np.asarray(rhs, dtype=float)
+        start = perf_counter()
+        solution = factor.solve(np.ascontiguousarray(rhs))
+        statistics = DirectStatistics(
+            factorization_time or 0.0,
+            perf_counter() - start,
+            factorization_time is None,
+            1 if rhs.ndim == 1 else rhs.shape[1]
+        )
+        return solution, statistics
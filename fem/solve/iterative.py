@@ -0,0 +1,218 @@
+import weakref
+from copy import copy
+from time import perf_counter
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy.sparse.linalg import aslinearoperator
+
+from fem.solve.preconditioner import PRECONDITIONERS, Preconditioner
+from mesh.mesh import Mesh
+
+
+class SolverStatistics:
+    """The history of an iterative solution: residuals and elapsed times after every iteration."""
+
+    def __init__(self, method: str, setup_time: float, cached: bool):
+        self.method = method
+        self.setup_time = setup_time  # seconds spent on the preconditioner setup
+        self.cached = cached  # True if the preconditioner was taken from the cache
+        self.residuals = []  # relative residual norms, the first one is the initial residual
+        self.times = []  # seconds elapsed from the start of iterations
+        self.converged = False
+
+    @property
+    def iterations(self) -> int:
+        return max(len(self.residuals) - 1, 0)
+
+    @property
+    def solve_time(self) -> float:
+        return self.times[-1] if self.times else 0.0
+
+    def record(self, residual: float, start: float):
+        self.residuals.append(residual)
+        self.times.append(perf_counter() - start)
+
+    def __str__(self):
+        return (
+            f"{self.method}: {self.iterations} iterations, converged: {self.converged}, "
+            f"residual: {self.residuals[-1] if self.residuals else float('nan'):.3e}, "
+            f"setup: {self.setup_time:.3f} s{' (cached)' if self.cached else ''}, solve: {self.solve_time:.3f} s"
+        )
+
+
+class IterativeSolver:
+    """
+    Preconditioned Krylov solvers of symmetric systems: the conjugate gradients for positive definite matrices and
+    MINRES for indefinite ones. Matrices can be sparse or matrix-free (e.g. MatrixFreeOperator).
+    Preconditioners are cached by the mesh for the matrix object while it is alive, so repeated solves of the same
+    system don't build them again; they are dropped when the topology changes or nodes are moved. A matrix modified
+    in place must be solved with another key.
+    """
+
+    METHODS = ("cg", "minres")
+
+    def __init__(
+            self,
+            method: str = "cg",
+            preconditioner: Union[str, Preconditioner] = "jacobi",
+            tolerance: float = 1.0E-8,
+            max_iterations: Optional[int] = None,
+            warm_start: bool = False
+    ):
+        """
+        Create the solver.
+
+        :param method: "cg" or "minres"
+        :param preconditioner: the name from PRECONDITIONERS or the preconditioner
+        :param tolerance: the relative residual of the convergence: |r| <= tolerance * |b|
+        :param max_iterations: the maximal number of iterations, 10 * n by default
+        :param warm_start: start from the previous solution of the same size if no initial guess is given
+        """
+        if method not in self.METHODS:
+            raise Exception(f"unknown method {method}, use one of {self.METHODS}")
+        if isinstance(preconditioner, str):
+            if preconditioner not in PRECONDITIONERS:
+                raise Exception(f"unknown preconditioner {preconditioner}, use one of {tuple(PRECONDITIONERS)}")
+            preconditioner = PRECONDITIONERS[preconditioner]()
+        self._method = method
+        self._preconditioner = preconditioner
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+        self._warm_start = warm_start
+        self._previous = None
+
+    @property
+    def preconditioner(self) -> Preconditioner:
+        return self._preconditioner
+
+    def _prepare(self, matrix, mesh: Optional[Mesh], key) -> Tuple[Preconditioner, float, bool]:
+        """Set up the preconditioner or take it from the cache of the mesh"""
+        start = perf_counter()
+        if mesh is None:
+            self._preconditioner.setup(matrix)
+            return self._preconditioner, perf_counter() - start, False
+        # the identity of the matrix distinguishes systems of the same size, e.g. of other materials,
+        # the preconditioner is dropped with the matrix, so its identifier can't be reused by another one
+        cache_key = ("preconditioner", self._preconditioner.key(), id(matrix), key)
+        built = []
+
+        def build():
+            preconditioner = copy(self._preconditioner)
+            preconditioner.setup(matrix)
+            built.append(True)
+            return weakref.ref(matrix, lambda _: mesh.forget(cache_key)), preconditioner
+
+        _, preconditioner = mesh.cached(cache_key, build)
+        return preconditioner, perf_counter() - start, not built
+
+    def solve(self, matrix, rhs: np.ndarray, initial: Optional[np.ndarray] = None, mesh: Optional[Mesh] = None,
+              key=None) -> Tuple[np.ndarray, SolverStatistics]:
+        """
+        Solve the symmetric system A x = b.
+
+        :param matrix: the sparse matrix or the linear operator
+        :param rhs: an array of n right hand sides
+        :param initial: the initial guess, e.g. the solution of the previous step
+        :param mesh: the mesh of the system to cache the preconditioner until its topology changes or nodes move
+        :param key: the hashable key distinguishing versions of the same matrix object, e.g. changed in place
+        :return: the solution and statistics
+        """
+        preconditioner, setup_time, cached = self._prepare(matrix, mesh, key)
+        statistics = SolverStatistics(self._method, setup_time, cached)
+        operator = aslinearoperator(matrix)
+        rhs = np.asarray(rhs, dtype=float).ravel()
+        if initial is None and self._warm_start and self._previous is not None and len(self._previous) == len(rhs):
+            initial = self._previous
+        solution = np.zeros(len(rhs)) if initial is None else np.array(initial, dtype=float).ravel()
+        max_iterations = self._max_iterations if self._max_iterations is not None else 10 * len(rhs)
+        if self._method == "cg":
+            self._cg(operator, preconditioner, rhs, solution, max_iterations, statistics)
+        else:
+            self._minres(operator, preconditioner, rhs, solution, max_iterations, statistics)
+        self._previous = solution
+        return solution, statistics
+
+    def _cg(self, operator, preconditioner, rhs, solution, max_iterations, statistics):
+        """The preconditioned conjugate gradients updating the solution in place"""
+        start = perf_counter()
+        norm = np.linalg.norm(rhs) or 1.0
+        residual = rhs - operator.matvec(solution) if np.any(solution) else rhs.copy()
+        statistics.record(np.linalg.norm(residual) / norm, start)
+        if statistics.residuals[-1] <= self._tolerance:
+            statistics.converged = True
+            return
+        correction = preconditioner.apply(residual)
+        direction = correction.copy()
+        product = residual @ correction
+        for _ in range(max_iterations):
+            image = operator.matvec(direction)
+            curvature = direction @ image
+            if curvature <= 0.0:
+                raise Exception("the conjugate gradients require a positive definite matrix, use MINRES")
+            step = product / curvature
+            solution += step * direction
+            residual -= step * image
+            statistics.record(np.linalg.norm(residual) / norm, start)
+            if statistics.residuals[-1] <= self._tolerance:
+                statistics.converged = True
+                return
+            correction = preconditioner.apply(residual)
+            product, previous = residual @ correction, product
+            direction *= product / previous
+            direction += correction
+
+    def _minres(self, operator, preconditioner, rhs, solution, max_iterations, statistics):
+        """
+        The preconditioned MINRES (Elman, Silvester, Wathen, algorithm 2.4) updating the solution in place.
+        Residuals are estimated in the norm of the preconditioner and scaled by the initial one.
+        """
+        start = perf_counter()
+        norm = np.linalg.norm(rhs) or 1.0
+        v = rhs - operator.matvec(solution) if np.any(solution) else rhs.copy()
+        statistics.record(np.linalg.norm(v) / norm, start)
+        if statistics.residuals[-1] <= self._tolerance:
+            statistics.converged = True
+            return
+        z = preconditioner.apply(v)
+        gamma = np.sqrt(v @ z)
+        if not gamma > 0.0:
+            raise Exception("MINRES requires a positive definite preconditioner")
+        eta = gamma
+        scale = statistics.residuals[0] / gamma
+        v_previous = np.zeros_like(v)
+        w = np.zeros_like(v)
+        w_previous = np.zeros_like(v)
+        gamma_previous = 1.0
+        c, c_previous, s, s_previous = 1.0, 1.0, 0.0, 0.0
+        for _ in range(max_iterations):
+            z /= gamma
+            image = operator.matvec(z)
+            delta = image @ z
+            v_next = image - (delta / gamma) * v - (gamma / gamma_previous) * v_previous
+            z_next = preconditioner.apply(v_next)
+            product = v_next @ z_next
+            if product < -1.0E-12 * np.linalg.norm(v_next) * np.linalg.norm(z_next):
+                raise Exception("MINRES requires a positive definite preconditioner")
+            gamma_next = np.sqrt(max(product, 0.0))  # round-off of the exhausted Krylov subspace
+            alpha0 = c * delta - c_previous * s * gamma
+            alpha1 = np.hypot(alpha0, gamma_next)
+            alpha2 = s * delta + c_previous * c * gamma
+            alpha3 = s_previous * gamma
+            c_previous, s_previous = c, s
+            c, s = alpha0 / alpha1, gamma_next / alpha1
+            w_next = (z - alpha3 * w_previous - alpha2 * w) / alpha1
+            solution += c * eta * w_next
+            eta = -s * eta
+            w_previous, w = w, w_next
+            v_previous, v, z = v, v_next, z_next
+            gamma_previous, gamma = gamma, gamma_next
+            if gamma == 0.0:
+                # the Krylov subspace is exhausted: the estimate is meaningless, the true residual decides
+                statistics.record(np.linalg.norm(rhs - operator.matvec(solution)) / norm, start)
+                statistics.converged = statistics.residuals[-1] <= self._tolerance
+                return
+            statistics.record(abs(eta) * scale, start)
+            if statistics.residuals[-1] <= self._tolerance:
+                statistics.converged = True
+                return
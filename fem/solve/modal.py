@@ -0,0 +1,130 @@
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from fem.solve.direct import DirectSolver
+
+
+class ModalStatistics:
+    """Timings of phases of a modal analysis."""
+
+    def __init__(self, modes: int, shift: float, assembly_time: float, factorization_time: float, cached: bool):
+        self.modes = modes  # the number of extracted modes
+        self.shift = shift
+        self.assembly_time = assembly_time  # seconds spent on assembling stiffness and mass matrices
+        self.factorization_time = factorization_time  # seconds, 0 if the factor of the shift was taken from the cache
+        self.cached = cached  # True if the factor of the shift was taken from the cache
+        self.solve_time = 0.0  # seconds spent on Lanczos iterations including substitutions
+        self.substitutions = 0  # the number of applications of the shifted inverse
+
+    def __str__(self):
+        return (
+            f"{self.modes} modes at the shift {self.shift:g}: assembly: {self.assembly_time:.3f} s, "
+            f"factorization: {self.factorization_time:.3f} s{' (cached)' if self.cached else ''}, "
+            f"solve: {self.solve_time:.3f} s with {self.substitutions} substitutions"
+        )
+
+
+class ModalSolver:
+    """
+    The modal analysis K x = lambda M x, lambda = omega^2, by the shift-invert Lanczos method: eigenvalues closest
+    to the shift are the largest ones of (K - sigma M)^-1 M, so tens of the lowest modes converge in a few dozens
+    of iterations. The shifted matrix is factorized once by DirectSolver, the factor is reused by further
+    extractions at the same shift, e.g. more modes or other tolerances; factors of several shifts are cached
+    (see `DirectSolver`). A negative shift suits free structures with rigid body modes.
+    """
+
+    def __init__(self, stiffness, mass, solver: Optional[DirectSolver] = None, assembly_time: float = 0.0):
+        """
+        Create the solver.
+
+        :param stiffness: the sparse symmetric stiffness matrix, e.g. of `MatrixFreeOperator.to_sparse`
+        :param mass: the sparse symmetric positive semi-definite mass matrix of the same shape
+        :param solver: the direct solver keeping factors of shifted matrices, a new one by default
+        :param assembly_time: seconds spent on assembling the matrices, reported by statistics
+        """
+        if stiffness.shape != mass.shape:
+            raise Exception("stiffness and mass matrices of different shapes")
+        self._stiffness = stiffness
+        self._mass = mass
+        self._solver = DirectSolver() if solver is None else solver
+        self._assembly_time = assembly_time
+        self._shifted = {}  # shift -> the shifted matrix, factors are cached by the solver while matrices are alive
+
+    @classmethod
+    def from_operator(cls, operator, density: float = 1.0, lumping: str = "consistent", solver=None):
+        """
+        Assemble matrices of the matrix-free operator and create the solver.
+
+        :param operator: the MatrixFreeOperator, fixed unknowns are excluded from modes
+        :param density: the density of the material
+        :param lumping: "consistent", "row_sum" or "hrz" (see fem.mass.LUMPINGS)
+        :param solver: the direct solver keeping factors of shifted matrices, a new one by default
+        :return: the solver
+        """
+        start = perf_counter()
+        stiffness = operator.to_sparse()
+        mass = operator.mass(density, lumping)
+        return cls(stiffness, mass, solver, perf_counter() - start)
+
+    @property
+    def stiffness(self):
+        return self._stiffness
+
+    @property
+    def mass(self):
+        return self._mass
+
+    def forget(self):
+        """Drop factors of all shifts"""
+        for matrix in self._shifted.values():
+            self._solver.forget(matrix)
+        self._shifted.clear()
+
+    def solve(self, count: int, shift: float = 0.0, tolerance: float = 0.0):
+        """
+        Extract modes with eigenvalues closest to the shift.
+
+        :param count: the number of modes
+        :param shift: the shift sigma, e.g. 0 for the lowest modes of a fixed structure
+        :param tolerance: the relative accuracy of eigenvalues, 0 is the machine precision
+        :return: an ascending (count,) array of eigenvalues omega^2, an (n, count) array of modes normalized
+        by the mass matrix and statistics
+        """
+        size = self._stiffness.shape[0]
+        if not 0 < count < size:
+            raise Exception(f"the number of modes must be in [1, {size - 1}]")
+        shift = float(shift)
+        matrix = self._shifted.get(shift)
+        if matrix is None:
+            matrix = self._stiffness - shift * self._mass if shift else self._stiffness
+            self._shifted[shift] = matrix
+        factor, factorization_time = self._solver.factorize(matrix)
+        statistics = ModalStatistics(
+            count, shift, self._assembly_time, factorization_time or 0.0, factorization_time is None
+        )
+
+        def substitute(x):
+            statistics.substitutions += 1
+            return factor.solve(np.asarray(x, dtype=float).ravel())
+
+        inverse = LinearOperator((size, size), matvec=substitute, dtype=float)
+        start = perf_counter()
+        eigenvalues, modes = eigsh(
+            self._stiffness, count, M=self._mass, sigma=shift, which="LM", OPinv=inverse, tol=tolerance
+        )
+        statistics.solve_time = perf_counter() - start
+        order = np.argsort(eigenvalues)
+        return eigenvalues[order], modes[:, order], statistics
+
+    @staticmethod
+    def frequencies(eigenvalues: np.ndarray) -> np.ndarray:
+        """
+        Convert eigenvalues to natural frequencies.
+
+        :param eigenvalues: an array of eigenvalues omega^2
+        :return: an array of frequencies omega / (2 pi), negative round-off eigenvalues give zeros
+        """
+        return np.sqrt(np.maximum(eigenvalues, 0.0)) / (2.0 * np.pi)
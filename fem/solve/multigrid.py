@@ -0,0 +1,244 @@
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix, eye, kron
+
+from fem.element.quadrilateral import IsoQuad4
+from fem.operator import MatrixFreeOperator
+from fem.solve.direct import DirectSolver
+from fem.solve.preconditioner import BlockJacobiPreconditioner, JacobiPreconditioner, Preconditioner
+from mesh.creators.creator import MeshCreator
+from mesh.structured import StructuredMesh
+
+
+def hierarchy(creator: MeshCreator, levels: Optional[int] = None, coarsest: int = 2) -> List[StructuredMesh]:
+    """
+    Create the meshes of the patch from the finest to the coarsest one halving numbers of elements.
+
+    :param creator: the creator with `coarsened`, e.g. PlaneGridCreator or TransfiniteGridCreator
+    :param levels: the number of meshes, as many as possible by default
+    :param coarsest: the minimal number of elements along a direction of the coarsest mesh
+    :return: the list of structured meshes from the finest one
+    """
+    meshes = [creator.create()]
+    if not isinstance(meshes[0], StructuredMesh):
+        raise Exception(f"the creator made a {type(meshes[0]).__name__}, only first-order grid creators are supported")
+    while levels is None or len(meshes) < levels:
+        num_x, num_y = meshes[-1].shape
+        if (num_x - 1) % 2 != 0 or (num_y - 1) % 2 != 0 or min(num_x - 1, num_y - 1) < 2 * coarsest:
+            break
+        creator = creator.coarsened()
+        meshes.append(creator.create())
+    if levels is not None and len(meshes) < levels:
+        raise Exception(f"the grid allows {len(meshes)} levels only")
+    return meshes
+
+
+def prolongation(fine: Tuple[int, int], coarse: Tuple[int, int]) -> csr_matrix:
+    """
+    Build the interpolation from the coarse grid to the fine one by bilinear shape functions of coarse elements.
+
+    :param fine: the numbers of nodes of the fine grid
+    :param coarse: the numbers of nodes of the coarse grid, (fine - 1) / 2 + 1
+    :return: the sparse (fine nodes, coarse nodes) matrix
+    """
+    if fine[0] - 1 != 2 * (coarse[0] - 1) or fine[1] - 1 != 2 * (coarse[1] - 1):
+        raise Exception(f"grids {fine} and {coarse} aren't nested")
+    i, j = np.meshgrid(np.arange(fine[0]), np.arange(fine[1]), indexing="ij")
+    i, j = i.ravel(), j.ravel()
+    ci = np.minimum(i // 2, coarse[0] - 2)  # the coarse element containing the fine node
+    cj = np.minimum(j // 2, coarse[1] - 2)
+    shapes, _, _ = IsoQuad4.parametric(i - 2.0 * ci - 1.0, j - 2.0 * cj - 1.0)  # local coordinates are -1, 0 or 1
+    columns = np.stack((
+        ci * coarse[1] + cj,
+        (ci + 1) * coarse[1] + cj,
+        (ci + 1) * coarse[1] + cj + 1,
+        ci * coarse[1] + cj + 1
+    ), axis=1)
+    rows = np.repeat(np.arange(len(i)), 4)
+    keep = shapes.ravel() != 0.0
+    return csr_matrix(
+        (shapes.ravel()[keep], (rows[keep], columns.ravel()[keep])),
+        shape=(fine[0] * fine[1], coarse[0] * coarse[1])
+    )
+
+
+class GeometricMultigrid(Preconditioner):
+    """
+    The geometric multigrid on nested structured meshes: matrix-free operators are rediscretized on every level,
+    the bilinear interpolation is the prolongation and its transpose is the restriction. A V-cycle smooths by
+    the damped (block) Jacobi or the Chebyshev iteration and solves the coarsest level directly. The cycle is
+    symmetric, so it is the preconditioner of the conjugate gradients as well as the standalone solver.
+    Fixed unknowns of the finest level are fixed on coarse levels where nodes coincide.
+    """
+
+    SMOOTHERS = ("jacobi", "block_jacobi", "chebyshev")
+
+    def __init__(
+            self,
+            meshes: List[StructuredMesh],
+            physics,
+            fixed=None,
+            smoother: str = "chebyshev",
+            sweeps: int = 2,
+            order: Optional[int] = None
+    ):
+        """
+        Create the multigrid.
+
+        :param meshes: nested structured meshes from the finest to the coarsest, see `hierarchy`
+        :param physics: the problem, e.g. Poisson or PlaneElasticity from fem.physics
+        :param fixed: indices or a boolean mask of the fixed unknowns of the finest mesh
+        :param smoother: the name from SMOOTHERS
+        :param sweeps: the number of pre-smoothing and post-smoothing steps (the degree of the Chebyshev polynomial)
+        :param order: the order of the Gauss rule of operators
+        """
+        if smoother not in self.SMOOTHERS:
+            raise Exception(f"unknown smoother {smoother}, use one of {self.SMOOTHERS}")
+        if len(meshes) < 1:
+            raise Exception("the multigrid requires at least one mesh")
+        self._smoother = smoother
+        self._sweeps = sweeps
+        dofs = physics.dofs
+        self._operators = []
+        self._prolongations = []
+        self._inverses = []
+        self._bounds = []
+        mask = np.zeros(meshes[0].nodes_count * dofs, dtype=bool)
+        if fixed is not None:
+            mask[fixed] = True
+        start = perf_counter()
+        for level, mesh in enumerate(meshes):
+            operator = MatrixFreeOperator(mesh, physics, order=order, fixed=mask)
+            self._operators.append(operator)
+            if level + 1 < len(meshes):
+                interpolation = prolongation(mesh.shape, meshes[level + 1].shape)
+                self._prolongations.append(kron(interpolation, eye(dofs), format="csr"))
+                mask = self._coarse_mask(mask, mesh.shape, dofs)
+                inverse = BlockJacobiPreconditioner(dofs) if smoother == "block_jacobi" else JacobiPreconditioner()
+                inverse.setup(operator)
+                self._inverses.append(inverse)
+                self._bounds.append(self._spectral_radius(operator, inverse))
+        self._coarse = self._operators[-1].to_sparse()
+        self._direct = DirectSolver()
+        self._direct.factorize(self._coarse)
+        self.setup_time = perf_counter() - start
+
+    @staticmethod
+    def _coarse_mask(mask: np.ndarray, shape: Tuple[int, int], dofs: int) -> np.ndarray:
+        """Fixed unknowns of the coarse grid are the fixed unknowns of coinciding fine nodes"""
+        return mask.reshape(shape[0], shape[1], dofs)[::2, ::2].ravel()
+
+    @staticmethod
+    def _spectral_radius(operator: MatrixFreeOperator, inverse: Preconditioner, iterations: int = 15) -> float:
+        """Estimate the largest eigenvalue of D^-1 A by the power iteration with a safety margin"""
+        vector = np.random.default_rng(0).random(operator.shape[0])
+        vector[operator.fixed] = 0.0
+        estimate = 1.0
+        for _ in range(iterations):
+            image = inverse.apply(operator.apply(vector))
+            image[operator.fixed] = 0.0
+            estimate = np.linalg.norm(image) / np.linalg.norm(vector)
+            vector = image / np.linalg.norm(image)
+        return 1.1 * estimate
+
+    @property
+    def levels(self) -> int:
+        return len(self._operators)
+
+    @property
+    def operators(self) -> List[MatrixFreeOperator]:
+        """Operators of levels from the finest one"""
+        return self._operators
+
+    @property
+    def operator(self) -> MatrixFreeOperator:
+        """The operator of the finest level"""
+        return self._operators[0]
+
+    def setup(self, matrix):
+        if matrix.shape != self.operator.shape:
+            raise Exception("the multigrid was built for the system of another size")
+
+    def key(self) -> tuple:
+        return type(self).__name__, id(self)
+
+    def _smooth(self, level: int, rhs: np.ndarray, solution: np.ndarray) -> np.ndarray:
+        """Improve the solution of the level in place by the smoother"""
+        operator = self._operators[level]
+        inverse = self._inverses[level]
+        bound = self._bounds[level]
+        residual = rhs - operator.matvec(solution)
+        if self._smoother != "chebyshev":
+            weight = 4.0 / (3.0 * bound)
+            for sweep in range(self._sweeps):
+                if sweep > 0:
+                    residual = rhs - operator.matvec(solution)
+                solution += weight * inverse.apply(residual)
+            return solution
+        upper, lower = bound, bound / 4.0  # the polynomial damps the upper quarter of the spectrum, i.e. the oscillating modes
+        theta = 0.5 * (upper + lower)
+        delta = 0.5 * (upper - lower)
+        sigma = theta / delta
+        rho = 1.0 / sigma
+        direction = inverse.apply(residual) / theta
+        for sweep in range(self._sweeps):
+            solution += direction
+            if sweep + 1 == self._sweeps:
+                break
+            residual -= operator.matvec(direction)
+            rho_next = 1.0 / (2.0 * sigma - rho)
+            direction *= rho_next * rho
+            direction += (2.0 * rho_next / delta) * inverse.apply(residual)
+            rho = rho_next
+        return solution
+
+    def cycle(self, rhs: np.ndarray, solution: Optional[np.ndarray] = None, level: int = 0) -> np.ndarray:
+        """
+        Run the V-cycle.
+
+        :param rhs: the right hand side of the level
+        :param solution: the initial guess, zero by default
+        :param level: the level of the system, the finest one by default
+        :return: the improved solution
+        """
+        operator = self._operators[level]
+        if level + 1 == len(self._operators):
+            solution, _ = self._direct.solve(self._coarse, rhs)
+            return solution
+        fixed = operator.fixed
+        if solution is None:
+            solution = np.zeros(len(rhs))
+        solution[fixed] = rhs[fixed]
+        solution = self._smooth(level, rhs, solution)
+        residual = rhs - operator.matvec(solution)
+        coarse_rhs = self._prolongations[level].T @ residual
+        coarse_rhs[self._operators[level + 1].fixed] = 0.0
+        correction = self._prolongations[level] @ self.cycle(coarse_rhs, None, level + 1)
+        correction[fixed] = 0.0
+        solution += correction
+        return self._smooth(level, rhs, solution)
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return self.cycle(np.asarray(residual, dtype=float))
+
+    def solve(self, rhs: np.ndarray, initial: Optional[np.ndarray] = None, tolerance: float = 1.0E-8,
+              max_cycles: int = 100) -> Tuple[np.ndarray, List[float]]:
+        """
+        Solve the system of the finest level by V-cycles.
+
+        :param rhs: the right hand side
+        :param initial: the initial guess
+        :param tolerance: the relative residual of the convergence
+        :param max_cycles: the maximal number of cycles
+        :return: the solution and relative residuals after every cycle, the first one is the initial residual
+        """
+        rhs = np.asarray(rhs, dtype=float)
+        solution = np.zeros(len(rhs)) if initial is None else np.array(initial, dtype=float)
+        norm = np.linalg.norm(rhs) or 1.0
+        residuals = [np.linalg.norm(rhs - self.operator.matvec(solution)) / norm]
+        while residuals[-1] > tolerance and len(residuals) <= max_cycles:
+            solution = self.cycle(rhs, solution)
+            residuals.append(np.linalg.norm(rhs - self.operator.matvec(solution)) / norm)
+        return solution, residuals
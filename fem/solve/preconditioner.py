@@ -0,0 +1,156 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, issparse
+from scipy.sparse.linalg import spilu
+
+
+def block_diagonal(matrix, block: int) -> np.ndarray:
+    """
+    Extract diagonal blocks of the matrix, e.g. blocks coupling unknowns of a node.
+
+    :param matrix: the sparse or the matrix-free (with `block_diagonal`) (n, n) operator
+    :param block: the size of a block, n must be divisible by it
+    :return: an (n / block, block, block) array of blocks
+    """
+    if hasattr(matrix, "block_diagonal") and not issparse(matrix):
+        blocks = matrix.block_diagonal()
+        if blocks.shape[1] != block:
+            raise Exception(f"the operator has blocks of the size {blocks.shape[1]} instead of {block}")
+        return blocks
+    if not issparse(matrix):
+        raise Exception("the block diagonal requires a sparse matrix or an operator providing it")
+    size = matrix.shape[0]
+    if size % block != 0:
+        raise Exception(f"the size {size} of the matrix isn't divisible by the block size {block}")
+    entries = coo_matrix(matrix)
+    inside = entries.row // block == entries.col // block
+    blocks = np.zeros((size // block, block, block))
+    np.add.at(
+        blocks,
+        (entries.row[inside] // block, entries.row[inside] % block, entries.col[inside] % block),
+        entries.data[inside]
+    )
+    return blocks
+
+
+class Preconditioner(ABC):
+    """An approximate inverse M^-1 of a symmetric matrix built once and applied at every iteration."""
+
+    @abstractmethod
+    def setup(self, matrix):
+        """
+        Build the preconditioner.
+
+        :param matrix: the sparse matrix or the matrix-free operator
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        """
+        Apply the approximate inverse.
+
+        :param residual: an array of n residuals
+        :return: an array of n corrections
+        """
+        raise NotImplementedError
+
+    def key(self) -> tuple:
+        """The hashable description of the preconditioner and its parameters, e.g. for caching"""
+        return (type(self).__name__,)
+
+
+class IdentityPreconditioner(Preconditioner):
+    """No preconditioning."""
+
+    def setup(self, matrix):
+        pass
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return residual.copy()
+
+
+class JacobiPreconditioner(Preconditioner):
+    """
+    The inverse of absolute values of the diagonal of the matrix: it is positive definite for indefinite matrices
+    as MINRES requires, and the inverse of the diagonal for positive definite ones.
+    """
+
+    def __init__(self):
+        self._inverse = None
+
+    def setup(self, matrix):
+        diagonal = np.asarray(matrix.diagonal(), dtype=float)
+        if np.any(diagonal == 0.0):
+            raise Exception("the Jacobi preconditioner requires the non-zero diagonal")
+        self._inverse = 1.0 / np.abs(diagonal)
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return self._inverse * residual
+
+
+class BlockJacobiPreconditioner(Preconditioner):
+    """
+    The inverse of diagonal blocks of the matrix, e.g. of the nodal 2 x 2 blocks of the plane elasticity.
+    Blocks are replaced by their absolute values V |L| V^T, so the preconditioner is positive definite
+    for indefinite matrices as MINRES requires, positive definite blocks are inverted as they are.
+    """
+
+    def __init__(self, block: int = 2):
+        self._block = block
+        self._inverse = None
+
+    @property
+    def block(self) -> int:
+        return self._block
+
+    def setup(self, matrix):
+        blocks = block_diagonal(matrix, self._block)
+        values, vectors = np.linalg.eigh(0.5 * (blocks + np.swapaxes(blocks, 1, 2)))
+        if np.any(values == 0.0):
+            raise Exception("the block Jacobi preconditioner requires non-singular diagonal blocks")
+        self._inverse = np.matmul(vectors / np.abs(values)[:, np.newaxis, :], np.swapaxes(vectors, 1, 2))
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        blocks = residual.reshape(-1, self._block, 1)
+        return np.matmul(self._inverse, blocks).reshape(residual.shape)
+
+    def key(self) -> tuple:
+        return type(self).__name__, self._block
+
+
+class IncompletePreconditioner(Preconditioner):
+    """
+    The incomplete LU factorization with the threshold. The symmetric variant keeps the diagonal pivots and orders
+    the matrix by the pattern of A^T + A, then the factors approximate the incomplete Cholesky factorization.
+    """
+
+    def __init__(self, drop_tolerance: float = 1.0E-4, fill_factor: float = 10.0, symmetric: bool = True):
+        self._drop_tolerance = drop_tolerance
+        self._fill_factor = fill_factor
+        self._symmetric = symmetric
+        self._factor = None
+
+    def setup(self, matrix):
+        if not issparse(matrix):
+            raise Exception("the incomplete factorization requires an assembled sparse matrix")
+        options = dict(drop_tol=self._drop_tolerance, fill_factor=self._fill_factor)
+        if self._symmetric:
+            options.update(permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+        self._factor = spilu(csc_matrix(matrix), **options)
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        return self._factor.solve(residual)
+
+    def key(self) -> tuple:
+        return type(self).__name__, self._drop_tolerance, self._fill_factor, self._symmetric
+
+
+PRECONDITIONERS = {
+    "none": IdentityPreconditioner,
+    "jacobi": JacobiPreconditioner,
+    "block_jacobi": BlockJacobiPreconditioner,
+    "ilu": lambda: IncompletePreconditioner(symmetric=False),
+    "ic": IncompletePreconditioner
+}  # preconditioners by names
@@ -0,0 +1,83 @@
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.spatial import cKDTree
+
+from fem.locator import PointLocator
+from mesh.mesh import Mesh
+
+
+class FieldTransfer:
+    """
+    The transfer of nodal fields from a source mesh to nodes of a target mesh. Target nodes inside the source mesh get
+    values interpolated by shape functions of source elements, other target nodes get values of the nearest source node.
+    The transfer is a sparse matrix built once, so every further field costs one sparse product.
+    """
+
+    def __init__(self, source: Mesh, target: Mesh, locator: Optional[PointLocator] = None):
+        """
+        Build the transfer between meshes.
+
+        :param source: the mesh where fields are defined
+        :param target: the mesh where fields are required
+        :param locator: the point locator of the source mesh, it is built if it's omitted
+        """
+        if locator is not None and locator.mesh is not source:
+            raise Exception("the locator isn't the one of the source mesh")
+        self._source = source
+        self._target = target
+        self._locator = PointLocator(source) if locator is None else locator
+        points = target.coordinates[:, :2]
+        matrix, elements = self._locator.interpolation_matrix(points)
+        outside = np.flatnonzero(elements < 0)
+        if len(outside) > 0:
+            _, nearest = cKDTree(source.coordinates[:, :2]).query(points[outside])
+            fallback = csr_matrix(
+                (np.ones(len(outside)), (outside, nearest)),
+                shape=matrix.shape
+            )
+            matrix = (matrix + fallback).tocsr()
+        self._matrix = matrix
+        self._outside = outside
+
+    @property
+    def locator(self) -> PointLocator:
+        """The point locator of the source mesh, it can be shared with other transfers from the same mesh"""
+        return self._locator
+
+    @property
+    def matrix(self) -> csr_matrix:
+        """The (target nodes, source nodes) sparse transfer matrix"""
+        return self._matrix
+
+    @property
+    def outside(self) -> np.ndarray:
+        """Indices of target nodes outside the source mesh, their values are taken from the nearest source nodes"""
+        return self._outside
+
+    def transfer(self, values: np.ndarray) -> np.ndarray:
+        """
+        Transfer nodal values. Several fields can be transferred at once as columns of a matrix.
+
+        :param values: an (N_source,) or (N_source, c) array of values
+        :return: an (N_target,) or (N_target, c) array of values
+        """
+        return self._matrix @ np.asarray(values)
+
+    def transfer_fields(self, fields: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Transfer named fields with one sparse product.
+
+        :param fields: a dictionary of (N_source,) or (N_source, c) arrays
+        :return: a dictionary of transferred fields with the same names and numbers of components
+        """
+        columns = [np.asarray(v).reshape(len(v), -1) for v in fields.values()]
+        if not columns:
+            return {}
+        result = self.transfer(np.concatenate(columns, axis=1))
+        offsets = np.cumsum([0] + [c.shape[1] for c in columns])
+        return {
+            name: result[:, offsets[i]:offsets[i + 1]].reshape((result.shape[0],) + np.shape(v)[1:])
+            for i, (name, v) in enumerate(fields.items())
+        }
@@ -0,0 +1,56 @@
+from typing import Iterable
+
+import numpy as np
+
+from mesh.creators.creator import MeshCreator
+from mesh.mesh import ArrayMesh, Mesh
+from mesh.node import NodeType
+
+
+class ExtrusionCreator(MeshCreator):
+    """
+    The creator of the surface swept by a curve along a direction: the node (i, k) is the node i of the curve moved
+    by k / num_layers of the direction, its index is i * (num_layers + 1) + k. The seam of a closed curve is a single
+    column of nodes by their indices. The element (i, k) has the nodes (i, k), (i + 1, k), (i + 1, k + 1), (i, k + 1).
+    """
+
+    def __init__(self, curve: np.ndarray, direction: Iterable[float], num_layers: int, closed: bool = False):
+        """
+        Create the creator.
+
+        :param curve: an (P, dim) array of nodes of the curve, the last node of a closed curve isn't repeated
+        :param direction: the vector of the extrusion, coordinates are padded by zeros to the longest of both
+        :param num_layers: the number of elements along the direction
+        :param closed: True if the last node of the curve is connected to the first one
+        """
+        self._curve = np.asarray(curve, dtype=float)
+        self._direction = np.asarray(direction, dtype=float)
+        if self._curve.ndim != 2 or len(self._curve) < (3 if closed else 2):
+            raise Exception("a curve must be a (P, dim) array of at least 2 nodes (3 nodes if it is closed)")
+        if num_layers < 1:
+            raise Exception("an extrusion requires at least one layer")
+        self._num_layers = num_layers
+        self._closed = closed
+
+    def create(self) -> Mesh:
+        dim = max(self._curve.shape[1], len(self._direction))
+        curve = np.zeros((len(self._curve), dim))
+        curve[:, :self._curve.shape[1]] = self._curve
+        direction = np.zeros(dim)
+        direction[:len(self._direction)] = self._direction
+        steps = np.linspace(0.0, 1.0, self._num_layers + 1)
+        coordinates = (curve[:, np.newaxis, :] + steps[np.newaxis, :, np.newaxis] * direction).reshape(-1, dim)
+        count = len(curve)
+        segments = count if self._closed else count - 1
+        i, k = np.meshgrid(np.arange(segments), np.arange(self._num_layers), indexing="ij")
+        following = (i + 1) % count
+        layers = self._num_layers + 1
+        connectivity = np.stack((
+            i * layers + k, following * layers + k, following * layers + k + 1, i * layers + k + 1
+        ), axis=-1)
+        rows, positions = np.divmod(np.arange(len(coordinates)), layers)
+        border = (positions == 0) | (positions == self._num_layers)
+        if not self._closed:
+            border |= (rows == 0) | (rows == count - 1)
+        types = np.where(border, NodeType.BORDER.value, NodeType.INTERNAl.value)
+        return ArrayMesh.from_blocks(coordinates, [connectivity.reshape(-1, 4)], types=types)
@@ -1,48 +1,53 @@
-from typing import Tuple
-
 import numpy as np
 
 from mesh.creators.creator import MeshCreator
-from mesh.element import Element
 from mesh.mesh import Mesh
-from mesh.node import NodeType
+from mesh.structured import StructuredMesh, serendipity
 
 
 class PlaneGridCreator(MeshCreator):
-    def __init__(self, x: float, y: float, width: float, height: float, num_x: int, num_y: int):
+    def __init__(self, x: float, y: float, width: float, height: float, num_x: int, num_y: int, order: int = 1):
+        """
+        Create the creator of a rectangular grid.
+
+        :param x: the minimal x
+        :param y: the minimal y
+        :param width: the size along x
+        :param height: the size along y
+        :param num_x: the number of corner nodes along x
+        :param num_y: the number of corner nodes along y
+        :param order: 1 for the structured mesh of 4-nodes quadrilaterals, 2 for 8-nodes quadrilaterals
+        """
+        if order not in (1, 2):
+            raise Exception("the order of elements must be 1 or 2")
         self._x = x
         self._y = y
         self._width = width
         self._height = height
         self._num_x = num_x
         self._num_y = num_y
+        self._order = order
 
     def create(self) -> Mesh:
-        x = np.linspace(self._x, self._x + self._width, self._num_x)
-        y = np.linspace(self._y, self._y + self._height, self._num_y)
-        mesh = Mesh()
-        nodes = []
-        for i in range(self._num_x):
-            row = []
-            for j in range(self._num_y):
-                node_type = NodeType.BORDER if i == 0 or i == self._num_x - 1 or j == 0 or j == self._num_y - 1 else NodeType.INTERNAl
-                row.append(
-                    mesh.append_point(coords=(x[i], y[j]), node_type=node_type, check=False)
-                )
-            nodes.append(row)
-        for i in range(self._num_x - 1):
-            for j in range(self._num_y - 1):
-                mesh.append_element(
-                    Element(
-                        [
-                            nodes[i][j],
-                            nodes[i + 1][j],
-                            nodes[i + 1][j + 1],
-                            nodes[i][j + 1]
-                        ]
-                    )
-                )
-        return mesh
+        x = np.linspace(self._x, self._x + self._width, self._order * (self._num_x - 1) + 1)
+        y = np.linspace(self._y, self._y + self._height, self._order * (self._num_y - 1) + 1)
+        grid = np.stack(np.meshgrid(x, y, indexing="ij"), axis=2)
+        if self._order == 2:
+            return Mesh.from_arrays(*serendipity(grid))
+        return StructuredMesh(grid)
+
+    def coarsened(self) -> "PlaneGridCreator":
+        """
+        Create the creator of the same patch with twice less elements along both directions.
+        Nodes of the coarse mesh are every second node of this one.
+
+        :return: the coarse creator
+        """
+        if (self._num_x - 1) % 2 != 0 or (self._num_y - 1) % 2 != 0:
+            raise Exception("a grid can be coarsened only if numbers of its elements are even")
+        num_x = (self._num_x - 1) // 2 + 1
+        num_y = (self._num_y - 1) // 2 + 1
+        return PlaneGridCreator(self._x, self._y, self._width, self._height, num_x, num_y, self._order)
 
 
 if __name__ == "__main__":
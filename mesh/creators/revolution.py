@@ -0,0 +1,209 @@
+import numpy as np
+
+from mesh.creators.creator import MeshCreator
+from mesh.mesh import ArrayMesh, Mesh
+from mesh.node import NodeType
+
+
+def cylinder_profile(radius: float, height: float, num: int, z: float = 0.0) -> np.ndarray:
+    """
+    Build the profile of a cylinder going up along the axis.
+
+    :param radius: the radius
+    :param height: the height
+    :param num: the number of nodes along the axis
+    :param z: the height of the bottom
+    :return: an (num, 2) array of radii and heights
+    """
+    return np.column_stack((np.full(num, float(radius)), np.linspace(z, z + height, num)))
+
+
+def spherical_profile(radius: float, height: float, num: int) -> np.ndarray:
+    """
+    Build the profile of a spherical cap from its rim at zero height up to its apex on the axis.
+
+    :param radius: the radius of the sphere
+    :param height: the height of the cap, at most the diameter of the sphere
+    :param num: the number of nodes along the profile
+    :return: an (num, 2) array of radii and heights, the last radius is exactly zero
+    """
+    if not 0.0 < height <= 2.0 * radius:
+        raise Exception("the height of a spherical cap must be positive and at most the diameter")
+    theta = np.linspace(np.arccos(1.0 - height / radius), 0.0, num)  # polar angles from the apex
+    profile = np.column_stack((radius * np.sin(theta), radius * (np.cos(theta) - 1.0) + height))
+    if height == 2.0 * radius:
+        profile[0, 0] = 0.0  # the rim of the whole sphere is its bottom pole
+    return profile
+
+
+def torispherical_profile(radius: float, crown: float, knuckle: float, num_knuckle: int, num_crown: int) -> np.ndarray:
+    """
+    Build the profile of a torispherical head from its rim at zero height up to its apex on the axis: the knuckle
+    (a torus) starts vertically at the rim and touches the crown (a sphere) tangentially.
+
+    :param radius: the radius of the rim, i.e. of the cylinder of the vessel
+    :param crown: the radius of the crown, at least the radius of the rim
+    :param knuckle: the radius of the knuckle, less than the radius of the rim
+    :param num_knuckle: the number of elements along the knuckle
+    :param num_crown: the number of elements along the crown
+    :return: an (num_knuckle + num_crown + 1, 2) array of radii and heights, the last radius is exactly zero
+    """
+    if not 0.0 < knuckle < radius <= crown:
+        raise Exception("a torispherical head requires 0 < knuckle < radius <= crown")
+    offset = np.sqrt((crown - knuckle) ** 2 - (radius - knuckle) ** 2)  # the crown center is below the rim
+    tangent = np.arctan2(offset, radius - knuckle)  # the angle of the line through both centers
+    alpha = np.linspace(0.0, tangent, num_knuckle + 1)
+    knuckle_points = np.column_stack((radius - knuckle + knuckle * np.cos(alpha), knuckle * np.sin(alpha)))
+    theta = np.linspace(np.pi / 2.0 - tangent, 0.0, num_crown + 1)[1:]  # polar angles of the crown from the apex
+    crown_points = np.column_stack((crown * np.sin(theta), crown * np.cos(theta) - offset))
+    return np.concatenate((knuckle_points, crown_points))
+
+
+def join_profiles(*profiles: np.ndarray) -> np.ndarray:
+    """
+    Join profiles, every profile starts at the end of the previous one, so its first point is dropped.
+
+    :param profiles: (P_i, 2) arrays of radii and heights
+    :return: the joined profile
+    """
+    return np.concatenate([profiles[0]] + [p[1:] for p in profiles[1:]])
+
+
+def flip_profile(profile: np.ndarray, z: float = 0.0) -> np.ndarray:
+    """
+    Mirror the profile in the plane of the given height and reverse it, e.g. to turn the profile of a top head
+    into the one of a bottom head going up to the rim.
+
+    :param profile: an (P, 2) array of radii and heights
+    :param z: the height of the mirror
+    :return: the flipped profile
+    """
+    return np.column_stack((profile[::-1, 0], 2.0 * z - profile[::-1, 1]))
+
+
+class RevolutionCreator(MeshCreator):
+    """
+    The creator of a surface of revolution of a profile around the z axis. Nodes of the profile are rotated
+    by equal angles. The seam of the full revolution and profile nodes on the axis (exactly zero radius) are single
+    nodes by their indices, so coordinates are never compared. Elements are quadrilaterals, elements touching
+    the axis are triangles. The normal of an element is the product of the direction around the axis and the
+    direction of the profile, i.e. it is outward for profiles going up.
+    """
+
+    def __init__(self, profile: np.ndarray, num_around: int, angle: float = 2.0 * np.pi):
+        """
+        Create the creator.
+
+        :param profile: an (P, 2) array of radii and heights of nodes of the profile
+        :param num_around: the number of elements around the axis
+        :param angle: the angle of the revolution, the full revolution by default
+        """
+        self._profile = np.asarray(profile, dtype=float)
+        if self._profile.ndim != 2 or self._profile.shape[1] != 2 or len(self._profile) < 2:
+            raise Exception("a profile must be a (P, 2) array of at least 2 radii and heights")
+        if num_around < 1 or (angle >= 2.0 * np.pi and num_around < 3):
+            raise Exception("the full revolution requires at least 3 elements around the axis")
+        self._num_around = num_around
+        self._angle = min(angle, 2.0 * np.pi)
+
+    @property
+    def closed(self) -> bool:
+        """True for the full revolution"""
+        return self._angle >= 2.0 * np.pi
+
+    def create(self) -> Mesh:
+        radius, height = self._profile[:, 0], self._profile[:, 1]
+        count = len(self._profile)
+        columns = self._num_around if self.closed else self._num_around + 1
+        pole = radius == 0.0
+        if np.any(pole[1:] & pole[:-1]):
+            raise Exception("adjacent nodes of a profile can't lie on the axis both")
+        # numbers of nodes: one node of a pole, a ring of nodes otherwise
+        sizes = np.where(pole, 1, columns)
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        phi = np.linspace(0.0, self._angle, self._num_around + 1)[:columns]
+        rows = np.repeat(np.arange(count), sizes)
+        positions = np.arange(offsets[-1]) - offsets[rows]
+        coordinates = np.column_stack((
+            radius[rows] * np.cos(phi[positions]), radius[rows] * np.sin(phi[positions]), height[rows]
+        ))
+        # node (i, j) of the profile node i and the angle j
+        i, j = np.meshgrid(np.arange(count - 1), np.arange(self._num_around), indexing="ij")
+
+        def node(ii, jj):
+            return offsets[ii] + np.where(pole[ii], 0, jj % columns)
+
+        quads = np.stack((node(i, j), node(i, j + 1), node(i + 1, j + 1), node(i + 1, j)), axis=-1)
+        lower, upper = pole[:-1], pole[1:]
+        inner = ~(lower | upper)
+        triangles = np.concatenate((
+            quads[lower][..., [0, 2, 3]].reshape(-1, 3),
+            quads[upper][..., [0, 1, 2]].reshape(-1, 3)
+        ))
+        # the boundary: rings of ends of the profile off the axis and the first and the last angles of an open surface
+        border = ~pole[rows] & ((rows == 0) | (rows == count - 1))
+        if not self.closed:
+            border |= ~pole[rows] & ((positions == 0) | (positions == columns - 1))
+        types = np.where(border, NodeType.BORDER.value, NodeType.INTERNAl.value)
+        return ArrayMesh.from_blocks(coordinates, [quads[inner].reshape(-1, 4), triangles], types=types)
+
+
+class CylinderCreator(RevolutionCreator):
+    """The creator of the lateral surface of a cylinder around the z axis."""
+
+    def __init__(self, radius: float, height: float, num_around: int, num_height: int, z: float = 0.0):
+        """
+        Create the creator.
+
+        :param radius: the radius
+        :param height: the height
+        :param num_around: the number of elements around the axis
+        :param num_height: the number of elements along the axis
+        :param z: the height of the bottom
+        """
+        super().__init__(cylinder_profile(radius, height, num_height + 1, z), num_around)
+
+
+class SphericalCapCreator(RevolutionCreator):
+    """The creator of a spherical cap from its rim at the given height up to its apex on the z axis."""
+
+    def __init__(self, radius: float, height: float, num_around: int, num_profile: int, z: float = 0.0):
+        """
+        Create the creator.
+
+        :param radius: the radius of the sphere
+        :param height: the height of the cap, at most the diameter of the sphere
+        :param num_around: the number of elements around the axis
+        :param num_profile: the number of elements from the rim to the apex
+        :param z: the height of the rim
+        """
+        profile = spherical_profile(radius, height, num_profile + 1) + (0.0, z)
+        super().__init__(profile, num_around)
+
+
+class TorisphericalCapCreator(RevolutionCreator):
+    """The creator of a torispherical head from its rim at the given height up to its apex on the z axis."""
+
+    def __init__(
+            self,
+            radius: float,
+            crown: float,
+            knuckle: float,
+            num_around: int,
+            num_knuckle: int,
+            num_crown: int,
+            z: float = 0.0
+    ):
+        """
+        Create the creator.
+
+        :param radius: the radius of the rim
+        :param crown: the radius of the crown
+        :param knuckle: the radius of the knuckle
+        :param num_around: the number of elements around the axis
+        :param num_knuckle: the number of elements along the knuckle
+        :param num_crown: the number of elements along the crown
+        :param z: the height of the rim
+        """
+        profile = torispherical_profile(radius, crown, knuckle, num_knuckle, num_crown) + (0.0, z)
+        super().__init__(profile, num_around)
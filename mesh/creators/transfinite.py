@@ -1,11 +1,10 @@
-from typing import Callable, Union, List, Tuple, Iterable
+from typing import Callable, Iterable
 
 import numpy as np
 
 from mesh.creators.creator import MeshCreator
-from mesh.element import Element
 from mesh.mesh import Mesh
-from mesh.node import NodeType
+from mesh.structured import StructuredMesh, serendipity
 
 
 class TransfiniteGridCreator(MeshCreator):
@@ -16,8 +15,24 @@ class TransfiniteGridCreator(MeshCreator):
             left: Callable[[float], Iterable[float]],
             right: Callable[[float], Iterable[float]],
             num_x: int,
-            num_y: int
+            num_y: int,
+            order: int = 1
     ):
+        """
+        Create the creator of a grid by the transfinite (Coons) interpolation of four curves.
+
+        :param top: the top curve of the parameter from [0; 1]
+        :param bottom: the bottom curve of the parameter from [0; 1]
+        :param left: the left curve of the parameter from [0; 1]
+        :param right: the right curve of the parameter from [0; 1]
+        :param num_x: the number of corner nodes along top and bottom curves
+        :param num_y: the number of corner nodes along left and right curves
+        :param order: 1 for the structured mesh of 4-nodes quadrilaterals, 2 for 8-nodes quadrilaterals with mid-edge
+        nodes on the curves
+        """
+        if order not in (1, 2):
+            raise Exception("the order of elements must be 1 or 2")
+        self._order = order
         self._top = top
         self._bottom = bottom
         self._left = left
@@ -26,46 +41,33 @@ class TransfiniteGridCreator(MeshCreator):
         self._num_y = num_y
 
     def create(self) -> Mesh:
-        xi_values = np.linspace(0.0, 1.0, self._num_x)
-        eta_values = np.linspace(0.0, 1.0, self._num_y)
-        rb0 = np.array(self._bottom(0.0))
-        rb1 = np.array(self._bottom(1.0))
-        rt0 = np.array(self._top(0.0))
-        rt1 = np.array(self._top(1.0))
-        mesh = Mesh()
-        nodes = []
-        for i, xi in enumerate(xi_values):
-            row = []
-            rt = np.array(self._top(xi))
-            rb = np.array(self._bottom(xi))
-            for j, eta in enumerate(eta_values):
-                rl = np.array(self._left(eta))
-                rr = np.array(self._right(eta))
-                p = (1.0 - xi) * rl + xi * rr + (1.0 - eta) * rb + eta * rt - (1.0 - xi) * (1.0 - eta) * rb0 - \
-                    (1.0 - xi) * eta * rt0 - xi * (1.0 - eta) * rb1 - xi * eta * rt1
-                # if i == 0:
-                #     p = rl
-                # elif i == self._num_x - 1:
-                #     p = rr
-                # elif j == 0:
-                #     p = rb
-                # elif j == self._num_y - 1:
-                #     p = rt
-                node_type = NodeType.BORDER if i == 0 or i == self._num_x - 1 or j == 0 or j == self._num_y - 1 else NodeType.INTERNAl
-                row.append(
-                    mesh.append_point(coords=p, node_type=node_type, check=False)
-                )
-            nodes.append(row)
-        for i in range(self._num_x - 1):
-            for j in range(self._num_y - 1):
-                mesh.append_element(
-                    Element(
-                        [
-                            nodes[i][j],
-                            nodes[i + 1][j],
-                            nodes[i + 1][j + 1],
-                            nodes[i][j + 1]
-                        ]
-                    )
-                )
-        return mesh
+        xi_values = np.linspace(0.0, 1.0, self._order * (self._num_x - 1) + 1)
+        eta_values = np.linspace(0.0, 1.0, self._order * (self._num_y - 1) + 1)
+        rt = np.array([self._top(xi) for xi in xi_values], dtype=float)[:, np.newaxis, :]
+        rb = np.array([self._bottom(xi) for xi in xi_values], dtype=float)[:, np.newaxis, :]
+        rl = np.array([self._left(eta) for eta in eta_values], dtype=float)[np.newaxis, :, :]
+        rr = np.array([self._right(eta) for eta in eta_values], dtype=float)[np.newaxis, :, :]
+        rb0 = rb[0, 0]
+        rb1 = rb[-1, 0]
+        rt0 = rt[0, 0]
+        rt1 = rt[-1, 0]
+        xi = xi_values[:, np.newaxis, np.newaxis]
+        eta = eta_values[np.newaxis, :, np.newaxis]
+        grid = (1.0 - xi) * rl + xi * rr + (1.0 - eta) * rb + eta * rt - (1.0 - xi) * (1.0 - eta) * rb0 - \
+            (1.0 - xi) * eta * rt0 - xi * (1.0 - eta) * rb1 - xi * eta * rt1
+        if self._order == 2:
+            return Mesh.from_arrays(*serendipity(grid))
+        return StructuredMesh(grid)
+
+    def coarsened(self) -> "TransfiniteGridCreator":
+        """
+        Create the creator of the same patch with twice less elements along both directions.
+        Nodes of the coarse mesh are every second node of this one.
+
+        :return: the coarse creator
+        """
+        if (self._num_x - 1) % 2 != 0 or (self._num_y - 1) % 2 != 0:
+            raise Exception("a grid can be coarsened only if numbers of its elements are even")
+        num_x = (self._num_x - 1) // 2 + 1
+        num_y = (self._num_y - 1) // 2 + 1
+        return TransfiniteGridCreator(self._top, self._bottom, self._left, self._right, num_x, num_y, self._order)
@@ -27,4 +27,5 @@ class SimpleUnion(MeshCreator):
             for element in m.elements:
                 final_mesh.append_element(Element([old2new[node.id] for node in element.nodes]))
             is_first = False
+        final_mesh.classify_nodes()  # nodes of interfaces between meshes aren't BORDER anymore
         return final_mesh
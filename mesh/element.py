@@ -6,6 +6,8 @@ from mesh.node import Node
 
 
 class Element:
+    __slots__ = ("_nodes",)
+
     def __init__(self, nodes: List[Node]):
         self._nodes = nodes
 
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+from mesh.mesh import Mesh
+
+
+class Field(NDArrayOperatorsMixin, ABC):
+    """
+    The base of values of nodes or elements of a mesh: an (N,) array of scalars or an (N, c) array of vectors bound
+    to the mesh and its version. Values are kept as given without copying, e.g. a field of a solution is a view
+    of the solution. Arithmetic operators and NumPy functions of fields of the same mesh are vectorized and
+    return fields, numpy.asarray returns values without copying.
+    """
+
+    LOCATION = ""  # "point" or "cell"
+
+    def __init__(self, mesh: Mesh, values: np.ndarray, name: str = ""):
+        """
+        Create the field.
+
+        :param mesh: the mesh
+        :param values: an (N,) or (N, c) array of values, N is the number of nodes or elements of the mesh
+        :param name: the name of the field, e.g. for renderers
+        """
+        values = np.asarray(values)
+        count = self._count(mesh)
+        if values.ndim not in (1, 2) or len(values) != count:
+            raise Exception(f"a {self.LOCATION} field of the mesh requires ({count},) or ({count}, c) values")
+        self._mesh = mesh
+        self._version = mesh.version
+        self._values = values
+        self.name = name
+
+    @staticmethod
+    @abstractmethod
+    def _count(mesh: Mesh) -> int:
+        """The number of values of the mesh"""
+        pass
+
+    @property
+    def mesh(self) -> Mesh:
+        return self._mesh
+
+    @property
+    def values(self) -> np.ndarray:
+        """The (N,) or (N, c) array of values"""
+        return self._values
+
+    @property
+    def components(self) -> int:
+        """The number of components of a value, 1 for scalars"""
+        return 1 if self._values.ndim == 1 else self._values.shape[1]
+
+    @property
+    def valid(self) -> bool:
+        """True until the topology of the mesh changes"""
+        return self._version == self._mesh.version
+
+    def component(self, i: int, name: Optional[str] = None) -> Field:
+        """
+        Get the scalar field of the component of vectors without copying.
+
+        :param i: the index of the component
+        :param name: the name of the field, the name of the vector field with the index by default
+        :return: the field of the same mesh
+        """
+        if self._values.ndim == 1:
+            raise Exception("a scalar field has no components")
+        return self._like(self._values[:, i], f"{self.name}[{i}]" if name is None else name)
+
+    def magnitude(self) -> Field:
+        """
+        Calculate lengths of vectors.
+
+        :return: the scalar field of the same mesh
+        """
+        return self._like(np.linalg.norm(self._values.reshape(len(self), -1), axis=1), f"|{self.name}|")
+
+    def _like(self, values: np.ndarray, name: str) -> Field:
+        """Create the field of the same type, mesh and version"""
+        field = type(self).__new__(type(self))
+        field._mesh = self._mesh
+        field._version = self._version
+        field._values = values
+        field.name = name
+        return field
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or dtype == self._values.dtype:
+            return self._values.copy() if copy else self._values
+        if copy is False:
+            raise ValueError(f"the field of {self._values.dtype} values can't be converted to {dtype} without a copy")
+        return self._values.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        arrays = []
+        for value in inputs:
+            if isinstance(value, Field):
+                if type(value) is not type(self) or value._mesh is not self._mesh:
+                    raise Exception("only fields of the same type and the same mesh can be combined")
+                value = value._values
+            arrays.append(value)
+        out = kwargs.get("out", ())
+        if out:
+            kwargs["out"] = tuple(o._values if isinstance(o, Field) else o for o in out)
+        result = getattr(ufunc, method)(*arrays, **kwargs)
+        if len(out) == 1 and isinstance(out[0], Field):
+            return out[0]  # in place, e.g. by +=
+        if method == "__call__" and isinstance(result, np.ndarray) and result.shape[:1] == self._values.shape[:1]:
+            return self._like(result, self.name)
+        return result
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {self._values.shape}, {self._values.dtype})"
+
+
+class NodeField(Field):
+    """Values of nodes of a mesh in the order of nodes."""
+
+    LOCATION = "point"
+
+    @staticmethod
+    def _count(mesh: Mesh) -> int:
+        return mesh.nodes_count
+
+
+class CellField(Field):
+    """Values of elements of a mesh in the order of elements."""
+
+    LOCATION = "cell"
+
+    @staticmethod
+    def _count(mesh: Mesh) -> int:
+        return mesh.elements_count
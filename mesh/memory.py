@@ -0,0 +1,98 @@
+import sys
+from enum import Enum
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+
+def sizeof(obj, seen: Optional[Set[int]] = None) -> int:
+    """
+    Calculate the number of bytes of the object and objects referenced by it: items of containers, attributes
+    (including slots) of objects and data of arrays (the base of a view is counted whole). Every object is counted once,
+    members of enums and classes aren't counted.
+
+    :param obj: the object
+    :param seen: IDs of objects counted already, it is updated
+    :return: the number of bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, (Enum, type)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)  # includes data of arrays owning it
+    if isinstance(obj, np.ndarray):
+        if obj.base is not None:
+            size += sizeof(obj.base, seen)
+    elif isinstance(obj, dict):
+        size += sum(sizeof(k, seen) + sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item, seen) for item in obj)
+    elif not isinstance(obj, (str, bytes, int, float, complex, bool)) and obj is not None:
+        if hasattr(obj, "__dict__"):
+            size += sizeof(vars(obj), seen)
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += sizeof(getattr(obj, name), seen)
+    return size
+
+
+class MemoryReport:
+    """
+    The memory footprint of a mesh by categories, e.g. to size jobs:
+
+    * nodes: the storage of coordinates and types, nodes as objects and their list;
+    * elements: elements as objects with lists of their nodes and groups of elements as connectivity arrays;
+    * adjacency: lists of adjacent elements of nodes;
+    * cache: other derived data (edges, preconditioners, etc.).
+
+    Arrays shared with copies of the mesh are counted by every mesh.
+    """
+
+    def __init__(self, categories: Dict[str, int], nodes_count: int, elements_count: int):
+        """
+        Create the report.
+
+        :param categories: numbers of bytes by categories
+        :param nodes_count: the number of nodes of the mesh
+        :param elements_count: the number of elements of the mesh
+        """
+        self._categories = dict(categories)
+        self._nodes_count = nodes_count
+        self._elements_count = elements_count
+
+    @property
+    def categories(self) -> Dict[str, int]:
+        """Numbers of bytes by categories"""
+        return dict(self._categories)
+
+    @property
+    def total(self) -> int:
+        """The number of bytes of the mesh"""
+        return sum(self._categories.values())
+
+    @property
+    def per_node(self) -> float:
+        """The number of bytes of nodes per node"""
+        return self._categories.get("nodes", 0) / max(self._nodes_count, 1)
+
+    @property
+    def per_element(self) -> float:
+        """The number of bytes of elements per element"""
+        return self._categories.get("elements", 0) / max(self._elements_count, 1)
+
+    def add(self, category: str, size: int):
+        """
+        Add bytes to the category.
+
+        :param category: the name of the category
+        :param size: the number of bytes
+        """
+        self._categories[category] = self._categories.get(category, 0) + size
+
+    def __str__(self):
+        lines = [f"{name}: {size} B" for name, size in self._categories.items()]
+        lines.append(f"total: {self.total} B for {self._nodes_count} nodes and {self._elements_count} elements")
+        lines.append(f"{self.per_node:.1f} B per node, {self.per_element:.1f} B per element")
+        return "\n".join(lines)
@@ -1,19 +1,33 @@
 from __future__ import annotations
-from typing import List, Iterable, Dict
+from typing import List, Iterable, Dict, Any, Callable, Optional
 
 import numpy as np
 
 from mesh.element import Element
-from mesh.node import Node, NodeType
+from mesh.memory import MemoryReport, sizeof
+from mesh.node import PRECISIONS, Node, NodeStorage, NodeType
+from mesh.refinement import ALLOWED, TEMPLATES, edge_masks, uses_center
+from mesh.topology import EdgeIndex, ElementBlock, boundary_loops, corners, splice
 
 
 class Mesh:
-    def __init__(self, epsilon: float = 1.0E-8):
+    def __init__(self, epsilon: float = 1.0E-8, precision: str = "double"):
+        if precision not in PRECISIONS:
+            raise Exception(f"unknown precision {precision}, the known ones are {', '.join(PRECISIONS)}")
+        self._storage = NodeStorage(dtype=PRECISIONS[precision])
         self._nodes = []  # type: List[Node]
         self._elements = []  # type: List[Element]
         self._adjacent = {}  # type: Dict[Node, List[Element]]
         self._epsilon = epsilon
         self._node_id = 0
+        self._cache = {}  # type: Dict[str, Any]
+        self._version = 0
+        self._moves = 0  # the number of moves of the storage the cached data was derived at
+
+    @property
+    def version(self) -> int:
+        """The number of changes of the topology (appended nodes, refined elements, etc.), e.g. to check fields"""
+        return self._version
 
     @property
     def nodes(self):
@@ -23,6 +37,14 @@ class Mesh:
     def elements(self):
         return self._elements
 
+    @property
+    def nodes_count(self) -> int:
+        return len(self._storage)
+
+    @property
+    def elements_count(self) -> int:
+        return len(self._elements)
+
     @property
     def epsilon(self):
         return self.epsilon
@@ -31,23 +53,304 @@ class Mesh:
     def epsilon(self, e: float):
         self._epsilon = e
 
+    @property
+    def precision(self) -> str:
+        """
+        The precision of stored coordinates: "single" halves the memory of coordinates (e.g. for visualization),
+        computations get coordinates in double precision anyway (see `coordinates`).
+        """
+        return next(name for name, dtype in PRECISIONS.items() if dtype == self._storage.dtype)
+
+    @precision.setter
+    def precision(self, precision: str):
+        if precision not in PRECISIONS:
+            raise Exception(f"unknown precision {precision}, the known ones are {', '.join(PRECISIONS)}")
+        if precision != self.precision:
+            self._storage.convert(PRECISIONS[precision])
+            self._moved()
+
     def append_point(self, coords: Iterable[float], node_type: NodeType, check: bool = True) -> Node:
         if check:
             node = next((n for n in self._nodes if np.allclose(n.coords, coords)), None)
             if node is not None:
                 return node
-        node = Node(coords, node_type, self._node_id)
-        self._node_id += 1
-        self._nodes.append(node)
-        # self._adjacent.append([])
-        self._adjacent[node] = []
+        coords = np.asarray(coords, dtype=float)
+        node, = self._append_nodes(coords.reshape(1, -1), [node_type.value])
+        self._invalidate()
         return node
 
+    def _append_nodes(self, coordinates: np.ndarray, types: Iterable[int]) -> List[Node]:
+        """
+        Append nodes without elements to the storage, the list of nodes and the adjacency.
+
+        :param coordinates: an (M, dim) array of coordinates
+        :param types: M values of NodeType
+        :return: the list of M new nodes
+        """
+        nodes = self._storage.append(coordinates, types, range(self._node_id, self._node_id + len(coordinates)))
+        self._node_id += len(nodes)
+        self._nodes.extend(nodes)
+        for node in nodes:
+            self._adjacent[node] = []
+        return nodes
+
     def append_element(self, element: Element):
-        self._elements.append(element)
-        for node in element.nodes:
-            # i = self._nodes.index(node)
-            self._adjacent[node].append(element)
+        self._append_elements([element])
+        self._invalidate()
+
+    def _append_elements(self, elements: Iterable[Element]):
+        """
+        Append elements of existing nodes to the list of elements and the adjacency without invalidating the cache.
+
+        :param elements: new elements
+        """
+        for element in elements:
+            self._elements.append(element)
+            for node in element.nodes:
+                self._adjacent[node].append(element)
+
+    TOPOLOGY = ("groups", "edges", "connectivity", "adjacency")  # keys of cached data independent of coordinates
+
+    def _invalidate(self):
+        """
+        Drop the derived data (connectivity, edges, etc.) after the topology of the mesh has been changed.
+        """
+        self._cache.clear()
+        self._version += 1
+
+    def _moved(self):
+        """
+        Drop the derived data depending on coordinates (e.g. preconditioners) after nodes have been moved.
+        """
+        for key in [k for k in self._cache if k not in self.TOPOLOGY]:
+            del self._cache[key]
+        self._moves = self._storage.moves
+
+    def cached(self, key, factory):
+        """
+        Get the data derived from the topology of the mesh, e.g. a preconditioner, or build and store it.
+        The data is dropped when the topology changes or nodes are moved (including moves of single nodes).
+
+        :param key: the hashable key of the data
+        :param factory: the callable without arguments building the data
+        :return: the stored or the built data
+        """
+        if self._moves != self._storage.moves:  # nodes were moved by their handles, e.g. by Node.coords
+            self._moved()
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+    def forget(self, key):
+        """
+        Drop the cached data by the key if it is stored, e.g. when the data becomes useless.
+
+        :param key: the key of `cached` data
+        """
+        self._cache.pop(key, None)
+
+    @staticmethod
+    def from_arrays(coordinates: np.ndarray, connectivity: np.ndarray, epsilon: float = 1.0E-8) -> Mesh:
+        """
+        Create the mesh of one element type at once without searching for coincident nodes.
+        Types of nodes are classified by the boundary.
+
+        :param coordinates: an (N, dim) array of coordinates of nodes
+        :param connectivity: an (E, k) array of node indices of elements
+        :param epsilon: the tolerance of coordinates
+        :return: the mesh
+        """
+        return Mesh.from_blocks(coordinates, [connectivity], epsilon)
+
+    @staticmethod
+    def from_blocks(coordinates: np.ndarray, blocks: List[np.ndarray], epsilon: float = 1.0E-8) -> Mesh:
+        """
+        Create the mesh of blocks of elements at once without searching for coincident nodes, e.g. a mesh of triangles
+        and quadrilaterals. Elements are numbered block by block. Types of nodes are classified by the boundary.
+
+        :param coordinates: an (N, dim) array of coordinates of nodes
+        :param blocks: a list of (E_k, k) arrays of node indices of elements
+        :param epsilon: the tolerance of coordinates
+        :return: the mesh
+        """
+        coordinates = np.asarray(coordinates, dtype=float)
+        blocks = [np.asarray(b, dtype=np.int64) for b in blocks if len(b) > 0]
+        mesh = Mesh(epsilon)
+        mesh._cache["groups"] = Mesh._block_groups(blocks)
+        mesh._cache["edges"] = EdgeIndex(mesh._corner_groups(), sum(len(b) for b in blocks), len(coordinates))
+        types = mesh._classify(np.full(len(coordinates), NodeType.UNDEFINED.value))
+        mesh._append_nodes(coordinates.reshape(len(coordinates), -1), types.tolist())
+        for connectivity in blocks:
+            for row in connectivity.tolist():
+                element = Element([mesh._nodes[i] for i in row])
+                mesh._elements.append(element)
+                for node in element.nodes:
+                    mesh._adjacent[node].append(element)
+        return mesh
+
+    @staticmethod
+    def _block_groups(blocks: List[np.ndarray]) -> List[tuple]:
+        """
+        Number elements of blocks block by block and merge blocks of the same number of nodes.
+
+        :param blocks: a list of (E_k, k) arrays of node indices of elements
+        :return: groups of elements as `_element_groups`
+        """
+        sizes = {}  # type: Dict[int, List[tuple]]
+        offset = 0
+        for connectivity in blocks:
+            sizes.setdefault(connectivity.shape[1], []).append((offset + np.arange(len(connectivity)), connectivity))
+            offset += len(connectivity)
+        return [
+            (np.concatenate([ids for ids, _ in parts]), np.concatenate([conn for _, conn in parts]))
+            for _, parts in sorted(sizes.items())
+        ]
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """
+        Copy coordinates of nodes in double precision whatever the precision of the mesh is.
+        Nodes with less coordinates than others are padded by zeros.
+
+        :return: an (N, dim) array of coordinates
+        """
+        return self._storage.coordinates.astype(np.float64)
+
+    def move_nodes(self, coordinates: np.ndarray):
+        """
+        Set coordinates of all nodes at once, the topology is kept.
+
+        :param coordinates: an (N, dim) array of coordinates
+        """
+        coordinates = np.asarray(coordinates, dtype=float)
+        if len(coordinates) != self.nodes_count:
+            raise Exception(f"{len(coordinates)} coordinates are given for {self.nodes_count} nodes")
+        self._storage.assign(coordinates)
+        self._moved()
+
+    def transform(self, transformation, affine: Optional[bool] = None):
+        """
+        Transform coordinates of all nodes at once, the data derived from coordinates is dropped once.
+
+        :param transformation: a vectorized callable mapping the (N, dim) array of coordinates to an (N, dim') array,
+        a (dim', dim) matrix of a linear map or a (dim' + 1, dim + 1) affine matrix (see mesh.transforms).
+        Coordinates are padded by zeros if the affine matrix has more columns, e.g. to rotate a plane mesh in the space
+        :param affine: True for an affine matrix, False for a linear one. By default a matrix is affine if its last row
+        is (0, ..., 0, 1) as the ones of mesh.transforms, an affine matrix of a lower dimension than the mesh raises
+        """
+        coordinates = self.coordinates
+        if callable(transformation):
+            transformed = np.asarray(transformation(coordinates), dtype=float)
+        else:
+            matrix = np.asarray(transformation, dtype=float)
+            dim = coordinates.shape[1]
+            if matrix.ndim != 2:
+                raise Exception(f"the {matrix.shape} array isn't a matrix")
+            if affine is None:
+                unit = np.zeros(matrix.shape[1])
+                unit[-1] = 1.0
+                affine = len(matrix) > 1 and np.array_equal(matrix[-1], unit)
+            if affine and matrix.shape[1] < dim + 1:
+                raise Exception(
+                    f"the {matrix.shape} affine matrix can't transform {dim}D coordinates, "
+                    f"pass affine=False for a linear map"
+                )
+            if not affine and matrix.shape[1] != dim:
+                raise Exception(f"the {matrix.shape} linear matrix can't transform {dim}D coordinates")
+            if not affine:
+                transformed = coordinates @ matrix.T
+            else:
+                padded = np.zeros((len(coordinates), matrix.shape[1] - 1))
+                padded[:, :dim] = coordinates
+                transformed = padded @ matrix[:-1, :-1].T + matrix[:-1, -1]
+        if transformed.shape[:1] != coordinates.shape[:1] or transformed.ndim != 2:
+            raise Exception(f"the transformation returned {transformed.shape} coordinates of {len(coordinates)} nodes")
+        self.move_nodes(transformed)
+
+    def node_types(self) -> np.ndarray:
+        """
+        Gather types of nodes.
+
+        :return: an (N,) array of values of NodeType
+        """
+        return self._storage.types.astype(np.int64)
+
+    def _element_groups(self) -> List[tuple]:
+        """
+        Group elements by the number of nodes.
+
+        :return: a list of pairs (element indices, connectivity array of node indices) with one pair per element size
+        """
+        if "groups" not in self._cache:
+            index = {node: i for i, node in enumerate(self._nodes)}
+            sizes = {}  # type: Dict[int, List[int]]
+            for i, e in enumerate(self._elements):
+                sizes.setdefault(len(e), []).append(i)
+            self._cache["groups"] = [
+                (
+                    np.array(ids, dtype=np.int64),
+                    np.array([[index[n] for n in self._elements[i].nodes] for i in ids], dtype=np.int64).reshape(-1, k)
+                ) for k, ids in sorted(sizes.items())
+            ]
+        return self._cache["groups"]
+
+    @property
+    def blocks(self) -> List[ElementBlock]:
+        """
+        Elements grouped by types (tri3, quad4, quad8, etc.) with dense connectivity, e.g. for vectorized kernels
+        of meshes with mixed types of elements. Blocks are cached until the topology changes.
+
+        :return: a list of blocks, one per number of nodes of elements
+        """
+        return [ElementBlock(ids, conn) for ids, conn in self._element_groups()]
+
+    def _corner_groups(self) -> List[tuple]:
+        """
+        Group elements by the number of nodes keeping corners only, mid-edge nodes of quadratic elements are dropped.
+
+        :return: a list of pairs (element indices, connectivity array of corner indices) with one pair per element size
+        """
+        return [(ids, conn[:, :corners(conn.shape[1])]) for ids, conn in self._element_groups()]
+
+    @property
+    def connectivity(self) -> np.ndarray:
+        """
+        Indices of nodes of every element. The index of a node is its position in the list of nodes.
+
+        :return: an (E, k) array of node indices
+        """
+        groups = self._element_groups()
+        if len(groups) > 1:
+            raise Exception("meshes with mixed types elements have no dense connectivity")
+        return groups[0][1] if groups else np.zeros((0, 0), dtype=np.int64)
+
+    @property
+    def edge_index(self) -> EdgeIndex:
+        """
+        The index of unique edges of the mesh. The index is built once and it is cached until the topology changes.
+        Edges of quadratic elements connect their corners.
+
+        :return: the edge index
+        """
+        if "edges" not in self._cache:
+            self._cache["edges"] = EdgeIndex(self._corner_groups(), self.elements_count, self.nodes_count)
+        return self._cache["edges"]
+
+    def edge_lengths(self) -> np.ndarray:
+        """
+        Calculate lengths of the unique edges of the mesh in the order of `edge_index.edges`.
+
+        :return: an (M,) array of lengths
+        """
+        return self.edge_index.lengths(self.coordinates)
+
+    def element_neighbors(self) -> np.ndarray:
+        """
+        Find neighbors of all elements. The neighbor j of an element shares the edge between the local nodes j and j + 1.
+
+        :return: an (E, k) array of element indices where -1 marks the absence of a neighbor
+        """
+        return self.edge_index.neighbors()
 
     def get_adjacent(self, node: Node) -> List[Element]:
         """
@@ -95,23 +398,11 @@ class Mesh:
 
         :return: width, height, depth
         """
-        x = [self._nodes[0].x, self._nodes[0].x]
-        y = [self._nodes[0].y, self._nodes[0].y]
-        z = [self._nodes[0].z, self._nodes[0].z]
-        for n in self._nodes:
-            if n.x < x[0]:
-                x[0] = n.x
-            if n.x > x[1]:
-                x[1] = n.x
-            if n.y < y[0]:
-                y[0] = n.y
-            if n.y > y[1]:
-                y[1] = n.y
-            if n.z < z[0]:
-                z[0] = n.z
-            if n.x > x[1]:
-                z[1] = n.z
-        return x[1] - x[0], y[1] - y[0], z[1] - z[0]
+        coordinates = self.coordinates
+        extent = np.zeros(3)
+        if len(coordinates) > 0:
+            extent[:coordinates.shape[1]] = coordinates.max(axis=0) - coordinates.min(axis=0)
+        return tuple(extent)
 
     def origin(self):
         """
@@ -119,25 +410,252 @@ class Mesh:
 
         :return: the minimal X, the minimal Y, the minimal Z
         """
-        x = self._nodes[0].x
-        y = self._nodes[0].y
-        z = self._nodes[0].z
-        for n in self._nodes:
-            if n.x < x:
-                x = n.x
-            if n.y < y:
-                y = n.y
-            if n.z < z:
-                z = n.z
-        return x, y, z
+        coordinates = self.coordinates
+        origin = np.zeros(3)
+        if len(coordinates) > 0:
+            origin[:coordinates.shape[1]] = coordinates.min(axis=0)
+        return tuple(origin)
+
+    def extract_boundary(self, classify: bool = True) -> List[np.ndarray]:
+        """
+        Find the boundary of the mesh. The boundary is composed by edges with exactly one adjacent element.
+
+        :param classify: reclassify types of nodes by the boundary (see `classify_nodes`) if True
+        :return: a list of closed loops, every loop is an array of node indices following the orientation of elements,
+        loops of quadratic elements pass through corners only
+        """
+        index = self.edge_index
+        boundary = index.boundary()
+        edges = index.edges[boundary]
+        directions = np.zeros(len(index), dtype=bool)
+        for ids, conn in self._corner_groups():
+            element_edges = index.element_edges[ids, :conn.shape[1]]
+            forward = conn < np.roll(conn, -1, axis=1)
+            directions[element_edges[forward]] = True
+        if classify:
+            self.classify_nodes()
+        return boundary_loops(edges, directions[boundary])
+
+    def classify_nodes(self):
+        """
+        Reclassify types of nodes by the boundary of the mesh: nodes of boundary edges (including mid-edge nodes)
+        become BORDER, other nodes of elements become INTERNAl, FIXED nodes and nodes without elements are kept as is.
+        """
+        self._storage.assign_types(self._classify(self.node_types()))
+
+    def _classify(self, types: np.ndarray) -> np.ndarray:
+        """Calculate values of types of nodes by the boundary as `classify_nodes` from values of current types"""
+        index = self.edge_index
+        boundary = index.boundary()
+        border = [index.edges[boundary].ravel()]
+        used = np.zeros(len(types), dtype=bool)
+        for ids, conn in self._element_groups():
+            used[conn.ravel()] = True
+            k = corners(conn.shape[1])
+            if k < conn.shape[1]:
+                border.append(conn[:, k:][boundary[index.element_edges[ids, :k]]])
+        border = np.concatenate(border)
+        classified = np.where(used, NodeType.INTERNAl.value, types)
+        classified[border] = NodeType.BORDER.value
+        classified[types == NodeType.FIXED.value] = NodeType.FIXED.value
+        return classified
 
     def mean_edge_length(self):
         """
-        Calculate the mean length of an edge in the mesh.
+        Calculate the mean length of an edge in the mesh. Every edge is counted once.
 
         :return: the mean length of an edge
         """
-        return np.mean([edge[0].to_node(edge[1]) for e in self.elements for edge in e.edges()])
+        return np.mean(self.edge_lengths())
+
+    def elevate_order(self, placement: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        """
+        Convert linear triangles and quadrilaterals to quadratic ones with 6 and 8 nodes. A node is created once
+        for every unique edge and it is shared by elements of the edge. Mid-edge nodes follow corners in elements
+        as nodes of IsoQuad8. A new node is FIXED if both ends of its edge are FIXED, BORDER on the boundary and
+        INTERNAl otherwise.
+
+        :param placement: the callable calculating (M, dim) coordinates of new nodes by (M, 2) edges and their (M, dim)
+        midpoints, e.g. projecting boundary nodes on curves; midpoints of edges are used by default
+        :return: an (M,) array of indices of new nodes in the order of `edge_index.edges`
+        """
+        groups = self._element_groups()
+        if any(conn.shape[1] not in (3, 4) for _, conn in groups):
+            raise Exception("only meshes of linear triangles and quadrilaterals can be elevated")
+        index = self.edge_index
+        points = index.midpoints(self.coordinates)
+        if placement is not None:
+            points = np.asarray(placement(index.edges, points), dtype=float)
+        types = self.node_types()
+        edge_types = np.where(index.boundary(), NodeType.BORDER.value, NodeType.INTERNAl.value)
+        fixed = (types[index.edges] == NodeType.FIXED.value).all(axis=1)
+        edge_types[fixed] = NodeType.FIXED.value
+        first = self.nodes_count
+        new_nodes = self._append_nodes(points, edge_types.tolist())
+        elevated = []
+        for ids, conn in groups:
+            element_edges = index.element_edges[ids, :conn.shape[1]]
+            for e, row in zip(ids.tolist(), element_edges.tolist()):
+                element = self._elements[e]
+                extra = [new_nodes[m] for m in row]
+                element.nodes = list(element.nodes) + extra
+                for node in extra:
+                    self._adjacent[node].append(element)
+            elevated.append((ids, np.concatenate((conn, first + element_edges), axis=1)))
+        self._invalidate()
+        self._cache["groups"] = elevated
+        return first + np.arange(len(new_nodes))
+
+    def refine(self, elements, placement: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        """
+        Refine selected linear triangles and quadrilaterals without hanging nodes. A selected element is split
+        into 4 by middles of its edges, neighbors with refined edges are split by transition templates, a quadrilateral
+        with 3 refined edges is refined as selected one, so the selection spreads through such elements only.
+        New nodes are appended after existing ones: one per refined edge and one per center of a split quadrilateral.
+        The first child of an element takes its place, other children are appended. Connectivity and edges are updated
+        for changed elements only, other derived data is dropped.
+
+        :param elements: indices or a boolean mask of elements to refine, e.g. by an error indicator
+        :param placement: the callable calculating (M, dim) coordinates of new nodes on refined edges by (M, 2) edges
+        and their (M, dim) midpoints as in `elevate_order`
+        :return: an (E,) array of the parent (the element before the refinement) of every element
+        """
+        groups = self._element_groups()
+        if any(conn.shape[1] not in (3, 4) for _, conn in groups):
+            raise Exception("only meshes of linear triangles and quadrilaterals can be refined")
+        count = self.elements_count
+        marked = np.zeros(count, dtype=bool)
+        marked[elements] = True
+        index = self.edge_index.copy()  # the index may be shared with copies of the mesh
+        refined = np.zeros(len(index), dtype=bool)
+        front = np.flatnonzero(marked)
+        affected = [front]
+        # the closure: neighbors of newly selected elements without a template for their refined edges are selected too
+        while len(front) > 0:
+            edges = index.element_edges[front]
+            edges = np.unique(edges[edges >= 0])
+            edges = edges[~refined[edges]]
+            refined[edges] = True
+            neighbors = np.unique(index.edge_elements[edges])
+            neighbors = neighbors[neighbors >= 0]
+            neighbors = neighbors[~marked[neighbors]]
+            affected.append(neighbors)
+            element_edges = index.element_edges[neighbors]
+            sizes = np.count_nonzero(element_edges >= 0, axis=1)
+            front = neighbors[~ALLOWED[sizes, edge_masks(element_edges, refined)]]
+            marked[front] = True
+        affected = np.unique(np.concatenate(affected))
+        element_edges = index.element_edges[affected]
+        sizes = np.count_nonzero(element_edges >= 0, axis=1)
+        masks = edge_masks(element_edges, refined)
+        split_elements = masks > 0
+        affected, element_edges = affected[split_elements], element_edges[split_elements]
+        sizes, masks = sizes[split_elements], masks[split_elements]
+        if len(affected) == 0:
+            return np.arange(count)
+        # new nodes: middles of refined edges, then centers of quadrilaterals
+        first = self.nodes_count
+        split = np.flatnonzero(refined)
+        centered = np.array([uses_center(k, m) for k, m in zip(sizes.tolist(), masks.tolist())], dtype=bool)
+        centers = np.full(len(affected), -1, dtype=np.int64)
+        centers[centered] = first + len(split) + np.arange(np.count_nonzero(centered))
+        connectivity = np.full((len(affected), 9), -1, dtype=np.int64)
+        for ids, conn in groups:
+            k = conn.shape[1]
+            position = np.minimum(np.searchsorted(ids, affected), len(ids) - 1)
+            local = np.flatnonzero(ids[position] == affected)
+            connectivity[local, :k] = conn[position[local]]
+            edges = element_edges[local, :k]
+            connectivity[local, k:2 * k] = np.where(refined[edges], first + np.searchsorted(split, edges), -1)
+            connectivity[local, 2 * k] = centers[local]
+        ends = index.edges[split]
+        used = np.concatenate((ends.ravel(), connectivity[centered, :4].ravel()))
+        coordinates = self._points(used)
+        points = 0.5 * (coordinates[0:2 * len(split):2] + coordinates[1:2 * len(split):2])
+        if placement is not None:
+            points = np.asarray(placement(ends, points), dtype=float)
+        points = np.concatenate((points, coordinates[2 * len(split):].reshape(-1, 4, points.shape[1]).mean(axis=1)))
+        types = self.node_types()[ends]
+        point_types = np.where(index.valence[split] == 1, NodeType.BORDER.value, NodeType.INTERNAl.value)
+        point_types[(types == NodeType.FIXED.value).all(axis=1)] = NodeType.FIXED.value
+        point_types = np.concatenate((point_types, np.full(np.count_nonzero(centered), NodeType.INTERNAl.value)))
+        # children by templates
+        children = {}  # type: Dict[int, List[tuple]]
+        parents = [np.arange(count)]
+        next_id = count
+        for k, mask in sorted(set(zip(sizes.tolist(), masks.tolist()))):
+            selected = np.flatnonzero((sizes == k) & (masks == mask))
+            for j, row in enumerate(TEMPLATES[(k, mask)]):
+                if j == 0:
+                    ids = affected[selected]
+                else:
+                    ids = next_id + np.arange(len(selected))
+                    next_id += len(selected)
+                    parents.append(affected[selected])
+                children.setdefault(len(row), []).append((ids, connectivity[selected][:, row]))
+        children = [
+            (np.concatenate([i for i, _ in parts]), np.concatenate([r for _, r in parts]))
+            for _, parts in sorted(children.items())
+        ]
+        # nodes and elements as objects
+        self._append_nodes(points, point_types.tolist())
+        for e in affected.tolist():
+            element = self._elements[e]
+            for node in element.nodes:
+                self._adjacent[node].remove(element)
+        self._elements.extend([None] * (next_id - count))
+        for ids, conn in children:
+            for e, row in zip(ids.tolist(), conn.tolist()):
+                nodes = [self._nodes[i] for i in row]
+                if e < count:
+                    element = self._elements[e]
+                    element.nodes = nodes
+                else:
+                    element = Element(nodes)
+                    self._elements[e] = element
+                for node in nodes:
+                    self._adjacent[node].append(element)
+        # derived data of unchanged elements is kept
+        index.update(children, self.elements_count, self.nodes_count)
+        groups = self._patch_groups(groups, children)
+        self._invalidate()
+        self._cache["groups"] = groups
+        self._cache["edges"] = index
+        return np.concatenate(parents)
+
+    def _points(self, indices: np.ndarray) -> np.ndarray:
+        """Gather coordinates of the nodes: an (n, dim) array"""
+        return self._storage.coordinates[indices].astype(np.float64)
+
+    def _patch_groups(self, groups: List[tuple], changed: List[tuple]) -> List[tuple]:
+        """
+        Replace rows of changed elements and append rows of new elements in groups of elements by the number of nodes.
+        Rows are spliced by copies of slices between changed positions (see `splice`), unchanged rows aren't sorted.
+
+        :param groups: the current groups as `_element_groups`
+        :param changed: groups of pairs (indices of changed or new elements, their connectivity)
+        :return: the new groups, element indices are sorted in every group
+        """
+        changed_ids = np.unique(np.concatenate([ids for ids, _ in changed]))
+        current = {conn.shape[1]: (ids, conn) for ids, conn in groups}
+        sizes = {}
+        for ids, conn in changed:
+            sizes.setdefault(conn.shape[1], []).append((ids, conn))
+        patched = []
+        for k in sorted(set(current) | set(sizes)):
+            ids, conn = current.get(k, (np.zeros(0, dtype=np.int64), np.zeros((0, k), dtype=np.int64)))
+            position = np.searchsorted(ids, changed_ids)
+            removed = position[ids[np.minimum(position, len(ids) - 1)] == changed_ids] if len(ids) > 0 else position[:0]
+            parts = sizes.get(k, [])
+            new_ids = np.concatenate([i for i, _ in parts]) if parts else ids[:0]
+            new_conn = np.concatenate([c for _, c in parts]) if parts else conn[:0]
+            order = np.argsort(new_ids, kind="stable")
+            new_ids, new_conn = new_ids[order], new_conn[order]
+            at = np.searchsorted(ids, new_ids)
+            ids = splice(ids, removed, at, new_ids)
+            if len(ids) > 0:
+                patched.append((ids, splice(conn, removed, at, new_conn)))
+        return patched
 
     def reverse_elements(self):
         """
@@ -145,18 +663,165 @@ class Mesh:
         """
         for e in self._elements:
             e.reverse()
+        self._invalidate()
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Measure the memory footprint of the mesh: nodes, elements, the adjacency and the cached data.
+
+        :return: the report with numbers of bytes by categories and per node and element
+        """
+        seen = set()
+        nodes = sizeof(self._storage, seen) + sizeof(self._nodes, seen)
+        elements = sizeof(self._elements, seen) + sizeof(self._cache.get("groups"), seen)
+        adjacency = sizeof(self._adjacent, seen)
+        cache = sizeof(self._cache, seen)
+        return MemoryReport(
+            {"nodes": nodes, "elements": elements, "adjacency": adjacency, "cache": cache},
+            self.nodes_count,
+            self.elements_count
+        )
 
     def copy(self) -> Mesh:
         """
-        Clone the mesh. The clone of the mesh is the mesh with the same coordinates of nodes and with the same topology of elements.
+        Clone the mesh. The clone of the mesh is the mesh with the same coordinates of nodes and with the same topology
+        of elements. The clone shares the topology (connectivity, edges) with the mesh read-only and keeps coordinates
+        and types of nodes as arrays, nodes and elements as objects are created on the first access only (see ArrayMesh).
 
         :return: the clone of the mesh
         """
-        copy_mesh = Mesh()
-        nodes_map = {}
-        for node in self._nodes:
-            new_node = copy_mesh.append_point(coords=node.coords, node_type=node.node_type, check=False)
-            nodes_map[node] = new_node
+        return ArrayMesh(self._storage.share(), self._topology(), self._epsilon)
+
+    def _topology(self) -> Dict[str, Any]:
+        """
+        Collect the cached data independent of coordinates to share it with a copy of the mesh. Arrays of groups
+        become read-only, since they are never changed in place.
+
+        :return: the dictionary of cached data by keys of TOPOLOGY
+        """
+        groups = self._element_groups()  # not cached by meshes calculating them, e.g. structured ones
+        for _, conn in groups:
+            conn.setflags(write=False)
+        topology = {key: value for key, value in self._cache.items() if key in self.TOPOLOGY}
+        topology["groups"] = groups
+        return topology
+
+
+class ArrayMesh(Mesh):
+    """
+    The mesh stored as arrays: coordinates and types of nodes and groups of elements, e.g. the copy of a mesh made
+    by `Mesh.copy` or the mesh of a vectorized creator. The storage of nodes and the topology (groups of elements,
+    edges, etc.) may be shared with other meshes read-only, the storage of copies diverges on the first change only.
+    Nodes and elements as objects are created on the first access (e.g. to change coordinates of a node), then the mesh
+    behaves as a generic one.
+    """
+
+    def __init__(self, storage: NodeStorage, topology: Dict[str, Any], epsilon: float = 1.0E-8):
+        """
+        Create the mesh.
+
+        :param storage: the storage of nodes, it may share arrays with other meshes (see `NodeStorage.share`)
+        :param topology: the cached data by keys of TOPOLOGY, "groups" is required
+        :param epsilon: the tolerance of coordinates
+        """
+        super().__init__(epsilon)
+        self._storage = storage
+        self._moves = storage.moves
+        self._node_id = len(storage)
+        self._cache.update(topology)
+        self._elements_count = sum(len(ids) for ids, _ in topology["groups"])
+        self._materialized = False
+
+    @staticmethod
+    def from_blocks(
+            coordinates: np.ndarray,
+            blocks: List[np.ndarray],
+            epsilon: float = 1.0E-8,
+            types: Optional[np.ndarray] = None
+    ) -> ArrayMesh:
+        """
+        Create the mesh of blocks of elements as `Mesh.from_blocks` keeping it as arrays.
+
+        :param coordinates: an (N, dim) array of coordinates of nodes
+        :param blocks: a list of (E_k, k) arrays of node indices of elements
+        :param epsilon: the tolerance of coordinates
+        :param types: an (N,) array of values of NodeType if they are known (e.g. by a creator), then edges
+        aren't built, types are classified by the boundary otherwise
+        :return: the mesh
+        """
+        coordinates = np.array(coordinates, dtype=float).reshape(len(coordinates), -1)
+        blocks = [np.asarray(b, dtype=np.int64) for b in blocks if len(b) > 0]
+        classify = types is None
+        if classify:
+            types = np.full(len(coordinates), NodeType.UNDEFINED.value)
+        storage = NodeStorage(coordinates, np.array(types, dtype=np.int8))
+        mesh = ArrayMesh(storage, {"groups": Mesh._block_groups(blocks)}, epsilon)
+        if classify:
+            mesh.classify_nodes()
+        return mesh
+
+    @property
+    def materialized(self) -> bool:
+        """True after nodes and elements have been created as objects"""
+        return self._materialized
+
+    def _materialize(self):
+        """
+        Create nodes as handles of the storage and elements as objects.
+        """
+        if self._materialized:
+            return
+        self._nodes = self._storage.handles(0, range(len(self._storage)))
+        self._adjacent = {node: [] for node in self._nodes}
+        self._elements = [None] * self._elements_count
+        for ids, conn in self._cache["groups"]:
+            for e, row in zip(ids.tolist(), conn.tolist()):
+                self._elements[e] = Element([self._nodes[i] for i in row])
         for element in self._elements:
-            copy_mesh.append_element(Element([nodes_map[n] for n in element.nodes]))
-        return copy_mesh
+            for node in element.nodes:
+                self._adjacent[node].append(element)
+        self._materialized = True
+
+    @property
+    def nodes(self):
+        self._materialize()
+        return super().nodes
+
+    @property
+    def elements(self):
+        self._materialize()
+        return super().elements
+
+    @property
+    def elements_count(self) -> int:
+        if self._materialized:
+            return super().elements_count
+        return self._elements_count
+
+    def get_adjacent(self, node: Node) -> List[Element]:
+        self._materialize()
+        return super().get_adjacent(node)
+
+    def reset_node_id(self):
+        self._materialize()
+        super().reset_node_id()
+
+    def append_point(self, coords: Iterable[float], node_type: NodeType, check: bool = True) -> Node:
+        self._materialize()
+        return super().append_point(coords, node_type, check)
+
+    def append_element(self, element: Element):
+        self._materialize()
+        super().append_element(element)
+
+    def reverse_elements(self):
+        self._materialize()
+        super().reverse_elements()
+
+    def elevate_order(self, placement: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        self._materialize()
+        return super().elevate_order(placement)
+
+    def refine(self, elements, placement: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        self._materialize()
+        return super().refine(elements, placement)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from enum import Enum
+from typing import List, Optional
 from scipy.spatial import distance
 
 import numpy as np
@@ -15,58 +16,258 @@ class NodeType(Enum):
     FIXED = 2
 
 
+NODE_TYPES = {t.value: t for t in NodeType}  # types of nodes by their values
+PRECISIONS = {"single": np.float32, "double": np.float64}  # types of stored coordinates by names of precisions
+
+
+class NodeStorage:
+    """
+    Coordinates and values of types of nodes of a mesh in arrays growing by doubling, nodes of the mesh are handles
+    of rows. All nodes have the same number of coordinates, it grows when a node gets more coordinates,
+    missing coordinates are zeros. Coordinates are stored in single or double precision (see PRECISIONS), they are
+    written in the precision of the storage. Arrays may be shared read-only by storages of copies of a mesh: whole arrays
+    are replaced (e.g. by moving all nodes) or copied before the first change in place.
+    """
+
+    __slots__ = ("_coordinates", "_types", "_count", "_moves")
+
+    def __init__(
+            self,
+            coordinates: Optional[np.ndarray] = None,
+            types: Optional[np.ndarray] = None,
+            dtype: type = np.float64
+    ):
+        """
+        Create the storage.
+
+        :param coordinates: an (N, dim) array of coordinates of nodes, nothing by default
+        :param types: an (N,) array of values of NodeType
+        :param dtype: the type of coordinates of the empty storage, the type of the array is kept otherwise
+        """
+        self._coordinates = np.zeros((0, 0), dtype=dtype) if coordinates is None else coordinates
+        self._types = np.zeros(0, dtype=np.int8) if types is None else types
+        self._count = len(self._coordinates)
+        self._moves = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """The (N, dim) view of coordinates, it is read-only if arrays are shared"""
+        return self._coordinates[:self._count]
+
+    @property
+    def types(self) -> np.ndarray:
+        """The (N,) view of values of NodeType, it is read-only if arrays are shared"""
+        return self._types[:self._count]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """The type of stored coordinates"""
+        return self._coordinates.dtype
+
+    @property
+    def moves(self) -> int:
+        """The number of changes of coordinates, e.g. to drop data of a mesh depending on them"""
+        return self._moves
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of arrays including the reserved capacity"""
+        return self._coordinates.nbytes + self._types.nbytes
+
+    def append(self, coordinates: np.ndarray, types: Iterable[int], ids: Iterable[int]) -> List[Node]:
+        """
+        Append nodes.
+
+        :param coordinates: an (M, dim) array of coordinates
+        :param types: M values of NodeType
+        :param ids: M IDs of nodes
+        :return: the list of M new nodes
+        """
+        coordinates = np.asarray(coordinates, dtype=float)
+        count = self._count + len(coordinates)
+        self._reserve(count, coordinates.shape[1])
+        self._coordinates[self._count:count] = 0.0
+        self._coordinates[self._count:count, :coordinates.shape[1]] = coordinates
+        self._types[self._count:count] = np.fromiter(types, dtype=np.int8, count=len(coordinates))
+        first = self._count
+        self._count = count
+        return self.handles(first, ids)
+
+    def handles(self, first: int, ids: Iterable[int]) -> List[Node]:
+        """
+        Create nodes of stored rows.
+
+        :param first: the index of the first row
+        :param ids: IDs of nodes of consecutive rows
+        :return: the list of nodes
+        """
+        nodes = []
+        for index, i in enumerate(ids, first):
+            node = Node.__new__(Node)
+            node._storage = self
+            node._index = index
+            node._node_type = None
+            node._id = i
+            nodes.append(node)
+        return nodes
+
+    def assign(self, coordinates: np.ndarray):
+        """
+        Replace coordinates of all nodes.
+
+        :param coordinates: an (N, dim) array of coordinates
+        """
+        self._coordinates = np.array(coordinates, dtype=self.dtype).reshape(self._count, -1)
+        self._types = self._types[:self._count]
+        self._moves += 1
+
+    def convert(self, dtype: type):
+        """
+        Replace the array of coordinates by the one of the other type, e.g. to store them in single precision.
+
+        :param dtype: the type of coordinates
+        """
+        self._coordinates = self.coordinates.astype(dtype)
+        self._types = self._types[:self._count]
+
+    def assign_types(self, types: np.ndarray):
+        """
+        Replace values of types of all nodes.
+
+        :param types: an (N,) array of values of NodeType
+        """
+        self._coordinates = self._coordinates[:self._count]
+        self._types = np.array(types, dtype=np.int8)
+
+    def write(self, index: int, coords: Iterable[float]):
+        """Write coordinates of the node, a node with less coordinates than others is padded by zeros"""
+        coords = np.asarray(coords, dtype=float).ravel()
+        self._reserve(self._count, len(coords))
+        self._coordinates[index] = 0.0
+        self._coordinates[index, :len(coords)] = coords
+        self._moves += 1
+
+    def write_type(self, index: int, value: int):
+        """Write the value of the type of the node"""
+        self._reserve(self._count, 0)
+        self._types[index] = value
+
+    def share(self) -> NodeStorage:
+        """
+        Share arrays with a new storage, both storages copy them before the first change in place.
+
+        :return: the storage of the same nodes without handles
+        """
+        self._coordinates.setflags(write=False)
+        self._types.setflags(write=False)
+        return NodeStorage(self.coordinates, self.types)
+
+    def _reserve(self, count: int, dim: int):
+        """Make arrays writable, large enough for the number of nodes and wide enough for the dimension"""
+        capacity, width = self._coordinates.shape
+        writable = self._coordinates.flags.writeable and self._types.flags.writeable
+        if count <= capacity and dim <= width and writable:
+            return
+        capacity = max(capacity if count <= capacity else 2 * capacity, count, 16)
+        coordinates = np.zeros((capacity, max(dim, width)), dtype=self.dtype)
+        coordinates[:self._count, :width] = self.coordinates
+        types = np.zeros(capacity, dtype=np.int8)
+        types[:self._count] = self.types
+        self._coordinates, self._types = coordinates, types
+
+
 class Node:
+    """
+    A node of a mesh: a handle of the row of the storage of the mesh, or a standalone node owning its coordinates
+    (e.g. a node of a local system of an element).
+    """
+
+    __slots__ = ("_storage", "_index", "_node_type", "_id")
+
     def __init__(self, coords: Iterable[float], node_type: NodeType, id: int):
-        self._coords = np.array(coords, dtype=float)  # type: np.ndarray
+        self._storage = np.array(coords, dtype=float)  # type: np.ndarray
+        self._index = -1
         self._node_type = node_type
         self._id = id
 
     @property
     def coords(self) -> np.ndarray:
-        return self._coords
+        """
+        Coordinates of the node. The row of the storage is returned as a read-only view: coordinates are changed
+        by the setter only, so shared arrays are copied before the change and data of the mesh depending on them
+        is dropped. The view isn't updated when the storage grows or is replaced, it must not be kept.
+        """
+        if self._index < 0:
+            return self._storage
+        row = self._storage._coordinates[self._index]
+        row.setflags(write=False)
+        return row
 
     @property
     def vec3d(self) -> np.ndarray:
+        """Coordinates padded to 3D, coordinates of a 3D node are returned as they are and mustn't be changed"""
+        coords = self.coords
+        if len(coords) == 3:
+            return coords
         return np.array((self.x, self.y, self.z))
 
     @coords.setter
     def coords(self, c: Iterable[float]):
-        self._coords = np.array(c, dtype=float)
+        if self._index < 0:
+            self._storage = np.array(c, dtype=float)
+        else:
+            self._storage.write(self._index, c)
 
     @property
     def node_type(self):
-        return self._node_type
+        if self._index < 0:
+            return self._node_type
+        return NODE_TYPES[int(self._storage._types[self._index])]
 
     @node_type.setter
     def node_type(self, nt: NodeType):
-        self._node_type = nt
+        if self._index < 0:
+            self._node_type = nt
+        else:
+            self._storage.write_type(self._index, nt.value)
+
+    def _get(self, axis: int) -> float:
+        coords = self.coords
+        return coords[axis] if len(coords) > axis else 0.0
+
+    def _set(self, axis: int, v: float):
+        coords = self.coords
+        if len(coords) > axis:
+            coords = coords.copy()
+            coords[axis] = v
+            self.coords = coords
 
     @property
     def x(self) -> float:
-        return self._coords[0] if len(self._coords) > 0 else 0.0
+        return self._get(0)
 
     @x.setter
     def x(self, v):
-        if len(self._coords) > 0:
-            self._coords[0] = v
+        self._set(0, v)
 
     @property
     def y(self) -> float:
-        return self._coords[1] if len(self._coords) > 1 else 0.0
+        return self._get(1)
 
     @y.setter
     def y(self, v):
-        if len(self._coords) > 1:
-            self._coords[1] = v
+        self._set(1, v)
 
     @property
     def z(self) -> float:
-        return self._coords[2] if len(self._coords) > 2 else 0.0
+        return self._get(2)
 
     @z.setter
     def z(self, v):
-        if len(self._coords) > 2:
-            self._coords[2] = v
+        self._set(2, v)
 
     @property
     def id(self):
@@ -77,13 +278,13 @@ class Node:
         self._id = i
 
     def to_node(self, node: Node):
-        return distance.euclidean(self._coords, node._coords)
+        return distance.euclidean(self.coords, node.coords)
 
     def to_point(self, coords: Iterable[float]):
-        return distance.euclidean(self._coords, coords)
+        return distance.euclidean(self.coords, coords)
 
     def vector(self, to_node: Node):
-        return to_node._coords - self._coords
+        return to_node.coords - self.coords
 
     def __str__(self):
-        return f"{str(self._coords)}-{self._node_type}"
+        return f"{str(self.coords)}-{self.node_type}"
@@ -0,0 +1,67 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Children of a refined element in local indices: corners are 0..k-1, the middle of the edge j is k + j
+# and the center is 2k. The edge j connects corners j and (j + 1) % k. Keys are the number of corners and
+# refined edges, children keep the orientation of the parent, the first child replaces the parent.
+_BASE = {
+    (3, (0,)): [[0, 3, 2], [3, 1, 2]],
+    (3, (0, 1)): [[3, 1, 4], [0, 3, 4], [0, 4, 2]],
+    (3, (0, 1, 2)): [[0, 3, 5], [3, 1, 4], [5, 4, 2], [3, 4, 5]],
+    (4, (0,)): [[0, 4, 3], [4, 1, 2], [4, 2, 3]],
+    (4, (0, 1)): [[4, 1, 5, 8], [0, 4, 8, 3], [8, 5, 2, 3]],
+    (4, (0, 2)): [[0, 4, 6, 3], [4, 1, 2, 6]],
+    (4, (0, 1, 2, 3)): [[0, 4, 8, 7], [4, 1, 5, 8], [8, 5, 2, 6], [7, 8, 6, 3]],
+}
+
+
+def _rotate(rows: List[List[int]], k: int, shift: int) -> List[List[int]]:
+    """Turn a template by the shift of local corners"""
+    def turn(i):
+        if i < k:
+            return (i + shift) % k
+        if i < 2 * k:
+            return k + (i - k + shift) % k
+        return i
+    return [[turn(i) for i in row] for row in rows]
+
+
+def _templates() -> Dict[Tuple[int, int], List[List[int]]]:
+    templates = {}
+    for (k, edges), rows in _BASE.items():
+        for shift in range(k):
+            mask = sum(1 << ((j + shift) % k) for j in edges)
+            templates.setdefault((k, mask), _rotate(rows, k, shift))
+    return templates
+
+
+TEMPLATES = _templates()  # children by the number of corners and the bit mask of refined edges
+
+ALLOWED = np.zeros((5, 16), dtype=bool)  # True if the pattern of refined edges has a conforming template
+for _k, _mask in TEMPLATES:
+    ALLOWED[_k, _mask] = True
+
+
+def edge_masks(element_edges: np.ndarray, refined: np.ndarray) -> np.ndarray:
+    """
+    Encode refined edges of elements as bit masks: the bit j is set if the local edge j is refined.
+
+    :param element_edges: an (E, k) array of edge indices padded by -1
+    :param refined: the boolean mask of refined edges
+    :return: an (E,) array of masks
+    """
+    valid = element_edges >= 0
+    bits = valid & refined[np.where(valid, element_edges, 0)]
+    return (bits * (1 << np.arange(element_edges.shape[1]))).sum(axis=1)
+
+
+def uses_center(k: int, mask: int) -> bool:
+    """
+    Check if the template of the pattern creates the central node.
+
+    :param k: the number of corners
+    :param mask: the bit mask of refined edges
+    :return: True if children use the center
+    """
+    return any(2 * k in row for row in TEMPLATES[(k, mask)])
@@ -0,0 +1,272 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+
+IDEAL = {
+    3: np.linalg.inv(np.array([[1.0, 0.5], [0.0, np.sqrt(3.0) / 2.0]])),
+    4: np.eye(2)
+}  # inverse Jacobi matrices of ideal corners by the number of corners: the equilateral triangle and the square
+
+
+def node_adjacency(mesh: Mesh) -> csr_matrix:
+    """
+    Build the node-to-node adjacency of the mesh by its unique edges. The matrix is cached until the topology changes.
+
+    :param mesh: the mesh
+    :return: the symmetric sparse (N, N) matrix of ones
+    """
+    def build():
+        edges = mesh.edge_index.edges
+        count = mesh.nodes_count
+        rows = np.concatenate((edges[:, 0], edges[:, 1]))
+        columns = np.concatenate((edges[:, 1], edges[:, 0]))
+        return coo_matrix((np.ones(len(rows)), (rows, columns)), shape=(count, count)).tocsr()
+    return mesh.cached("adjacency", build)
+
+
+class SmoothingStatistics:
+    """The history of a smoothing: the maximal displacement of nodes and elapsed times after every sweep."""
+
+    def __init__(self, method: str):
+        self.method = method
+        self.displacements = []  # maximal displacements of nodes by sweeps relative to the mean edge length
+        self.times = []  # seconds elapsed from the start
+        self.converged = False
+
+    @property
+    def iterations(self) -> int:
+        return len(self.displacements)
+
+    @property
+    def time(self) -> float:
+        return self.times[-1] if self.times else 0.0
+
+    def record(self, displacement: float, start: float):
+        self.displacements.append(displacement)
+        self.times.append(perf_counter() - start)
+
+    def __str__(self):
+        return (
+            f"{self.method}: {self.iterations} sweeps, converged: {self.converged}, "
+            f"displacement: {self.displacements[-1] if self.displacements else float('nan'):.3e}, "
+            f"time: {self.time:.3f} s"
+        )
+
+
+class MeshSmoother:
+    """
+    Smoothing of meshes of linear triangles and quadrilaterals by moving free nodes, BORDER and FIXED nodes are pinned.
+
+    - laplacian: a node moves to the mean of its neighbors by edges;
+    - area: a node moves to the mean of centers of adjacent elements weighted by their areas;
+    - jacobian: the descent of the sum of condition numbers |T|^2 / (2 det T) of corners of plane elements, where T maps
+      the ideal corner (the square or the equilateral triangle) to the actual one. The condition number grows
+      infinitely for degenerated corners, steps are reduced until every corner stays valid and the sum decreases.
+
+    Sweeps update all nodes at once (Jacobi-like) by sparse products, so their cost is O(N + E). Products can be
+    split by rows between threads.
+    """
+
+    METHODS = ("laplacian", "area", "jacobian")
+
+    def __init__(
+            self,
+            method: str = "laplacian",
+            relaxation: float = 0.5,
+            tolerance: float = 1.0E-4,
+            max_iterations: int = 100,
+            workers: int = 1
+    ):
+        """
+        Create the smoother.
+
+        :param method: the name from METHODS
+        :param relaxation: the fraction of the step to the target of a node, the first step of the descent for jacobian
+        :param tolerance: the maximal displacement of the convergence relative to the mean edge length
+        :param max_iterations: the maximal number of sweeps
+        :param workers: the number of threads of sparse products
+        """
+        if method not in self.METHODS:
+            raise Exception(f"unknown method {method}, use one of {self.METHODS}")
+        self._method = method
+        self._relaxation = relaxation
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+        self._workers = workers
+
+    def smooth(self, mesh: Mesh, pinned=None) -> SmoothingStatistics:
+        """
+        Smooth the mesh in place.
+
+        :param mesh: the mesh of linear triangles and quadrilaterals, plane for area and jacobian
+        :param pinned: indices or a boolean mask of nodes to pin in addition to BORDER and FIXED ones
+        :return: the statistics
+        """
+        groups = mesh._element_groups()
+        if any(conn.shape[1] not in IDEAL for _, conn in groups):
+            raise Exception("only meshes of linear triangles and quadrilaterals can be smoothed")
+        start = perf_counter()
+        adjacency = node_adjacency(mesh)
+        types = mesh.node_types()
+        fixed = (types == NodeType.BORDER.value) | (types == NodeType.FIXED.value)
+        fixed |= np.diff(adjacency.indptr) == 0
+        if pinned is not None:
+            fixed[pinned] = True
+        free = np.flatnonzero(~fixed)
+        coordinates = mesh.coordinates
+        length = mesh.edge_index.lengths(coordinates).mean()
+        statistics = SmoothingStatistics(self._method)
+        pool = ThreadPoolExecutor(self._workers) if self._workers > 1 else None
+        try:
+            if self._method == "jacobian":
+                plane = self._descend(groups, adjacency, coordinates[:, :2], free, length, pool, statistics, start)
+                coordinates[:, :2] = plane
+            else:
+                if self._method == "laplacian":
+                    sweep = self._laplacian(adjacency, pool)
+                else:
+                    sweep = self._area(groups, len(coordinates), pool)
+                movable = np.zeros((len(coordinates), 1))
+                movable[free] = self._relaxation
+                for _ in range(self._max_iterations):
+                    step = movable * (sweep(coordinates) - coordinates)
+                    coordinates += step
+                    statistics.record(np.sqrt(np.max(np.sum(step ** 2, axis=1), initial=0.0)) / length, start)
+                    if statistics.displacements[-1] <= self._tolerance:
+                        statistics.converged = True
+                        break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        mesh.move_nodes(coordinates)
+        return statistics
+
+    def _product(self, matrix: csr_matrix, pool: Optional[ThreadPoolExecutor]):
+        """Multiply the matrix by arrays, blocks of rows are multiplied by threads of the pool"""
+        if pool is None:
+            return lambda values: matrix @ values
+        bounds = np.linspace(0, matrix.shape[0], self._workers + 1).astype(int)
+        blocks = [matrix[low:high] for low, high in zip(bounds[:-1], bounds[1:])]
+        return lambda values: np.concatenate(list(pool.map(lambda block: block @ values, blocks)))
+
+    def _laplacian(self, adjacency: csr_matrix, pool: Optional[ThreadPoolExecutor]):
+        """The sweep moving nodes to the mean of their neighbors"""
+        product = self._product(adjacency, pool)
+        degree = np.maximum(np.diff(adjacency.indptr), 1)[:, None]
+        return lambda coordinates: product(coordinates) / degree
+
+    def _area(self, groups: List[Tuple[np.ndarray, np.ndarray]], nodes_count: int, pool: Optional[ThreadPoolExecutor]):
+        """The sweep moving nodes to the mean of centers of adjacent elements weighted by areas"""
+        count = sum(len(ids) for ids, _ in groups)
+        rows = np.concatenate([conn.ravel() for _, conn in groups])
+        columns = np.concatenate([np.repeat(ids, conn.shape[1]) for ids, conn in groups])
+        incidence = coo_matrix((np.ones(len(rows)), (rows, columns)), shape=(nodes_count, count)).tocsr()
+        product = self._product(incidence, pool)
+
+        def sweep(coordinates):
+            weighted = np.zeros((count, coordinates.shape[1] + 1))
+            for ids, conn in groups:
+                x, y = coordinates[conn, 0], coordinates[conn, 1]
+                area = 0.5 * np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1)
+                weighted[ids, :-1] = area[:, None] * coordinates[conn].mean(axis=1)
+                weighted[ids, -1] = area
+            sums = product(weighted)
+            return sums[:, :-1] / np.where(sums[:, -1:] > 0.0, sums[:, -1:], 1.0)
+        return sweep
+
+    def _descend(
+            self,
+            groups: List[Tuple[np.ndarray, np.ndarray]],
+            adjacency: csr_matrix,
+            coordinates: np.ndarray,
+            free: np.ndarray,
+            length: float,
+            pool: Optional[ThreadPoolExecutor],
+            statistics: SmoothingStatistics,
+            start: float
+    ) -> np.ndarray:
+        """Decrease the sum of condition numbers of corners by steps along the scaled gradient"""
+        corners = [
+            (conn.ravel(), np.roll(conn, -1, axis=1).ravel(), np.roll(conn, 1, axis=1).ravel(), IDEAL[conn.shape[1]])
+            for _, conn in groups
+        ]
+        if pool is None:
+            def condition(points):
+                return _condition(corners, points)
+        else:
+            # corners are split between threads, their sums and gradients are added
+            splits = [[np.array_split(nodes, self._workers) for nodes in group[:3]] + [group[3]] for group in corners]
+            parts = [[(c[i], f[i], p[i], w) for c, f, p, w in splits] for i in range(self._workers)]
+
+            def condition(points):
+                results = list(pool.map(lambda part: _condition(part, points), parts))
+                return sum(r[0] for r in results), sum(r[1] for r in results)
+        # the step of a node is scaled by the mean squared length of its edges, so the step is invariant to the scale
+        rows, columns = adjacency.nonzero()
+        squares = np.sum((coordinates[rows] - coordinates[columns]) ** 2, axis=1)
+        scale = np.bincount(rows, squares, minlength=len(coordinates)) / np.maximum(np.diff(adjacency.indptr), 1)
+        value, gradient = condition(coordinates)
+        if not np.isfinite(value):
+            raise Exception("the mesh has degenerated or inverted elements")
+        alpha = self._relaxation
+        for _ in range(self._max_iterations):
+            step = np.zeros_like(coordinates)
+            step[free] = -scale[free, None] * gradient[free]
+            largest = np.sqrt(np.max(np.sum(step ** 2, axis=1), initial=0.0)) / length
+            # the step is halved until the sum decreases, the descent stops on steps below the tolerance
+            while alpha * largest > self._tolerance:
+                trial = coordinates + alpha * step
+                trial_value, trial_gradient = condition(trial)
+                if trial_value <= value:
+                    break
+                alpha *= 0.5
+            else:
+                statistics.record(alpha * largest, start)
+                statistics.converged = True
+                break
+            coordinates, value, gradient = trial, trial_value, trial_gradient
+            statistics.record(alpha * largest, start)
+            alpha = min(2.0 * alpha, 1.0)
+        return coordinates
+
+
+def _condition(corners: List[tuple], coordinates: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Calculate the sum of condition numbers of corners and its gradient by coordinates of nodes.
+    Products of 2 x 2 matrices are written by components, since they are applied to millions of corners.
+
+    :param corners: a list of tuples (corners, next nodes, previous nodes, the inverse ideal Jacobi matrix) of groups,
+    nodes are flat arrays
+    :param coordinates: an (N, 2) array of coordinates
+    :return: the sum, infinite if a corner is degenerated or inverted, and the (N, 2) gradient
+    """
+    total = 0.0
+    gradient = np.zeros_like(coordinates)
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    for center, following, previous, w in corners:
+        # the Jacobi matrix has edges to the next and to the previous nodes as columns: J = [a b], T = J W
+        ax, ay = x[following] - x[center], y[following] - y[center]
+        bx, by = x[previous] - x[center], y[previous] - y[center]
+        t00, t01 = ax * w[0, 0] + bx * w[1, 0], ax * w[0, 1] + bx * w[1, 1]
+        t10, t11 = ay * w[0, 0] + by * w[1, 0], ay * w[0, 1] + by * w[1, 1]
+        det = t00 * t11 - t01 * t10
+        if np.any(det <= 0.0):
+            return np.inf, gradient
+        value = (t00 ** 2 + t01 ** 2 + t10 ** 2 + t11 ** 2) / (2.0 * det)
+        total += np.sum(value)
+        # d(value) / dT = (T - value * cofactor(T)) / det, then d(value) / dJ = d(value) / dT W^T
+        d00, d01 = (t00 - value * t11) / det, (t01 + value * t10) / det
+        d10, d11 = (t10 + value * t01) / det, (t11 - value * t00) / det
+        for d, (first, second) in enumerate(((d00, d01), (d10, d11))):
+            forward = first * w[0, 0] + second * w[0, 1]
+            backward = first * w[1, 0] + second * w[1, 1]
+            gradient[:, d] += np.bincount(following, forward, minlength=len(coordinates))
+            gradient[:, d] += np.bincount(previous, backward, minlength=len(coordinates))
+            gradient[:, d] -= np.bincount(center, forward + backward, minlength=len(coordinates))
+    return total, gradient
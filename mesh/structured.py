@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from mesh.element import Element
+from mesh.memory import MemoryReport
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+
+
+class StructuredMesh(Mesh):
+    """
+    The logically structured grid of quadrilaterals. The node (i, j) has the index i * num_y + j and the element (i, j)
+    has the index i * (num_y - 1) + j and the nodes (i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1).
+    The topology isn't stored: connectivity, neighbors and the boundary are calculated by index arithmetic.
+    Nodes and elements as objects are created on the first access only (e.g. by a union), since then the mesh
+    behaves as a generic one. Appending nodes or elements and reversing elements cancel the structure.
+    """
+
+    def __init__(self, grid: np.ndarray, epsilon: float = 1.0E-8, precision: str = "double"):
+        """
+        Create a structured mesh.
+
+        :param grid: a (num_x, num_y, dim) array of coordinates of nodes
+        :param epsilon: the tolerance of coordinates
+        :param precision: the precision of stored coordinates (see `Mesh.precision`)
+        """
+        super().__init__(epsilon, precision)
+        self._grid = np.array(grid, dtype=self._storage.dtype)
+        if self._grid.ndim != 3 or self._grid.shape[0] < 2 or self._grid.shape[1] < 2:
+            raise Exception("a structured mesh requires a (num_x, num_y, dim) grid with at least 2 x 2 nodes")
+        self._shape = self._grid.shape[0], self._grid.shape[1]
+        self._materialized = False
+        self._structured = True
+
+    @property
+    def shape(self):
+        """The number of nodes along the first and the second directions of the grid: num_x, num_y"""
+        return self._shape
+
+    @property
+    def structured(self) -> bool:
+        """True until the topology of the mesh is changed"""
+        return self._structured
+
+    @property
+    def precision(self) -> str:
+        return super().precision
+
+    @precision.setter
+    def precision(self, precision: str):
+        Mesh.precision.fset(self, precision)
+        self._grid = self._grid.astype(self._storage.dtype, copy=False)
+
+    @property
+    def grid(self) -> np.ndarray:
+        """
+        The (num_x, num_y, dim) array of coordinates of nodes in the precision of the mesh,
+        it is read-only when shared with a copy
+        """
+        if self._materialized:
+            return self.coordinates.reshape(self._shape[0], self._shape[1], -1)
+        return self._grid
+
+    def _materialize(self):
+        """
+        Create nodes and elements as objects, since then coordinates are stored by the storage of nodes.
+        """
+        if self._materialized:
+            return
+        num_x, num_y = self.shape
+        nodes = self._append_nodes(self._grid.reshape(num_x * num_y, -1), self.node_types().tolist())
+        # the mesh isn't changed: its version and the cached topology are kept
+        self._append_elements(Element([nodes[i] for i in row]) for row in self.connectivity.tolist())
+        self._grid = np.empty((0, 0, self._grid.shape[2]), dtype=self._grid.dtype)  # a view would keep the grid alive
+        self._materialized = True
+
+    def _cancel_structure(self):
+        self._materialize()
+        self._structured = False
+        self._invalidate()
+
+    @property
+    def nodes(self):
+        self._materialize()
+        return super().nodes
+
+    @property
+    def elements(self):
+        self._materialize()
+        return super().elements
+
+    @property
+    def nodes_count(self) -> int:
+        if self._structured:
+            return self.shape[0] * self.shape[1]
+        return super().nodes_count
+
+    @property
+    def elements_count(self) -> int:
+        if self._structured:
+            return (self.shape[0] - 1) * (self.shape[1] - 1)
+        return super().elements_count
+
+    def node_index(self, i, j):
+        """
+        Calculate indices of nodes by their grid positions.
+
+        :param i: positions along the first direction
+        :param j: positions along the second direction
+        :return: indices of nodes
+        """
+        return np.asarray(i) * self.shape[1] + np.asarray(j)
+
+    def element_index(self, i, j):
+        """
+        Calculate indices of elements by their grid positions.
+
+        :param i: positions along the first direction
+        :param j: positions along the second direction
+        :return: indices of elements
+        """
+        return np.asarray(i) * (self.shape[1] - 1) + np.asarray(j)
+
+    def element_nodes(self, element):
+        """
+        Calculate indices of nodes of elements.
+
+        :param element: indices of elements
+        :return: an array of the shape of the argument with the additional last axis of 4 node indices
+        """
+        i, j = np.divmod(np.asarray(element), self.shape[1] - 1)
+        return np.stack((
+            self.node_index(i, j),
+            self.node_index(i + 1, j),
+            self.node_index(i + 1, j + 1),
+            self.node_index(i, j + 1)
+        ), axis=-1)
+
+    def adjacent_elements(self, node: int) -> np.ndarray:
+        """
+        Find the elements including the node.
+
+        :param node: the index of the node
+        :return: an array of element indices
+        """
+        i, j = divmod(int(node), self.shape[1])
+        ii, jj = np.meshgrid([i - 1, i], [j - 1, j], indexing="ij")
+        valid = (ii >= 0) & (ii < self.shape[0] - 1) & (jj >= 0) & (jj < self.shape[1] - 1)
+        return self.element_index(ii[valid], jj[valid])
+
+    def node_neighbors(self, node: int) -> np.ndarray:
+        """
+        Find the nodes connected with the node by edges.
+
+        :param node: the index of the node
+        :return: an array of node indices
+        """
+        i, j = divmod(int(node), self.shape[1])
+        ii = np.array([i + 1, i, i - 1, i])
+        jj = np.array([j, j + 1, j, j - 1])
+        valid = (ii >= 0) & (ii < self.shape[0]) & (jj >= 0) & (jj < self.shape[1])
+        return self.node_index(ii[valid], jj[valid])
+
+    def border(self) -> np.ndarray:
+        """
+        Find nodes on the border of the grid.
+
+        :return: a (num_x, num_y) boolean array
+        """
+        border = np.ones(self.shape, dtype=bool)
+        border[1:-1, 1:-1] = False
+        return border
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        if self._materialized:
+            return super().coordinates
+        return self._grid.reshape(self.nodes_count, -1).astype(np.float64)
+
+    def move_nodes(self, coordinates: np.ndarray):
+        if self._materialized:
+            return super().move_nodes(coordinates)
+        coordinates = np.array(coordinates, dtype=self._storage.dtype)
+        if len(coordinates) != self.nodes_count:
+            raise Exception(f"{len(coordinates)} coordinates are given for {self.nodes_count} nodes")
+        self._grid = coordinates.reshape(self._shape[0], self._shape[1], -1)
+        self._moved()
+
+    def node_types(self) -> np.ndarray:
+        if self._materialized:
+            return super().node_types()
+        return np.where(self.border().ravel(), NodeType.BORDER.value, NodeType.INTERNAl.value)
+
+    @property
+    def connectivity(self) -> np.ndarray:
+        if not self._structured:
+            return super().connectivity
+        if "connectivity" not in self._cache:
+            self._cache["connectivity"] = self.element_nodes(np.arange(self.elements_count))
+        return self._cache["connectivity"]
+
+    def _element_groups(self) -> List[tuple]:
+        if not self._structured:
+            return super()._element_groups()
+        return [(np.arange(self.elements_count), self.connectivity)]
+
+    def element_neighbors(self) -> np.ndarray:
+        if not self._structured:
+            return super().element_neighbors()
+        num_x, num_y = self.shape
+        i, j = np.divmod(np.arange(self.elements_count), num_y - 1)
+        neighbors = np.stack((
+            np.where(j > 0, self.element_index(i, j - 1), -1),
+            np.where(i < num_x - 2, self.element_index(i + 1, j), -1),
+            np.where(j < num_y - 2, self.element_index(i, j + 1), -1),
+            np.where(i > 0, self.element_index(i - 1, j), -1)
+        ), axis=1)
+        return neighbors
+
+    def extract_boundary(self, classify: bool = True) -> List[np.ndarray]:
+        if not self._structured:
+            return super().extract_boundary(classify)
+        if classify:
+            self.classify_nodes()
+        num_x, num_y = self.shape
+        i = np.arange(num_x)
+        j = np.arange(num_y)
+        loop = np.concatenate((
+            self.node_index(i[:-1], 0),
+            self.node_index(num_x - 1, j[:-1]),
+            self.node_index(i[:0:-1], num_y - 1),
+            self.node_index(0, j[:0:-1])
+        ))
+        return [loop]
+
+    def classify_nodes(self):
+        if self._materialized:
+            super().classify_nodes()
+
+    def mean_edge_length(self):
+        if self._materialized:
+            return super().mean_edge_length()
+        grid = self._grid.astype(np.float64)
+        lengths = np.concatenate((
+            np.linalg.norm(grid[1:, :] - grid[:-1, :], axis=2).ravel(),
+            np.linalg.norm(grid[:, 1:] - grid[:, :-1], axis=2).ravel()
+        ))
+        return np.mean(lengths)
+
+    def get_adjacent(self, node):
+        self._materialize()
+        return super().get_adjacent(node)
+
+    def get_moore(self, node):
+        self._materialize()
+        return super().get_moore(node)
+
+    def append_point(self, coords, node_type: NodeType, check: bool = True):
+        self._cancel_structure()
+        return super().append_point(coords, node_type, check)
+
+    def append_element(self, element: Element):
+        self._cancel_structure()
+        super().append_element(element)
+
+    def reset_node_id(self):
+        self._materialize()
+        super().reset_node_id()
+
+    def memory_report(self) -> MemoryReport:
+        report = super().memory_report()
+        report.add("nodes", self._grid.nbytes)
+        return report
+
+    def reverse_elements(self):
+        self._cancel_structure()
+        super().reverse_elements()
+
+    def elevate_order(self, placement: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        self._cancel_structure()
+        return super().elevate_order(placement)
+
+    def refine(self, elements, placement: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        if self._structured:
+            groups = self._element_groups()
+            self._cancel_structure()
+            self._cache["groups"] = groups  # elements are materialized in the order of the grid
+        return super().refine(elements, placement)
+
+    def copy(self) -> Mesh:
+        if self._materialized:
+            return super().copy()
+        # the grid is shared read-only, moving nodes of one of meshes replaces its grid
+        self._grid.setflags(write=False)
+        clone = StructuredMesh(self._grid[:2, :2], self._epsilon, self.precision)
+        clone._grid = self._grid
+        clone._shape = self._shape
+        clone._cache.update(self._topology())
+        return clone
+
+
+def serendipity(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build 8-nodes quadrilaterals from the grid of the double resolution: corners of elements are nodes with even
+    positions, mid-edge nodes have one odd position and centers of elements (both positions are odd) are dropped.
+
+    :param grid: a (2 * num_x - 1, 2 * num_y - 1, dim) array of coordinates of nodes
+    :return: coordinates (N, dim) and connectivity (E, 8) in the order of nodes of IsoQuad8
+    """
+    fine_x, fine_y = grid.shape[0], grid.shape[1]
+    if fine_x % 2 == 0 or fine_y % 2 == 0 or fine_x < 3 or fine_y < 3:
+        raise Exception("a grid of 8-nodes quadrilaterals requires odd numbers of nodes along both directions")
+    keep = (np.arange(fine_x)[:, np.newaxis] % 2 == 0) | (np.arange(fine_y)[np.newaxis, :] % 2 == 0)
+    numbers = np.full((fine_x, fine_y), -1, dtype=np.int64)
+    numbers[keep] = np.arange(np.count_nonzero(keep))
+    i, j = np.meshgrid(np.arange(0, fine_x - 1, 2), np.arange(0, fine_y - 1, 2), indexing="ij")
+    i, j = i.ravel(), j.ravel()
+    connectivity = np.stack((
+        numbers[i, j], numbers[i + 2, j], numbers[i + 2, j + 2], numbers[i, j + 2],
+        numbers[i + 1, j], numbers[i + 2, j + 1], numbers[i + 1, j + 2], numbers[i, j + 1]
+    ), axis=1)
+    return grid[keep], connectivity
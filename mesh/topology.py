@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+from copy import copy
+from typing import List, Tuple
+
+import numpy as np
+
+QUADRATIC = {
+    6: 3,
+    8: 4
+}  # numbers of corners of quadratic triangles and quadrilaterals, their mid-edge nodes follow corners
+
+
+ELEMENT_TYPES = {
+    2: "line2",
+    3: "tri3",
+    4: "quad4",
+    6: "tri6",
+    8: "quad8"
+}  # names of plane element types by the number of nodes
+
+
+def corners(nodes_number: int) -> int:
+    """
+    Calculate the number of corners of an element. The local mid-edge node k + j of a quadratic element with k corners
+    lies on the edge between the corners j and (j + 1) % k, other elements are linear polygons.
+
+    :param nodes_number: the number of nodes of the element
+    :return: the number of corners
+    """
+    return QUADRATIC.get(nodes_number, nodes_number)
+
+
+def outline(nodes_number: int) -> List[int]:
+    """
+    Order local nodes of an element along its boundary, e.g. to draw a quadratic element as a polygon.
+
+    :param nodes_number: the number of nodes of the element
+    :return: the list of local node indices
+    """
+    k = corners(nodes_number)
+    if k == nodes_number:
+        return list(range(nodes_number))
+    return [i for j in range(k) for i in (j, k + j)]
+
+
+def polygons(blocks: List[ElementBlock], elements_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build polygons of elements in the order of elements, e.g. for VTK cell arrays. Nodes of a polygon go along
+    the boundary of its element (see outline).
+
+    :param blocks: blocks of elements of the mesh
+    :param elements_count: the number of elements in the mesh
+    :return: offsets (E + 1,) of polygons in the flat array and the flat array of node indices
+    """
+    sizes = np.zeros(elements_count, dtype=np.int64)
+    for block in blocks:
+        sizes[block.elements] = block.nodes_number
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    nodes = np.empty(offsets[-1], dtype=np.int64)
+    for block in blocks:
+        k = block.nodes_number
+        nodes[offsets[block.elements][:, None] + np.arange(k)] = block.connectivity[:, outline(k)]
+    return offsets, nodes
+
+
+SPLICE_CUTS = 256  # the largest number of changed positions of an array copied by slices
+
+
+class ElementBlock:
+    """Elements of one type stored densely: indices of the elements in the mesh and their connectivity."""
+
+    def __init__(self, elements: np.ndarray, connectivity: np.ndarray):
+        """
+        Create the block.
+
+        :param elements: an (E_k,) array of indices of elements in the mesh
+        :param connectivity: an (E_k, k) array of node indices of the elements
+        """
+        self._elements = elements
+        self._connectivity = connectivity
+
+    @property
+    def elements(self) -> np.ndarray:
+        """Indices of elements of the block in the mesh"""
+        return self._elements
+
+    @property
+    def connectivity(self) -> np.ndarray:
+        """The (E_k, k) array of node indices of elements"""
+        return self._connectivity
+
+    @property
+    def nodes_number(self) -> int:
+        return self._connectivity.shape[1]
+
+    @property
+    def name(self) -> str:
+        """The name of the type of elements, e.g. tri3 or quad8"""
+        return ELEMENT_TYPES.get(self.nodes_number, f"polygon{self.nodes_number}")
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+
+class EdgeIndex:
+    """
+    The unique edges of a mesh with the element-to-edge and the edge-to-element maps.
+
+    An edge is stored once as a sorted pair of node indices. The local edge j of an element connects
+    its local nodes j and (j + 1) % k, where k is the number of corners of the element.
+    """
+
+    def __init__(self, groups: List[Tuple[np.ndarray, np.ndarray]], elements_count: int, nodes_count: int):
+        """
+        Build the index from the connectivity of elements.
+
+        :param groups: a list of pairs (element indices (E_g,), connectivity of corners (E_g, k)), one per element size
+        :param elements_count: the number of elements in the mesh
+        :param nodes_count: the number of nodes in the mesh
+        """
+        max_corners = max((conn.shape[1] for _, conn in groups), default=0)
+        self._element_edges = np.full((elements_count, max_corners), -1, dtype=np.int64)
+        keys, owners = _incidences(groups, nodes_count)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.ravel()
+        self._edges = np.stack((keys // max(nodes_count, 1), keys % max(nodes_count, 1)), axis=1)
+        self._fill(groups, inverse)
+        order = np.argsort(inverse, kind="stable")
+        self._link(inverse[order], owners[order], len(keys))
+
+    def _fill(self, groups: List[Tuple[np.ndarray, np.ndarray]], inverse: np.ndarray):
+        """Write edges of elements of the groups to the element-to-edge map by edges of their incidences"""
+        offset = 0
+        for ids, conn in groups:
+            size = conn.size
+            self._element_edges[ids, :conn.shape[1]] = inverse[offset:offset + size].reshape(conn.shape)
+            offset += size
+
+    def _link(self, incidence_edges: np.ndarray, incidence_owners: np.ndarray, edges_count: int):
+        """Build the edge-to-element maps by incidences of edges in elements sorted by edges"""
+        self._valence = np.bincount(incidence_edges, minlength=edges_count)
+        start = np.concatenate(([0], np.cumsum(self._valence)[:-1])).astype(np.int64)
+        self._edge_elements = np.full((edges_count, 2), -1, dtype=np.int64)
+        if edges_count > 0:
+            self._edge_elements[:, 0] = incidence_owners[start]
+            shared = self._valence > 1
+            self._edge_elements[shared, 1] = incidence_owners[start[shared] + 1]
+        self._edge_owners = incidence_owners
+        self._edge_offsets = np.concatenate((start, [len(incidence_edges)])).astype(np.int64)
+
+    def copy(self) -> EdgeIndex:
+        """
+        Copy the index sharing its arrays. Arrays are never changed in place, so an update of the copy
+        doesn't change the original index, e.g. the one of a copied mesh.
+
+        :return: the copy
+        """
+        return copy(self)
+
+    def update(self, groups: List[Tuple[np.ndarray, np.ndarray]], elements_count: int, nodes_count: int):
+        """
+        Replace edges of changed elements and add edges of new elements without rebuilding the index, e.g. after
+        a local refinement. Only incidences of the given elements are searched and sorted, arrays of the rest
+        of the index are shifted by linear copies (deletions and insertions). Elements can't be removed, nodes
+        and elements are appended after the existing ones.
+
+        :param groups: a list of pairs (indices of changed or new elements, connectivity of their corners)
+        :param elements_count: the number of elements in the mesh after the change
+        :param nodes_count: the number of nodes in the mesh after the change
+        """
+        scale = max(nodes_count, 1)
+        edges_count = len(self._edges)
+        old = self._element_edges
+        changed = np.unique(np.concatenate([ids for ids, _ in groups])) if groups else np.zeros(0, dtype=np.int64)
+        # incidences of changed elements are removed, only edges of their old rows are touched
+        touched = old[changed[changed < len(old)]]
+        touched = np.unique(touched[touched >= 0])
+        counts = self._valence[touched]
+        positions = np.repeat(self._edge_offsets[touched] - np.cumsum(counts) + counts, counts) + \
+            np.arange(np.sum(counts))
+        position = np.minimum(np.searchsorted(changed, self._edge_owners[positions]), max(len(changed) - 1, 0))
+        removed = positions[changed[position] == self._edge_owners[positions]] if len(changed) > 0 else positions
+        removed = np.sort(removed)
+        removed_edges = np.repeat(touched, counts)[np.isin(positions, removed)]
+        valence = self._valence.copy()
+        np.subtract.at(valence, removed_edges, 1)
+        # incidences of the given elements: matched with existing edges or fresh ones
+        keys, owners = _incidences(groups, nodes_count)
+        old_keys = self._edges[:, 0] * scale + self._edges[:, 1]
+        added, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.ravel()
+        place = np.searchsorted(old_keys, added)
+        matched = place < edges_count
+        matched[matched] = old_keys[place[matched]] == added[matched]
+        added_counts = np.bincount(inverse, minlength=len(added))
+        np.add.at(valence, place[matched], added_counts[matched])
+        dead = touched[valence[touched] == 0]
+        fresh = np.flatnonzero(~matched)
+        fresh_place = place[fresh]  # fresh edges are inserted before these old edges
+        # old edges are shifted by removed edges and edges inserted before them
+        delta = np.zeros(edges_count + 2, dtype=np.int64)
+        np.add.at(delta, fresh_place, 1)
+        np.add.at(delta, dead + 1, -1)
+        remap = np.arange(edges_count + 1) + np.cumsum(delta)[:edges_count + 1]
+        remap[dead] = -1
+        remap[-1] = -1  # the padding -1 of element edges is mapped to itself
+        added_edges = remap[place]
+        added_edges[fresh] = fresh_place + np.arange(len(fresh)) - np.searchsorted(dead, fresh_place)
+        # new incidences follow the kept ones of their edge
+        order = np.argsort(inverse, kind="stable")
+        at = self._edge_offsets[place + matched][inverse[order]]
+        self._edge_owners = splice(self._edge_owners, removed, at, owners[order])
+        self._valence = splice(valence, dead, fresh_place, added_counts[fresh])
+        self._edge_offsets = np.concatenate(([0], np.cumsum(self._valence))).astype(np.int64)
+        pairs = added[fresh]
+        self._edges = splice(self._edges, dead, fresh_place, np.stack((pairs // scale, pairs % scale), axis=1))
+        # adjacent elements of edges with changed incidences
+        edge_elements = splice(self._edge_elements, dead, fresh_place, np.full((len(fresh), 2), -1, dtype=np.int64))
+        linked = np.unique(np.concatenate((remap[touched], added_edges)))
+        linked = linked[linked >= 0]
+        start = self._edge_offsets[linked]
+        edge_elements[linked, 0] = self._edge_owners[start]
+        edge_elements[linked, 1] = np.where(
+            self._valence[linked] > 1, self._edge_owners[np.minimum(start + 1, len(self._edge_owners) - 1)], -1
+        )
+        self._edge_elements = edge_elements
+        width = max([old.shape[1]] + [conn.shape[1] for _, conn in groups])
+        element_edges = remap[old]
+        if element_edges.shape != (elements_count, width):
+            element_edges = np.pad(
+                element_edges, ((0, elements_count - len(old)), (0, width - old.shape[1])), constant_values=-1
+            )
+        element_edges[changed] = -1
+        self._element_edges = element_edges
+        self._fill(groups, added_edges[inverse])
+
+    @property
+    def edges(self) -> np.ndarray:
+        """The unique edges as an (M, 2) array of node indices, the first index is less than the second one"""
+        return self._edges
+
+    @property
+    def element_edges(self) -> np.ndarray:
+        """The (E, k) map from elements to their edges, -1 pads elements with less than k corners"""
+        return self._element_edges
+
+    @property
+    def edge_elements(self) -> np.ndarray:
+        """The (M, 2) map from edges to the adjacent elements, -1 marks the absent second element"""
+        return self._edge_elements
+
+    @property
+    def valence(self) -> np.ndarray:
+        """The number of elements adjacent to every edge"""
+        return self._valence
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def elements_of(self, edge: int) -> np.ndarray:
+        """
+        Return all elements adjacent to the edge including the elements of non-manifold edges.
+
+        :param edge: the index of the edge
+        :return: an array of element indices
+        """
+        return self._edge_owners[self._edge_offsets[edge]:self._edge_offsets[edge + 1]]
+
+    def boundary(self) -> np.ndarray:
+        """
+        Find edges with exactly one adjacent element.
+
+        :return: the boolean mask of boundary edges
+        """
+        return self._valence == 1
+
+    def lengths(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Calculate lengths of all edges.
+
+        :param coordinates: an (N, dim) array of node coordinates
+        :return: an (M,) array of lengths
+        """
+        return np.linalg.norm(coordinates[self._edges[:, 1]] - coordinates[self._edges[:, 0]], axis=1)
+
+    def midpoints(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Calculate middle points of all edges.
+
+        :param coordinates: an (N, dim) array of node coordinates
+        :return: an (M, dim) array of points
+        """
+        return 0.5 * (coordinates[self._edges[:, 0]] + coordinates[self._edges[:, 1]])
+
+    def neighbors(self) -> np.ndarray:
+        """
+        Find the neighbor element across every local edge of every element.
+
+        :return: an (E, k) array of element indices, -1 marks boundary edges and padding
+        """
+        elements = np.arange(len(self._element_edges))[:, np.newaxis]
+        valid = self._element_edges >= 0
+        edges = np.where(valid, self._element_edges, 0)
+        first = self._edge_elements[edges, 0]
+        second = self._edge_elements[edges, 1]
+        return np.where(valid, np.where(first == elements, second, first), -1)
+
+
+def _incidences(groups: List[Tuple[np.ndarray, np.ndarray]], nodes_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerate incidences of edges in elements of the groups.
+
+    :param groups: a list of pairs (element indices (E_g,), connectivity of corners (E_g, k))
+    :param nodes_count: the number of nodes in the mesh
+    :return: keys of edges low * N + high and elements owning them in the order of the groups
+    """
+    first = [conn.ravel() for _, conn in groups]
+    second = [np.roll(conn, -1, axis=1).ravel() for _, conn in groups]
+    owners = [np.repeat(ids, conn.shape[1]) for ids, conn in groups]
+    first = np.concatenate(first) if first else np.zeros(0, dtype=np.int64)
+    second = np.concatenate(second) if second else np.zeros(0, dtype=np.int64)
+    owners = np.concatenate(owners).astype(np.int64) if owners else np.zeros(0, dtype=np.int64)
+    low = np.minimum(first, second).astype(np.int64)
+    high = np.maximum(first, second).astype(np.int64)
+    return low * max(nodes_count, 1) + high, owners
+
+
+def splice(array: np.ndarray, removed: np.ndarray, at: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Delete rows of an array and insert new rows. A local change of a large array is copied by slices between
+    the changed positions, a large change falls back to np.delete and np.insert.
+
+    :param array: the array of rows
+    :param removed: sorted indices of deleted rows
+    :param at: sorted indices of rows of the array new rows are inserted before, the length of the array appends rows
+    :param values: new rows in the order of `at`
+    :return: the new array, the given one isn't changed
+    """
+    cuts = np.union1d(removed, at)
+    if len(cuts) > SPLICE_CUTS:
+        return np.insert(np.delete(array, removed, axis=0), at - np.searchsorted(removed, at), values, axis=0)
+    ends = np.searchsorted(at, cuts, side="right")
+    skip = np.isin(cuts, removed)
+    pieces = []
+    start = 0
+    first = 0
+    for cut, end, deleted in zip(cuts.tolist(), ends.tolist(), skip.tolist()):
+        pieces.append(array[start:cut])
+        pieces.append(values[first:end])
+        start = cut + 1 if deleted else cut
+        first = end
+    pieces.append(array[start:])
+    return np.concatenate(pieces)
+
+
+def _pointer_min(successor: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Spread the minimal value over every cycle of the permutation by pointer jumping.
+
+    :param successor: a permutation as an array of successor indices
+    :param values: values to minimize
+    :return: the minimal value of the cycle of every index
+    """
+    result = values.copy()
+    pointer = successor.copy()
+    for _ in range(int(np.ceil(np.log2(max(len(successor), 2)))) + 1):
+        result = np.minimum(result, result[pointer])
+        pointer = pointer[pointer]
+    return result
+
+
+def boundary_loops(edges: np.ndarray, directions: np.ndarray) -> List[np.ndarray]:
+    """
+    Chain boundary edges into closed loops. A loop follows the direction of its edge with the smallest index,
+    so loops of a consistently oriented mesh follow the orientation of elements. Nodes shared by several loops
+    (pinch points) are paired in the order of edges.
+
+    :param edges: a (B, 2) array of node indices of boundary edges
+    :param directions: a (B,) boolean array, True if an edge is oriented from the first node to the second one
+    :return: a list of arrays of node indices, one array per loop
+    """
+    count = len(edges)
+    if count == 0:
+        return []
+    # incidences of edges in nodes: i is the first end of the edge i, count + i is the second end
+    incidences = np.concatenate((edges[:, 0], edges[:, 1]))
+    order = np.argsort(incidences, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(2 * count)
+    sorted_nodes = incidences[order]
+    block = np.flatnonzero(np.concatenate(([True], sorted_nodes[1:] != sorted_nodes[:-1])))
+    block_start = np.repeat(block, np.diff(np.concatenate((block, [2 * count]))))
+    partner_rank = block_start + ((np.arange(2 * count) - block_start) ^ 1)
+    partner_rank = np.where(partner_rank < 2 * count, partner_rank, np.arange(2 * count))
+    unpaired = sorted_nodes[np.minimum(partner_rank, 2 * count - 1)] != sorted_nodes
+    partner_rank[unpaired] = np.arange(2 * count)[unpaired]
+    partner = order[partner_rank[rank]]
+    # directed edges: d < count goes from the first node to the second one, count + d goes backward,
+    # so a directed edge has the same index as the incidence it leaves through
+    arrival = np.concatenate((count + np.arange(count), np.arange(count)))
+    successor = partner[arrival]
+    directed = np.arange(2 * count)
+    edge_of = directed % count
+    label = _pointer_min(successor, directed)
+    smallest_edge = _pointer_min(successor, edge_of)
+    preferred = np.where(directions[smallest_edge], smallest_edge, count + smallest_edge)
+    keep = label == label[preferred]
+    start = preferred
+    # rank directed edges in their loops by the distance from the start edge
+    predecessor = np.empty_like(successor)
+    predecessor[successor] = directed
+    distance = (directed != start).astype(np.int64)
+    pointer = np.where(directed == start, directed, predecessor)
+    for _ in range(int(np.ceil(np.log2(max(2 * count, 2)))) + 1):
+        distance = distance + np.where(pointer != directed, distance[pointer], 0)
+        pointer = pointer[pointer]
+    kept = np.flatnonzero(keep)
+    kept = kept[np.lexsort((distance[kept], label[kept]))]
+    first_nodes = np.where(kept < count, edges[edge_of[kept], 0], edges[edge_of[kept], 1])
+    loop_starts = np.flatnonzero(np.concatenate(([True], label[kept][1:] != label[kept][:-1])))
+    return np.split(first_nodes, loop_starts[1:])
@@ -0,0 +1,78 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+def translation(offset: Iterable[float]) -> np.ndarray:
+    """
+    Build the affine matrix of the translation.
+
+    :param offset: the vector of the translation, its length is the dimension
+    :return: the (dim + 1, dim + 1) affine matrix
+    """
+    offset = np.asarray(offset, dtype=float)
+    matrix = np.eye(len(offset) + 1)
+    matrix[:-1, -1] = offset
+    return matrix
+
+
+def rotation(
+        angle: float,
+        axis: Optional[Iterable[float]] = None,
+        center: Optional[Iterable[float]] = None
+) -> np.ndarray:
+    """
+    Build the affine matrix of the counterclockwise rotation in the plane or around an axis in the space.
+
+    :param angle: the angle in radians
+    :param axis: the direction of the axis in the space, the rotation is plane if None
+    :param center: the point of the axis or the center of the plane rotation, the origin by default
+    :return: the (3, 3) affine matrix of the plane rotation or the (4, 4) one of the space rotation
+    """
+    cos, sin = np.cos(angle), np.sin(angle)
+    if axis is None:
+        linear = np.array([[cos, -sin], [sin, cos]])
+    else:
+        axis = np.asarray(axis, dtype=float)
+        axis = axis / np.linalg.norm(axis)
+        cross = np.array([[0.0, -axis[2], axis[1]], [axis[2], 0.0, -axis[0]], [-axis[1], axis[0], 0.0]])
+        linear = cos * np.eye(3) + sin * cross + (1.0 - cos) * np.outer(axis, axis)  # the Rodrigues formula
+    return _around(linear, center)
+
+
+def mirror(normal: Iterable[float], point: Optional[Iterable[float]] = None) -> np.ndarray:
+    """
+    Build the affine matrix of the reflection in the line (the plane in the space) orthogonal to the normal.
+    The reflection reverses the orientation of elements, see `Mesh.reverse_elements`.
+
+    :param normal: the normal of the mirror, its length (2 or 3) is the dimension
+    :param point: a point of the mirror, the origin by default
+    :return: the (dim + 1, dim + 1) affine matrix
+    """
+    normal = np.asarray(normal, dtype=float)
+    normal = normal / np.linalg.norm(normal)
+    return _around(np.eye(len(normal)) - 2.0 * np.outer(normal, normal), point)
+
+
+def lift(z: float = 0.0) -> np.ndarray:
+    """
+    Build the affine matrix placing plane coordinates into the space at the given height.
+
+    :param z: the third coordinate of nodes
+    :return: the (4, 3) affine matrix mapping (x, y, 1) to (x, y, z, 1)
+    """
+    matrix = np.zeros((4, 3))
+    matrix[0, 0] = matrix[1, 1] = matrix[3, 2] = 1.0
+    matrix[2, 2] = z
+    return matrix
+
+
+def _around(linear: np.ndarray, center: Optional[Iterable[float]]) -> np.ndarray:
+    """Build the affine matrix of the linear map with the fixed point"""
+    dim = len(linear)
+    matrix = np.eye(dim + 1)
+    matrix[:dim, :dim] = linear
+    if center is not None:
+        center = np.asarray(center, dtype=float)
+        matrix[:dim, dim] = center - linear @ center
+    return matrix
@@ -0,0 +1,85 @@
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from threading import BoundedSemaphore
+from typing import List, Optional
+
+from mesh.mesh import Mesh
+from render.file.file_renderer import FileRenderer
+from render.renderer import Renderer
+
+
+class BackgroundRenderer(Renderer):
+    """
+    The renderer writing files in the background, e.g. every step of a time-stepping run, so computations
+    of the next step overlap with writing the previous one. Rendering snapshots the mesh (a copy-on-write copy,
+    see `Mesh.copy`) and the file renderer with its fields, so the run may move nodes and replace fields at once.
+    At most `depth` files are queued or written, rendering more waits for the oldest one (the backpressure).
+    Files are written in the order of rendering by a single thread by default.
+    """
+
+    def __init__(self, renderer: FileRenderer, depth: int = 2, executor: Optional[Executor] = None):
+        """
+        Create the renderer.
+
+        :param renderer: the file renderer writing files
+        :param depth: the maximal number of queued or written files
+        :param executor: the executor writing files, e.g. a shared thread pool, it isn't shut down by `close`;
+        the own single thread by default
+        """
+        if depth < 1:
+            raise Exception("the depth of the queue must be at least 1")
+        self._renderer = renderer
+        self._slots = BoundedSemaphore(depth)
+        self._own = executor is None
+        self._executor = ThreadPoolExecutor(1) if executor is None else executor
+        self._futures = []  # type: List[Future]
+
+    @property
+    def pending(self) -> int:
+        """The number of queued or written files"""
+        return sum(not future.done() for future in self._futures)
+
+    def render(self, mesh: Mesh, filepath: Optional[str] = None) -> Future:
+        """
+        Snapshot the mesh and the renderer and write the file in the background.
+
+        :param mesh: the mesh
+        :param filepath: the path of the file, the path of the renderer by default
+        :return: the future of writing, its result is None or the exception of the renderer
+        """
+        snapshot = mesh.copy()
+        renderer = self._renderer.snapshot(filepath)
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(renderer.render, snapshot)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures = [f for f in self._futures if not f.done() or f.exception() is not None]
+        self._futures.append(future)
+        return future
+
+    def flush(self):
+        """
+        Wait for all files, the first exception of writing is raised once.
+        """
+        futures, self._futures = self._futures, []
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """
+        Wait for all files and stop the own thread.
+        """
+        try:
+            self.flush()
+        finally:
+            if self._own:
+                self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,8 +1,40 @@
+from __future__ import annotations
+
+import copy
 from abc import ABC
+from typing import Optional
 
+from mesh.mesh import Mesh
+from mesh.node import PRECISIONS
 from render.renderer import Renderer
 
 
 class FileRenderer(Renderer, ABC):
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, precision: Optional[str] = None):
+        """
+        Create the renderer.
+
+        :param filepath: the path of the file
+        :param precision: the precision of written coordinates and fields ("single" or "double"),
+        the precision of the mesh by default
+        """
+        if precision is not None and precision not in PRECISIONS:
+            raise Exception(f"unknown precision {precision}, the known ones are {', '.join(PRECISIONS)}")
         self._filepath = filepath
+        self._precision = precision
+
+    def _dtype(self, mesh: Mesh) -> type:
+        """The type of written coordinates and fields of the mesh"""
+        return PRECISIONS[self._precision or mesh.precision]
+
+    def snapshot(self, filepath: Optional[str] = None) -> FileRenderer:
+        """
+        Copy the renderer with its data (e.g. fields) to render it later, e.g. in the background.
+
+        :param filepath: the path of the file of the copy, the path of the renderer by default
+        :return: the copy
+        """
+        clone = copy.copy(self)
+        if filepath is not None:
+            clone._filepath = filepath
+        return clone
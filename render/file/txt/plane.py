@@ -1,26 +1,43 @@
+from typing import Optional
+
+import numpy as np
+
 from mesh.mesh import Mesh
 from render.file.file_renderer import FileRenderer
 
+FORMATS = {np.float32: "%.9g", np.float64: "%.17g"}  # formats of coordinates keeping all digits by their types
+
 
 class PlaneTextRenderer(FileRenderer):
-    def __init__(self, filepath: str):
-        super().__init__(filepath)
+    """
+    The text format: the dimension, the number of nodes in elements, the number of faces per element, nodes as
+    "x y z type" lines and elements as lines of node indices. Meshes with mixed types of elements are written with
+    the largest number of nodes, smaller elements repeat their last node. Coordinates are written with the digits
+    of the precision.
+    """
+
+    def __init__(self, filepath: str, precision: Optional[str] = None):
+        super().__init__(filepath, precision)
 
     def render(self, mesh: Mesh):
+        blocks = mesh.blocks
+        nodes_number = max((block.nodes_number for block in blocks), default=0)
+        connectivity = np.empty((mesh.elements_count, nodes_number), dtype=np.int64)
+        for block in blocks:
+            k = block.nodes_number
+            connectivity[block.elements, :k] = block.connectivity
+            connectivity[block.elements, k:] = block.connectivity[:, -1:]
+        dtype = self._dtype(mesh)
+        coordinates = mesh.coordinates[:, :3].astype(dtype)
+        nodes = np.zeros((mesh.nodes_count, 4))
+        nodes[:, :coordinates.shape[1]] = coordinates
+        nodes[:, 3] = mesh.node_types()
         with open(self._filepath, "w") as text_file:
-            mesh.reset_node_id()
             print(3, file=text_file)  # dimension
-            element_nodes = set(len(e.nodes) for e in mesh.elements)
-            if len(element_nodes) > 1:
-                raise Exception("meshes with mixed types elements are not supported by the text renderer")
-            print(next(iter(element_nodes)), file=text_file)  # number of nodes in elements
+            print(nodes_number, file=text_file)  # number of nodes in elements
             print(1, file=text_file)  # number of faces per element
-            print(len(mesh.nodes), file=text_file)
-            for node in mesh.nodes:
-                print(f"{node.x} {node.y} {node.z} {node.node_type.value}", file=text_file)
-            print(len(mesh.elements), file=text_file)
+            print(mesh.nodes_count, file=text_file)
+            np.savetxt(text_file, nodes, fmt=[FORMATS[dtype]] * 3 + ["%d"])
+            print(mesh.elements_count, file=text_file)
             print(0, file=text_file)
-            for element in mesh.elements:
-                ids = [str(n.id) for n in element.nodes]
-                print(" ".join(ids), file=text_file)
-
+            np.savetxt(text_file, connectivity, fmt="%d")
@@ -1,81 +1,108 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 from vtkmodules.util import numpy_support
-from vtkmodules.vtkCommonCore import vtkPoints, vtkDoubleArray
-from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolygon, vtkPolyData, vtkCellData, vtkPointData
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData, vtkCellData, vtkPointData
 from vtkmodules.vtkIOXML import vtkXMLPolyDataWriter
 
+from mesh.field import Field
 from mesh.mesh import Mesh
+from mesh.topology import polygons
 from render.file.file_renderer import FileRenderer
 
 
 class VtkXmlRenderer(FileRenderer):
-    def __init__(self, filepath: str):
-        super().__init__(filepath)
-        self._cell_scalars = []
-        self._point_scalars = []
+    """
+    The VTK XML writer of polygonal data. Fields (arrays, sequences or NodeField/CellField) are kept as they are
+    without copying until the mesh is written, snapshots (e.g. of a background renderer) copy their values,
+    so fields may be changed in place after rendering. Coordinates and fields are written in the precision
+    of the renderer (the precision of the mesh by default), fields of this precision are passed to VTK without copying.
+    """
+
+    def __init__(self, filepath: str, precision: Optional[str] = None):
+        super().__init__(filepath, precision)
+        self._cell_scalars = []  # type: List[Tuple[str, np.ndarray]]
+        self._point_scalars = []  # type: List[Tuple[str, np.ndarray]]
 
     def add_cell_scalar(self, scalar: Iterable[float], name: str):
-        array = numpy_support.numpy_to_vtk(np.array(scalar))
-        array.SetName(name)
-        self._cell_scalars.append(array)
+        self._cell_scalars.append((name, np.asarray(scalar)))
 
     def add_cell_vector(self, vectors: List[Tuple[float, float, float]], name: str):
-        array = vtkDoubleArray()
-        array.SetName(name)
-        array.SetNumberOfComponents(3)
-        array.SetNumberOfTuples(len(vectors))
-        for i, v in enumerate(vectors):
-            array.SetTuple(i, v)
-        self._cell_scalars.append(array)
+        self._cell_scalars.append((name, np.asarray(vectors, dtype=float).reshape(-1, 3)))
 
     def clear_cell_data(self):
         self._cell_scalars.clear()
 
     def add_point_scalar(self, scalar: Iterable[float], name: str):
-        array = numpy_support.numpy_to_vtk(np.array(scalar))
-        array.SetName(name)
-        self._point_scalars.append(array)
+        self._point_scalars.append((name, np.asarray(scalar)))
 
     def add_point_vector(self, vectors: List[Tuple[float, float, float]], name: str):
-        array = vtkDoubleArray()
-        array.SetName(name)
-        array.SetNumberOfComponents(3)
-        array.SetNumberOfTuples(len(vectors))
-        for i, v in enumerate(vectors):
-            array.SetTuple(i, v)
-        self._point_scalars.append(array)
+        self._point_scalars.append((name, np.asarray(vectors, dtype=float).reshape(-1, 3)))
 
     def clear_point_data(self):
         self._point_scalars.clear()
 
+    def add_field(self, field: Field, name: Optional[str] = None):
+        """
+        Add the field of nodes or elements of scalars or vectors.
+
+        :param field: the field, it must be valid for the mesh
+        :param name: the name in the file, the name of the field by default
+        """
+        if not field.valid:
+            raise Exception(f"the field {field.name} is outdated by changes of the mesh")
+        fields = self._point_scalars if field.LOCATION == "point" else self._cell_scalars
+        fields.append((field.name if name is None else name, field.values))
+
+    def snapshot(self, filepath: Optional[str] = None) -> VtkXmlRenderer:
+        clone = super().snapshot(filepath)
+        clone._cell_scalars = [(name, values.copy()) for name, values in self._cell_scalars]
+        clone._point_scalars = [(name, values.copy()) for name, values in self._point_scalars]
+        return clone
+
     def render(self, mesh: Mesh):
+        dtype = self._dtype(mesh)
         writer = vtkXMLPolyDataWriter()
         writer.SetFileName(self._filepath)
+        coordinates = mesh.coordinates[:, :3]
+        points_array = np.zeros((mesh.nodes_count, 3), dtype=dtype)
+        points_array[:, :coordinates.shape[1]] = coordinates
         points = vtkPoints()
-        for i, node in enumerate(mesh.nodes):
-            points.InsertNextPoint([node.x, node.y, node.z])
-            node.id = i
+        points.SetData(numpy_support.numpy_to_vtk(points_array, deep=True))
+        offsets, nodes = polygons(mesh.blocks, mesh.elements_count)  # quadratic elements go along the boundary
         cells_array = vtkCellArray()
-        for element in mesh.elements:
-            polygon = vtkPolygon()
-            nodes_number = len(element)
-            polygon.GetPointIds().SetNumberOfIds(nodes_number)
-            for i, node in enumerate(element.nodes):
-                polygon.GetPointIds().SetId(i, node.id)
-            cells_array.InsertNextCell(polygon)
+        cells_array.SetData(
+            numpy_support.numpy_to_vtkIdTypeArray(offsets, deep=True),
+            numpy_support.numpy_to_vtkIdTypeArray(nodes, deep=True)
+        )
         poly_data = vtkPolyData()
         poly_data.SetPoints(points)
         poly_data.SetPolys(cells_array)
         cell_data = poly_data.GetCellData()  # type: vtkCellData
         point_data = poly_data.GetPointData()  # type: vtkPointData
-        for s in self._cell_scalars:
-            cell_data.AddArray(s)
-        for s in self._point_scalars:
-            point_data.AddArray(s)
+        for name, values in self._cell_scalars:
+            cell_data.AddArray(self._field(values, mesh.elements_count, name, dtype))
+        for name, values in self._point_scalars:
+            point_data.AddArray(self._field(values, mesh.nodes_count, name, dtype))
         writer.SetInputData(poly_data)
         writer.Write()
+
+    @staticmethod
+    def _field(values: np.ndarray, count: int, name: str, dtype: type):
+        """
+        Wrap the field by the VTK array of the type without copying if the field is contiguous and of the type,
+        integer fields (e.g. IDs) are kept as they are. The VTK array refers to the field while it is alive.
+        """
+        if len(values) != count:
+            raise Exception(f"the field {name} has {len(values)} values for {count} nodes or elements")
+        if np.issubdtype(values.dtype, np.floating):
+            values = np.ascontiguousarray(values, dtype=dtype)
+        else:
+            values = np.ascontiguousarray(values)
+        array = numpy_support.numpy_to_vtk(values)
+        array.SetName(name)
+        return array
@@ -3,8 +3,9 @@ from __future__ import annotations
 from collections.abc import Iterable
 
 import numpy as np
-from vtkmodules.vtkCommonCore import vtkPoints, vtkLookupTable, vtkFloatArray, vtkDoubleArray
-from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolygon, vtkPolyData
+from vtkmodules.util import numpy_support
+from vtkmodules.vtkCommonCore import vtkPoints, vtkLookupTable, vtkDoubleArray
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData
 from vtkmodules.vtkFiltersCore import vtkMaskPoints, vtkPolyDataNormals, vtkGlyph3D
 from vtkmodules.vtkFiltersModeling import vtkBandedPolyDataContourFilter
 from vtkmodules.vtkFiltersSources import vtkArrowSource
@@ -18,7 +19,9 @@ import vtkmodules.vtkInteractionStyle
 import vtkmodules.vtkRenderingOpenGL2
 from vtkmodules.vtkRenderingLabel import vtkLabeledDataMapper
 
+from mesh.field import CellField
 from mesh.mesh import Mesh
+from mesh.topology import polygons
 from render.renderer import Renderer
 
 
@@ -73,44 +76,43 @@ class PlaneVtkRenderer(Renderer):
             self._renderer.AddActor(self._axes_actor)
         else:
             self._axes_actor = None
-        self._values = values
+        if isinstance(values, CellField):
+            raise Exception("contours are built by values of nodes, a cell field can't be rendered")
+        self._values = np.asarray(values, dtype=float)  # a NodeField or an array of doubles isn't copied
         self._contours_count = contours_count
         self._use_cell_data = use_cell_data
         self._show_labels = show_labels
         self._scalarbar_title = scalarbar_title
 
     def render(self, mesh: Mesh):
+        coordinates = mesh.coordinates[:, :3]
+        points_array = np.zeros((mesh.nodes_count, 3))
+        points_array[:, :coordinates.shape[1]] = coordinates
         points = vtkPoints()
-        for i, node in enumerate(mesh.nodes):
-            points.InsertNextPoint([node.x, node.y, node.z])
-            node.id = i
+        points.SetData(numpy_support.numpy_to_vtk(points_array, deep=True))
+        offsets, nodes = polygons(mesh.blocks, mesh.elements_count)  # quadratic elements go along the boundary
         cells_array = vtkCellArray()
-        for element in mesh.elements:
-            polygon = vtkPolygon()
-            nodes_number = len(element)
-            polygon.GetPointIds().SetNumberOfIds(nodes_number)
-            for i, node in enumerate(element.nodes):
-                polygon.GetPointIds().SetId(i, node.id)
-            cells_array.InsertNextCell(polygon)
+        cells_array.SetData(
+            numpy_support.numpy_to_vtkIdTypeArray(offsets, deep=True),
+            numpy_support.numpy_to_vtkIdTypeArray(nodes, deep=True)
+        )
         poly_data = vtkPolyData()
         poly_data.SetPoints(points)
         poly_data.SetPolys(cells_array)
-        if self._values:
-            scalars = vtkFloatArray()
-            for v in self._values:
-                scalars.InsertNextValue(v)
-            poly_data.GetPointData().SetScalars(scalars)
+        if len(self._values) > 0:
+            values = np.ascontiguousarray(self._values)
+            poly_data.GetPointData().SetScalars(numpy_support.numpy_to_vtk(values))
             bcf = vtkBandedPolyDataContourFilter()
             bcf.SetInputData(poly_data)
             if self._contours_count > 0:
                 bcf.SetNumberOfContours(self._contours_count)
-                bcf.GenerateValues(self._contours_count, [min(self._values), max(self._values)])
+                bcf.GenerateValues(self._contours_count, [values.min(), values.max()])
                 bcf.SetNumberOfContours(self._contours_count + 1)
                 bcf.GenerateContourEdgesOn()
             bcf.Update()
             # self._bcf_mapper.ImmediateModeRenderingOn()
             self._bcf_mapper.SetInputData(bcf.GetOutput())
-            self._bcf_mapper.SetScalarRange(min(self._values), max(self._values))
+            self._bcf_mapper.SetScalarRange(values.min(), values.max())
             self._bcf_mapper.SetLookupTable(self._lut)
             self._bcf_mapper.ScalarVisibilityOn()
             if self._use_cell_data:
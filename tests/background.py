@@ -0,0 +1,110 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from unittest import TestCase, skipUnless
+
+import numpy as np
+
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.mesh import Mesh
+from render.file.background import BackgroundRenderer
+from render.file.file_renderer import FileRenderer
+from render.file.txt.plane import PlaneTextRenderer
+
+
+class BlockedRenderer(FileRenderer):
+    """The renderer recording coordinates of meshes after the event is set"""
+
+    def __init__(self, event: threading.Event):
+        super().__init__("")
+        self.event = event
+        self.rendered = []
+
+    def render(self, mesh: Mesh):
+        self.event.wait()
+        if mesh.nodes_count == 0:
+            raise Exception("an empty mesh")
+        self.rendered.append(mesh.coordinates)
+
+
+class TestBackgroundRenderer(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+
+    def test_steps(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f"step{i}.txt") for i in range(3)]
+            with BackgroundRenderer(PlaneTextRenderer(paths[0])) as renderer:
+                for path in paths:
+                    renderer.render(self.mesh, path)
+                    self.mesh.nodes[0].x += 1.0  # the snapshot isn't changed
+            x = [np.loadtxt(p, skiprows=4, max_rows=self.mesh.nodes_count)[0, 0] for p in paths]
+        self.assertListEqual([0.0, 1.0, 2.0], x)
+
+    def test_creator_mesh(self):
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        _ = grid.nodes  # materialized grids are copied as well
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.txt")
+            with BackgroundRenderer(PlaneTextRenderer(path)) as renderer:
+                renderer.render(grid)
+                grid.nodes[0].x -= 1.0
+            first = np.loadtxt(path, skiprows=4, max_rows=grid.nodes_count)[0]
+        self.assertTrue(np.allclose((0.0, 0.0), first[:2]))
+
+    def test_backpressure(self):
+        event = threading.Event()
+        blocked = BlockedRenderer(event)
+        renderer = BackgroundRenderer(blocked, depth=2)
+        first = renderer.render(self.mesh)
+        renderer.render(self.mesh)
+        self.assertEqual(2, renderer.pending)
+        third = threading.Thread(target=renderer.render, args=(self.mesh,))
+        third.start()
+        third.join(0.1)
+        self.assertTrue(third.is_alive())  # waits for a free slot
+        event.set()
+        third.join()
+        renderer.close()
+        self.assertIsNone(first.result())
+        self.assertEqual(3, len(blocked.rendered))
+        self.assertEqual(0, renderer.pending)
+
+    def test_errors(self):
+        event = threading.Event()
+        event.set()
+        renderer = BackgroundRenderer(BlockedRenderer(event))
+        renderer.render(Mesh())
+        with self.assertRaises(Exception):
+            renderer.flush()
+        renderer.close()
+
+
+@skipUnless(find_spec("vtkmodules"), "VTK isn't installed")
+class TestVtkSnapshot(TestCase):
+    def test_fields(self):
+        from vtkmodules.util import numpy_support
+        from vtkmodules.vtkIOXML import vtkXMLPolyDataReader
+        from render.file.vtk.plane import VtkXmlRenderer
+
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        values = np.arange(float(grid.nodes_count))
+        event = threading.Event()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "field.vtp")
+            writer = VtkXmlRenderer(path)
+            writer.add_point_scalar(values, "u")
+            with ThreadPoolExecutor(1) as executor:
+                executor.submit(event.wait)  # the file is written after the field is changed
+                with BackgroundRenderer(writer, executor=executor) as renderer:
+                    renderer.render(grid)
+                    values += 1.0
+                    event.set()
+            reader = vtkXMLPolyDataReader()
+            reader.SetFileName(path)
+            reader.Update()
+            written = numpy_support.vtk_to_numpy(reader.GetOutput().GetPointData().GetArray("u"))
+        self.assertTrue(np.array_equal(np.arange(float(grid.nodes_count)), written))
@@ -0,0 +1,68 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from fem.element.quadrilateral import IsoQuad4
+from fem.element.triangle import IsoTri3
+from fem.operator import MatrixFreeOperator
+from fem.physics import Poisson
+from fem.quadrature.legendre import QuadrilateralQuadrature, TriangleQuadrature
+from mesh.mesh import Mesh
+from render.file.txt.plane import PlaneTextRenderer
+
+
+def mixed() -> Mesh:
+    """The 2 x 2 grid of unit squares, the top left one is split into two triangles"""
+    coordinates = np.array([(float(i), float(j)) for i in range(3) for j in range(3)])
+    quads = np.array([(0, 3, 4, 1), (3, 6, 7, 4), (4, 7, 8, 5)])
+    triangles = np.array([(1, 4, 5), (1, 5, 2)])
+    return Mesh.from_blocks(coordinates, [quads, triangles])
+
+
+class TestElementBlocks(TestCase):
+    def test_blocks(self):
+        mesh = mixed()
+        self.assertEqual(5, mesh.elements_count)
+        blocks = mesh.blocks
+        self.assertListEqual(["tri3", "quad4"], [block.name for block in blocks])
+        self.assertListEqual([[3, 4], [0, 1, 2]], [block.elements.tolist() for block in blocks])
+        self.assertListEqual([1, 5, 2], blocks[0].connectivity[1].tolist())
+        self.assertEqual(3, len(blocks[1]))
+        self.assertEqual(13, len(mesh.edge_index))
+        # from_arrays makes a single block
+        single = Mesh.from_arrays(mesh.coordinates, blocks[1].connectivity)
+        self.assertListEqual(["quad4"], [block.name for block in single.blocks])
+
+    def test_assembly(self):
+        mesh = mixed()
+        operator = MatrixFreeOperator(mesh, Poisson(), chunk=1)
+        matrix = np.zeros((mesh.nodes_count, mesh.nodes_count))
+        for block in mesh.blocks:
+            element_type, quadrature = (IsoTri3, TriangleQuadrature(1)) if block.nodes_number == 3 else \
+                (IsoQuad4, QuadrilateralQuadrature(2))
+            for e, conn in zip(block.elements, block.connectivity):
+                element = element_type(mesh.elements[e].nodes)
+                for point in quadrature.points():
+                    element.build(point)
+                    b = element.derivatives()
+                    matrix[np.ix_(conn, conn)] += b.T @ b * element.jacobian() * point.weight
+        self.assertTrue(np.allclose(matrix, operator.to_sparse().toarray()))
+        self.assertTrue(np.allclose(np.diag(matrix), operator.diagonal()))
+        # a linear field has no residual at the inner node, the area is the sum of loads
+        residual = operator.apply(mesh.coordinates @ (1.0, 2.0))
+        self.assertAlmostEqual(0.0, residual[4])
+        self.assertAlmostEqual(4.0, operator.load(1.0).sum())
+
+    def test_text(self):
+        mesh = mixed()
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "mixed.txt")
+            PlaneTextRenderer(path).render(mesh)
+            with open(path) as text_file:
+                lines = text_file.read().splitlines()
+        self.assertListEqual(["3", "4", "1", "9"], lines[:4])
+        self.assertListEqual([1.0, 1.0, 0.0, 1.0], [float(v) for v in lines[8].split()])
+        self.assertListEqual(["5", "0"], lines[13:15])
+        self.assertListEqual(["0 3 4 1", "3 6 7 4", "4 7 8 5", "1 4 5 5", "1 5 2 2"], lines[15:])
@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+import numpy as np
+
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.element import Element
+from mesh.mesh import Mesh, ArrayMesh
+from mesh.node import NodeType
+
+
+class TestArrayMesh(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+        self.mesh.nodes[0].node_type = NodeType.FIXED
+
+    def test_shared(self):
+        copy = self.mesh.copy()
+        self.assertIsInstance(copy, ArrayMesh)
+        self.assertFalse(copy.materialized)
+        self.assertEqual(self.mesh.nodes_count, copy.nodes_count)
+        self.assertEqual(self.mesh.elements_count, copy.elements_count)
+        self.assertIs(self.mesh.connectivity, copy.connectivity)
+        self.assertIs(self.mesh.edge_index, copy.edge_index)
+        self.assertTrue(np.array_equal(self.mesh.node_types(), copy.node_types()))
+        # a copy of the copy shares coordinates as well
+        second = copy.copy()
+        self.assertTrue(np.shares_memory(copy._storage.coordinates, second._storage.coordinates))
+        self.assertEqual(len(self.mesh.extract_boundary(classify=False)[0]), len(second.extract_boundary()[0]))
+        self.assertFalse(second.materialized)
+
+    def test_move_nodes(self):
+        copy = self.mesh.copy()
+        second = copy.copy()
+        before = self.mesh.coordinates
+        moved = before + (1.0, 2.0)
+        copy.move_nodes(moved)
+        self.assertFalse(copy.materialized)
+        self.assertTrue(np.array_equal(moved, copy.coordinates))
+        self.assertTrue(np.array_equal(before, second.coordinates))
+        self.assertTrue(np.array_equal(before, self.mesh.coordinates))
+        self.assertTrue(np.allclose(self.mesh.edge_lengths(), copy.edge_lengths()))
+        self.assertEqual((3.0, 2.0, 0.0), copy.sizes())
+        self.assertEqual((1.0, 2.0, 0.0), copy.origin())
+
+    def test_materialize(self):
+        copy = self.mesh.copy()
+        copy.nodes[5].coords = [10.0, 10.0]
+        self.assertTrue(copy.materialized)
+        self.assertEqual(NodeType.FIXED, copy.nodes[0].node_type)
+        self.assertTrue(np.array_equal(self.mesh.connectivity, copy.connectivity))
+        self.assertTrue(np.allclose((10.0, 10.0), copy.coordinates[5]))
+        self.assertFalse(np.allclose((10.0, 10.0), self.mesh.coordinates[5]))
+        for element in copy.elements:
+            for node in element.nodes:
+                self.assertIn(element, copy.get_adjacent(node))
+        copy.append_element(Element(copy.nodes[:3]))
+        self.assertEqual(self.mesh.elements_count + 1, copy.elements_count)
+
+    def test_refine(self):
+        copy = self.mesh.copy()
+        edges = len(self.mesh.edge_index)
+        copy.refine([0])
+        self.assertEqual(edges, len(self.mesh.edge_index))
+        self.assertEqual(6, self.mesh.elements_count)
+        self.assertGreater(copy.elements_count, 6)
+        # the original is refined independently
+        self.mesh.refine([5])
+        self.assertGreater(len(self.mesh.edge_index), edges)
+
+    def test_generic(self):
+        mesh = Mesh()
+        nodes = [mesh.append_point(c, NodeType.BORDER) for c in ((0.0, 0.0), (1.0, 0.0), (0.0, 1.0))]
+        mesh.append_element(Element(nodes))
+        copy = mesh.copy()
+        self.assertTrue(np.array_equal(mesh.coordinates, copy.coordinates))
+        self.assertListEqual([[0, 1, 2]], copy.connectivity.tolist())
+        self.assertIsNot(mesh.nodes[0], copy.nodes[0])
+
+    def test_structured(self):
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        structured = grid.copy()
+        self.assertEqual(grid.elements_count, structured.elements_count)
+        self.assertEqual(grid.nodes_count, len(grid.nodes))  # materializes nodes and elements
+        for mesh in (grid.copy(), grid.copy().copy()):
+            self.assertEqual(grid.elements_count, mesh.elements_count)
+            self.assertTrue(np.array_equal(grid.connectivity, mesh.connectivity))
+            self.assertTrue(np.array_equal(grid.coordinates, mesh.coordinates))
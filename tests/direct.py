@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.operator import MatrixFreeOperator
+from fem.physics import PlaneElasticity
+from fem.solve.direct import DirectSolver
+from mesh.creators.plane_grid import PlaneGridCreator
+
+
+class TestDirectSolver(TestCase):
+    def setUp(self) -> None:
+        mesh = PlaneGridCreator(0, 0, 4.0, 1.0, 17, 5).create()
+        left = np.nonzero(mesh.coordinates[:, 0] == 0.0)[0]
+        self.operator = MatrixFreeOperator(mesh, PlaneElasticity(100.0, 0.3), fixed=np.concatenate((2 * left, 2 * left + 1)))
+        self.matrix = self.operator.to_sparse()
+        loads = [self.operator.constrain(self.operator.load([gx, gy])) for gx, gy in [(1, 0), (0, -1), (0.5, 0.5)]]
+        self.loads = np.stack(loads, axis=1)
+
+    def test_many_loads(self):
+        for ordering in DirectSolver.ORDERINGS:
+            solver = DirectSolver(ordering)
+            solution, statistics = solver.solve(self.matrix, self.loads)
+            self.assertEqual((self.matrix.shape[0], 3), solution.shape)
+            self.assertFalse(statistics.cached)
+            self.assertEqual(3, statistics.right_hand_sides)
+            self.assertTrue(np.allclose(self.matrix @ solution, self.loads), ordering)
+            single, statistics = solver.solve(self.matrix, self.loads[:, 1])
+            self.assertTrue(statistics.cached)
+            self.assertTrue(np.allclose(solution[:, 1], single))
+            # the superposition of load cases
+            self.assertTrue(np.allclose(solution[:, 2], 0.5 * solution[:, 0] - 0.5 * solution[:, 1]))
+
+    def test_cache(self):
+        solver = DirectSolver(cache_size=2)
+        matrices = [self.matrix * scale for scale in (1.0, 2.0, 3.0)]
+        for matrix in matrices:
+            solver.solve(matrix, self.loads)
+        self.assertEqual(2, len(solver))
+        _, statistics = solver.solve(matrices[0], self.loads)
+        self.assertFalse(statistics.cached)
+        del matrices, matrix
+        self.assertEqual(0, len(solver))
+        solver.solve(self.matrix, self.loads)
+        solver.forget(self.matrix)
+        self.assertEqual(0, len(solver))
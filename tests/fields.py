@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+import numpy as np
+
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.field import CellField, NodeField
+from mesh.mesh import Mesh
+
+
+class TestField(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+
+    def test_zero_copy(self):
+        solution = np.arange(2.0 * self.mesh.nodes_count)
+        displacement = NodeField(self.mesh, solution.reshape(-1, 2), "u")
+        self.assertEqual(2, displacement.components)
+        self.assertTrue(np.shares_memory(solution, np.asarray(displacement)))
+        ux = displacement.component(0)
+        self.assertEqual("u[0]", ux.name)
+        self.assertTrue(np.shares_memory(solution, ux.values))
+        self.assertTrue(np.shares_memory(solution, displacement[2:5]))
+        self.assertTrue(np.array_equal(solution[::2], ux.values))
+        copied = np.array(displacement)
+        self.assertFalse(np.shares_memory(solution, copied))
+        self.assertTrue(np.array_equal(solution.reshape(-1, 2), copied))
+        self.assertEqual(np.float32, np.array(displacement, dtype=np.float32).dtype)
+        with self.assertRaises(ValueError):
+            np.asarray(displacement, dtype=np.float32, copy=False)
+
+    def test_arithmetic(self):
+        x = NodeField(self.mesh, self.mesh.coordinates[:, 0], "x")
+        y = NodeField(self.mesh, self.mesh.coordinates[:, 1], "y")
+        radius = np.sqrt(x * x + y * y)
+        self.assertIsInstance(radius, NodeField)
+        self.assertIs(self.mesh, radius.mesh)
+        self.assertTrue(np.allclose(np.linalg.norm(self.mesh.coordinates, axis=1), radius.values))
+        self.assertAlmostEqual(float(np.max(self.mesh.coordinates[:, 0])), float(np.max(x)))
+        values = x.values
+        x += 1.0
+        self.assertTrue(np.shares_memory(values, x.values))
+        self.assertTrue(np.allclose(self.mesh.coordinates[:, 0] + 1.0, values))
+        vectors = NodeField(self.mesh, self.mesh.coordinates, "r")
+        self.assertTrue(np.allclose(radius.values, vectors.magnitude().values))
+        cells = CellField(self.mesh, np.ones(self.mesh.elements_count))
+        with self.assertRaises(Exception):
+            _ = x + cells
+        with self.assertRaises(Exception):
+            NodeField(self.mesh, np.ones(self.mesh.elements_count))
+
+    def test_version(self):
+        field = CellField(self.mesh, np.arange(self.mesh.elements_count), "id")
+        self.assertTrue(field.valid)
+        self.mesh.move_nodes(self.mesh.coordinates * 2.0)
+        self.assertTrue(field.valid)
+        self.mesh.refine([0])
+        self.assertFalse(field.valid)
+
+    def test_creator_mesh(self):
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        version = grid.version
+        field = NodeField(grid, grid.coordinates[:, 0], "x")
+        self.assertEqual(grid.nodes_count, len(grid.nodes))
+        self.assertEqual(grid.elements_count, len(grid.elements))
+        self.assertEqual(version, grid.version)  # materializing nodes and elements doesn't change the mesh
+        self.assertTrue(field.valid)
+        grid.refine([0])
+        self.assertFalse(field.valid)
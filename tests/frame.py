@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.frame import PlaneFrame
+from fem.solve.direct import DirectSolver
+
+
+def cantilever(frame: PlaneFrame, length: float, angle: float, members: int, nodes_number: int, force: float):
+    """Calculate the tip displacement of the cantilever clamped at the origin and loaded across its axis at the tip"""
+    direction = np.array([np.cos(angle), np.sin(angle)])
+    normal = np.array([-direction[1], direction[0]])
+    if nodes_number == 2:
+        positions = np.linspace(0.0, length, members + 1)
+        connectivity = np.stack((np.arange(members), np.arange(1, members + 1)), axis=1)
+    else:
+        positions = np.linspace(0.0, length, 2 * members + 1)
+        connectivity = np.stack((2 * np.arange(members), 2 * np.arange(members) + 2, 2 * np.arange(members) + 1), axis=1)
+    coordinates = positions[:, None] * direction
+    matrix = frame.assemble(coordinates, connectivity).tolil()
+    for dof in range(3):
+        matrix[dof, :] = 0.0
+        matrix[:, dof] = 0.0
+        matrix[dof, dof] = 1.0
+    rhs = np.zeros(3 * len(coordinates))
+    rhs[-3:-1] = force * normal  # the tip is the last node
+    solution, _ = DirectSolver().solve(matrix.tocsr(), rhs)
+    return solution[-3:-1], normal
+
+
+class TestPlaneFrame(TestCase):
+    def setUp(self) -> None:
+        self.frame = PlaneFrame(young=1000.0, area=0.1, inertia=1e-3)
+        self.length = 2.0
+        self.force = 0.01
+        self.expected = self.force * self.length ** 3 / (3.0 * 1000.0 * 1e-3) + self.force * self.length / self.frame.shear
+
+    def test_cantilever(self):
+        for angle in (0.0, np.pi / 6.0, -2.0):
+            tip, normal = cantilever(self.frame, self.length, angle, 1, 3, self.force)
+            self.assertAlmostEqual(self.expected, tip @ normal, delta=1e-9 * self.expected)
+            tip, normal = cantilever(self.frame, self.length, angle, 40, 2, self.force)
+            self.assertAlmostEqual(self.expected, tip @ normal, delta=1e-3 * self.expected)
+
+    def test_rigid_motion(self):
+        coords = np.random.default_rng(5).random((10, 2, 2))
+        stiffness = self.frame.stiffness(coords)
+        self.assertTrue(np.allclose(stiffness, np.swapaxes(stiffness, 1, 2)))
+        translation = np.tile([0.3, -0.7, 0.0], 2)
+        self.assertTrue(np.allclose(0.0, stiffness @ translation))
+        # the rigid rotation about the origin: u = -theta * y, v = theta * x
+        rotation = np.stack((-coords[..., 1], coords[..., 0], np.ones((10, 2))), axis=2).reshape(10, 6)
+        self.assertTrue(np.allclose(0.0, np.einsum("eij,ej->ei", stiffness, rotation)))
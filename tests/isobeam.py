@@ -49,3 +49,18 @@ class TestIsoQuad(TestCase):
             self.assertAlmostEqual(self.w / 2.0, element.jacobian())
         print(integral)
         self.assertAlmostEqual(self.q * self.w, np.sum(integral))
+
+    def test_batch(self):
+        x = np.array([[0.0, 2.0, 1.0], [1.0, 1.5, 1.25]])
+        quadrature = IntervalQuadrature(self.order)
+        points, _ = quadrature.arrays()
+        for element_type, k in ((IsoBeam2, 2), (IsoBeam3, 3)):
+            shapes, jacobian, derivatives = element_type.batch_build(x[:, :k], points[:, 0])
+            for e in range(len(x)):
+                nodes = [Node(coords=[c, 0], node_type=NodeType.BORDER, id=i) for i, c in enumerate(x[e, :k])]
+                element = element_type(nodes)
+                for p, point in enumerate(quadrature.points()):
+                    element.build(point)
+                    self.assertTrue(np.allclose(element.shapes(), shapes[p]))
+                    self.assertAlmostEqual(element.jacobian(), jacobian[e, p])
+                    self.assertTrue(np.allclose(element.derivatives(), derivatives[e, p]))
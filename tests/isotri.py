@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.element.triangle import IsoTri3, IsoTri6
+from fem.quadrature.legendre import TriangleQuadrature
+from mesh.node import Node, NodeType
+
+
+class TestIsoTri(TestCase):
+    def setUp(self) -> None:
+        self.corners = np.array([(0.0, 0.0), (2.0, 0.0), (0.5, 1.0)])
+        self.area = 1.0
+        self.middles = 0.5 * (self.corners + np.roll(self.corners, -1, axis=0))
+
+    def nodes(self, coordinates: np.ndarray):
+        return [Node(coords=list(c), node_type=NodeType.BORDER, id=i) for i, c in enumerate(coordinates)]
+
+    def test_tri3(self):
+        element = IsoTri3(self.nodes(self.corners))
+        integral = np.zeros(3)
+        for point in TriangleQuadrature(2).points():
+            element.build(point)
+            self.assertAlmostEqual(1.0, np.sum(element.shapes()))
+            integral = integral + point.weight * element.shapes() * element.jacobian()
+            self.assertAlmostEqual(2.0 * self.area, element.jacobian())
+            # the gradient of x is (1, 0), the gradient of y is (0, 1)
+            self.assertTrue(np.allclose(np.eye(2), element.derivatives() @ self.corners))
+        self.assertTrue(np.allclose(self.area / 3.0, integral))
+        with self.assertRaises(Exception):
+            IsoTri3(self.nodes(self.corners[:2]))
+
+    def test_tri6(self):
+        coordinates = np.concatenate((self.corners, self.middles))
+        element = IsoTri6(self.nodes(coordinates))
+        integral = np.zeros(6)
+        for point in TriangleQuadrature(3).points():
+            element.build(point)
+            self.assertAlmostEqual(1.0, np.sum(element.shapes()))
+            integral = integral + point.weight * element.shapes() * element.jacobian()
+            self.assertTrue(np.allclose(np.eye(2), element.derivatives() @ coordinates))
+        # corners of the quadratic triangle have zero integrals, middles have a third of the area
+        self.assertTrue(np.allclose([0.0, 0.0, 0.0, 1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0], integral / self.area))
+        # the shape function of a node is 1 at the node and 0 at others
+        reference = np.array([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (0.5, 0.0), (0.5, 0.5), (0.0, 0.5)])
+        shapes, _, _ = IsoTri6.parametric(reference[:, 0], reference[:, 1])
+        self.assertTrue(np.allclose(np.eye(6), shapes))
+
+    def test_batch(self):
+        points, _ = TriangleQuadrature(3).arrays()
+        quadratic = np.concatenate((self.corners, self.middles))
+        for element_type, coordinates in ((IsoTri3, self.corners), (IsoTri6, quadratic)):
+            coords = np.stack((coordinates, 2.0 * coordinates + 1.0))
+            shapes, jacobian, derivatives = element_type.batch_build(coords, points[:, 0], points[:, 1])
+            for e in range(2):
+                element = element_type(self.nodes(coords[e]))
+                for p, point in enumerate(TriangleQuadrature(3).points()):
+                    element.build(point)
+                    self.assertTrue(np.allclose(element.shapes(), shapes[p]))
+                    self.assertAlmostEqual(element.jacobian(), jacobian[e, p])
+                    self.assertTrue(np.allclose(element.derivatives(), derivatives[e, p]))
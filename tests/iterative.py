@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.sparse import diags
+
+from fem.operator import MatrixFreeOperator
+from fem.physics import PlaneElasticity, Poisson
+from fem.solve.iterative import IterativeSolver
+from fem.solve.preconditioner import BlockJacobiPreconditioner, block_diagonal
+from mesh.creators.plane_grid import PlaneGridCreator
+
+
+class TestIterativeSolver(TestCase):
+    def setUp(self) -> None:
+        self.mesh = PlaneGridCreator(0, 0, 2.0, 1.0, 9, 5).create()
+        border = np.unique(np.concatenate(self.mesh.extract_boundary(classify=False)))
+        self.poisson = MatrixFreeOperator(self.mesh, Poisson(), fixed=border)
+        self.rhs = self.poisson.constrain(self.poisson.load(1.0))
+        self.exact = np.linalg.solve(self.poisson.to_sparse().toarray(), self.rhs)
+
+    def test_preconditioners(self):
+        matrix = self.poisson.to_sparse()
+        for name in ("none", "jacobi", "ilu", "ic"):
+            for method in ("cg", "minres"):
+                solver = IterativeSolver(method, name, tolerance=1e-10)
+                solution, statistics = solver.solve(matrix, self.rhs)
+                self.assertTrue(statistics.converged, f"{method} with {name}")
+                self.assertTrue(np.allclose(self.exact, solution, atol=1e-8), f"{method} with {name}")
+                self.assertEqual(statistics.iterations + 1, len(statistics.times))
+        # the incomplete factorization is much better than nothing
+        _, plain = IterativeSolver("cg", "none").solve(matrix, self.rhs)
+        _, incomplete = IterativeSolver("cg", "ic").solve(matrix, self.rhs)
+        self.assertLess(incomplete.iterations, plain.iterations)
+
+    def test_matrix_free_and_cache(self):
+        physics = PlaneElasticity(100.0, 0.25)
+        left = np.nonzero(self.mesh.coordinates[:, 0] == 0.0)[0]
+        operator = MatrixFreeOperator(self.mesh, physics, fixed=np.concatenate((2 * left, 2 * left + 1)))
+        rhs = operator.constrain(operator.load([0.0, -1.0]))
+        matrix = operator.to_sparse()
+        self.assertTrue(np.allclose(block_diagonal(matrix, 2), operator.block_diagonal()))
+        exact = np.linalg.solve(matrix.toarray(), rhs)
+        solver = IterativeSolver("cg", BlockJacobiPreconditioner(2), tolerance=1e-10)
+        solution, first = solver.solve(operator, rhs, mesh=self.mesh)
+        self.assertFalse(first.cached)
+        self.assertTrue(np.allclose(exact, solution))
+        _, second = solver.solve(operator, rhs, mesh=self.mesh)
+        self.assertTrue(second.cached)
+        _, warm = solver.solve(operator, rhs, initial=solution, mesh=self.mesh)
+        self.assertLess(warm.iterations, 2)
+
+    def test_cache_invalidation(self):
+        matrix = self.poisson.to_sparse()
+        solver = IterativeSolver("cg", "ilu", tolerance=1e-10)
+        self.assertFalse(solver.solve(matrix, self.rhs, mesh=self.mesh)[1].cached)
+        self.assertTrue(solver.solve(matrix, self.rhs, mesh=self.mesh)[1].cached)
+        # another system of the same size on the same mesh
+        stiffer = MatrixFreeOperator(self.mesh, Poisson(10.0), fixed=self.poisson.fixed).to_sparse()
+        solution, statistics = solver.solve(stiffer, self.rhs, mesh=self.mesh)
+        self.assertFalse(statistics.cached)
+        self.assertTrue(np.allclose(self.exact / 10.0, solution, atol=1e-8))
+        # preconditioners are dropped with their matrices
+        count = len(self.mesh._cache)
+        del stiffer
+        self.assertEqual(count - 1, len(self.mesh._cache))
+        # moving a single node drops preconditioners
+        node = self.mesh.nodes[10]
+        node.coords = node.coords + 0.01
+        self.assertFalse(solver.solve(matrix, self.rhs, mesh=self.mesh)[1].cached)
+
+    def test_indefinite(self):
+        matrix = diags([np.linspace(-3.0, 5.0, 40)], [0]) + diags([0.1 * np.ones(39)] * 2, [-1, 1])
+        rhs = np.ones(40)
+        solution, statistics = IterativeSolver("minres", "none", tolerance=1e-12).solve(matrix, rhs)
+        self.assertTrue(statistics.converged)
+        self.assertTrue(np.allclose(matrix @ solution, rhs))
+        with self.assertRaises(Exception):
+            IterativeSolver("cg", "none").solve(matrix, rhs)
+        # default and block preconditioners are positive definite for indefinite matrices
+        for name in ("jacobi", "block_jacobi"):
+            solution, statistics = IterativeSolver("minres", name, tolerance=1e-10).solve(matrix, rhs)
+            self.assertTrue(statistics.converged, name)
+            self.assertLess(np.linalg.norm(matrix @ solution - rhs) / np.linalg.norm(rhs), 1e-8, name)
+        # the exhausted Krylov subspace is checked by the true residual
+        solution, statistics = IterativeSolver("minres", "none").solve(diags([-2.0 * np.ones(40)], [0]), rhs)
+        self.assertTrue(statistics.converged)
+        self.assertTrue(np.allclose(-0.5, solution))
+        self.assertLess(statistics.residuals[-1], 1e-12)
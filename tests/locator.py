@@ -0,0 +1,64 @@
+from math import cos, sin, pi
+from unittest import TestCase
+
+import numpy as np
+
+from fem.element.quadrilateral import IsoQuad4, IsoQuad8
+from fem.locator import PointLocator, invert_mapping
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.transfinite import TransfiniteGridCreator
+
+
+class TestPointLocator(TestCase):
+    def setUp(self) -> None:
+        r = 1.0
+        creator = TransfiniteGridCreator(
+            top=lambda t: (r * cos(pi / 2 * (1 - t)) / 2, r * sin(pi / 2 * (1 - t)) / 2 + r / 2),
+            bottom=lambda t: (t * r, 0.0),
+            left=lambda t: (0.0, t * r),
+            right=lambda t: (r - t * r / 2, t * r / 2),
+            num_x=12,
+            num_y=9
+        )
+        self.mesh = creator.create()
+        self.locator = PointLocator(self.mesh)
+        self.random = np.random.default_rng(7)
+
+    def test_grid_cells(self):
+        mesh = PlaneGridCreator(0, 0, 4.0, 2.0, 5, 3).create()
+        locator = PointLocator(mesh)
+        elements, local = locator.locate(np.array([[0.5, 0.5], [3.25, 1.75], [4.5, 0.5]]))
+        self.assertListEqual([0, 7, -1], list(elements))
+        self.assertTrue(np.allclose([[0.0, 0.0], [-0.5, 0.5]], local[:2]))
+        self.assertTrue(np.all(np.isnan(local[2])))
+
+    def test_linear_field(self):
+        coordinates = self.mesh.coordinates
+        values = np.stack((2.0 * coordinates[:, 0] - coordinates[:, 1] + 1.0, coordinates[:, 1]), axis=1)
+        elements = self.random.integers(len(self.mesh.elements), size=500)
+        local = self.random.uniform(-1.0, 1.0, size=(500, 2))
+        shapes, _, _ = IsoQuad4.parametric(local[:, 0], local[:, 1])
+        points = np.einsum("pk,pkd->pd", shapes, coordinates[self.mesh.connectivity[elements]])
+        found, found_local = self.locator.locate(points)
+        self.assertTrue(np.all(found >= 0))
+        self.assertTrue(np.all(np.abs(found_local) <= 1.0 + 1.0E-8))
+        result = self.locator.interpolate(values, points)
+        expected = np.stack((2.0 * points[:, 0] - points[:, 1] + 1.0, points[:, 1]), axis=1)
+        self.assertTrue(np.allclose(expected, result))
+
+    def test_outside(self):
+        points = np.array([[-0.1, 0.5], [0.9, 0.9], [2.0, 2.0]])
+        values = self.locator.interpolate(self.mesh.coordinates[:, 0], points, fill=-1.0)
+        self.assertTrue(np.allclose([-1.0, -1.0, -1.0], values))
+
+    def test_quad8_inversion(self):
+        coords = np.array([
+            [0.0, 0.0], [2.0, 0.0], [2.0, 1.5], [0.0, 1.0],
+            [1.0, -0.2], [2.1, 0.75], [1.0, 1.4], [-0.1, 0.5]
+        ])
+        local = self.random.uniform(-1.0, 1.0, size=(100, 2))
+        shapes, _, _ = IsoQuad8.parametric(local[:, 0], local[:, 1])
+        points = shapes @ coords
+        found, converged = invert_mapping(IsoQuad8.parametric, np.broadcast_to(coords, (100, 8, 2)), points)
+        self.assertTrue(np.all(converged))
+        self.assertTrue(np.allclose(local, found))
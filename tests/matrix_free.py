@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.sparse.linalg import cg
+
+from fem.element.quadrilateral import IsoQuad4
+from fem.operator import MatrixFreeOperator
+from fem.physics import PlaneElasticity, Poisson
+from fem.quadrature.legendre import QuadrilateralQuadrature
+from mesh.creators.transfinite import TransfiniteGridCreator
+
+
+def assemble(mesh, physics) -> np.ndarray:
+    """Assemble the dense stiffness matrix element by element"""
+    dofs = physics.dofs
+    size = len(mesh.nodes) * dofs
+    matrix = np.zeros((size, size))
+    index = {id(n): i for i, n in enumerate(mesh.nodes)}
+    for e in mesh.elements:
+        element = IsoQuad4(e.nodes)
+        positions = np.array([[index[id(n)] * dofs + c for c in range(dofs)] for n in e.nodes]).ravel()
+        for point in QuadrilateralQuadrature(2).points():
+            element.build(point)
+            dx, dy = element.derivatives()
+            if dofs == 1:
+                b = np.array([dx, dy])
+                d = physics.conductivity * np.eye(2)
+            else:
+                b = np.zeros((3, 8))
+                b[0, 0::2] = dx
+                b[1, 1::2] = dy
+                b[2, 0::2] = dy
+                b[2, 1::2] = dx
+                lame, mu = physics.lame
+                d = np.array([[lame + 2 * mu, lame, 0], [lame, lame + 2 * mu, 0], [0, 0, mu]])
+            local = b.T @ d @ b * element.jacobian() * point.weight * physics.thickness
+            matrix[np.ix_(positions, positions)] += local
+    return matrix
+
+
+class TestMatrixFreeOperator(TestCase):
+    def setUp(self) -> None:
+        self.mesh = TransfiniteGridCreator(
+            top=lambda t: (t, 1.0 + 0.2 * np.sin(np.pi * t)),
+            bottom=lambda t: (t, 0.0),
+            left=lambda t: (0.1 * t, t),
+            right=lambda t: (1.0, t),
+            num_x=5,
+            num_y=4
+        ).create()
+        self.values = np.random.default_rng(7).standard_normal(2 * self.mesh.nodes_count)
+
+    def test_poisson(self):
+        physics = Poisson(2.5)
+        operator = MatrixFreeOperator(self.mesh, physics, chunk=5)
+        reference = assemble(self.mesh, physics)
+        values = self.values[:self.mesh.nodes_count]
+        self.assertTrue(np.allclose(reference @ values, operator @ values))
+        self.assertTrue(np.allclose(np.diag(reference), operator.diagonal()))
+        self.assertTrue(np.allclose(reference, operator.to_sparse().toarray()))
+
+    def test_elasticity(self):
+        for plane_stress in (True, False):
+            physics = PlaneElasticity(210.0, 0.3, thickness=0.5, plane_stress=plane_stress)
+            operator = MatrixFreeOperator(self.mesh, physics, chunk=7)
+            reference = assemble(self.mesh, physics)
+            self.assertTrue(np.allclose(reference @ self.values, operator @ self.values))
+            self.assertTrue(np.allclose(np.diag(reference), operator.diagonal()))
+            self.assertTrue(np.allclose(reference, operator.to_sparse().toarray()))
+
+    def test_constrained_solution(self):
+        # the linear field is reproduced exactly by the Laplace problem with the linear boundary values
+        coordinates = self.mesh.coordinates
+        exact = 1.0 + 2.0 * coordinates[:, 0] - coordinates[:, 1]
+        border = np.unique(np.concatenate(self.mesh.extract_boundary(classify=False)))
+        operator = MatrixFreeOperator(self.mesh, Poisson(), fixed=border)
+        rhs = operator.constrain(np.zeros(len(exact)), exact)
+        solution, info = cg(operator, rhs, rtol=1e-12)
+        self.assertEqual(0, info)
+        self.assertTrue(np.allclose(exact, solution, atol=1e-8))
+        self.assertTrue(np.allclose(operator.to_sparse() @ exact, rhs))
+        self.assertAlmostEqual(operator.load(3.0).sum(), 3.0 * sum(np.sum(block.weights) for block in operator.blocks))
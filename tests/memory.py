@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.quadrature.quadrature import QuadraturePoint
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.element import Element
+from mesh.mesh import Mesh
+from mesh.node import Node, NodeType
+
+
+class TestNodeStorage(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+
+    def test_slots(self):
+        node = self.mesh.nodes[0]
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertFalse(hasattr(self.mesh.elements[0], "__dict__"))
+        self.assertFalse(hasattr(QuadraturePoint([0.0, 0.0], 1.0), "__dict__"))
+        self.assertFalse(hasattr(Node((0.0, 0.0), NodeType.BORDER, 0), "__dict__"))
+
+    def test_handles(self):
+        node = self.mesh.nodes[5]
+        self.assertTrue(np.shares_memory(node.coords, self.mesh._storage.coordinates))
+        self.mesh.move_nodes(self.mesh.coordinates + (1.0, 2.0))
+        self.assertTrue(np.allclose(self.mesh.coordinates[5], node.coords))
+        node.x = 10.0
+        node.node_type = NodeType.FIXED
+        self.assertEqual(10.0, self.mesh.coordinates[5, 0])
+        self.assertEqual(NodeType.FIXED.value, self.mesh.node_types()[5])
+
+    def test_copy_on_write(self):
+        copy = self.mesh.copy()
+        self.mesh.nodes[0].coords = (-1.0, -1.0)
+        self.mesh.nodes[0].node_type = NodeType.FIXED
+        self.assertTrue(np.allclose((0.0, 0.0), copy.coordinates[0]))
+        self.assertNotEqual(NodeType.FIXED.value, copy.node_types()[0])
+        # rows are read-only views, changes go through the setter
+        copy = self.mesh.copy()
+        node = copy.nodes[1]
+        before = self.mesh.coordinates[1, 0]
+        with self.assertRaises(ValueError):
+            node.coords[0] = 5.0
+        node.coords = (5.0, 0.0)
+        self.assertEqual(5.0, copy.coordinates[1, 0])
+        self.assertEqual(before, self.mesh.coordinates[1, 0])
+
+    def test_growth(self):
+        mesh = Mesh()
+        nodes = [mesh.append_point((float(i), 0.0), NodeType.BORDER, check=False) for i in range(100)]
+        node = mesh.append_point((0.0, 0.0, 1.0), NodeType.FIXED, check=False)
+        mesh.append_element(Element(nodes[:3]))
+        self.assertEqual((101, 3), mesh.coordinates.shape)
+        self.assertTrue(np.allclose((99.0, 0.0, 0.0), nodes[-1].coords))
+        self.assertTrue(np.shares_memory(node.vec3d, node.coords))
+        self.assertEqual((99.0, 0.0, 1.0), mesh.sizes())
+
+    def test_standalone(self):
+        node = Node((1.0, 2.0), NodeType.BORDER, 0)
+        node.y = 3.0
+        self.assertTrue(np.array_equal((1.0, 3.0), node.coords))
+        self.assertTrue(np.array_equal((1.0, 3.0, 0.0), node.vec3d))
+        self.assertEqual(NodeType.BORDER, node.node_type)
+
+
+class TestMemoryReport(TestCase):
+    def test_report(self):
+        grid = PlaneGridCreator(0, 0, 1.0, 1.0, 30, 30).create()
+        mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+        report = mesh.memory_report()
+        self.assertEqual(sum(report.categories.values()), report.total)
+        self.assertGreater(report.per_node, 2 * 8)
+        self.assertLess(report.per_node, 200)
+        self.assertGreater(report.per_element, 4 * 8)
+        self.assertIn("per node", str(report))
+        # a copy stores nodes as arrays only
+        copy = mesh.copy().memory_report()
+        self.assertLess(copy.per_node, 30)
+        self.assertLess(copy.categories["adjacency"], report.categories["adjacency"])
+
+    def test_structured(self):
+        grid = PlaneGridCreator(0, 0, 1.0, 1.0, 10, 10).create()
+        report = grid.memory_report()
+        self.assertGreaterEqual(report.categories["nodes"], grid.grid.nbytes)
+        _ = grid.nodes
+        self.assertIsNone(grid._grid.base)  # coordinates are stored by the storage only
+        self.assertEqual(0, grid._grid.nbytes)
+        self.assertGreaterEqual(grid.memory_report().categories["nodes"], grid.grid.nbytes)
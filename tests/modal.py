@@ -0,0 +1,123 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.frame import PlaneFrame
+from fem.mass import LUMPINGS
+from fem.operator import MatrixFreeOperator
+from fem.physics import PlaneElasticity, Poisson
+from fem.solve.modal import ModalSolver
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.mesh import Mesh
+
+
+class TestMass(TestCase):
+    def test_total(self):
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        triangles = np.concatenate((grid.connectivity[:, [0, 1, 2]], grid.connectivity[:, [0, 2, 3]]))
+        for order in (1, 2):
+            for connectivity in (grid.connectivity, triangles):
+                plane = Mesh.from_arrays(grid.coordinates, connectivity)
+                if order == 2:
+                    plane.elevate_order()
+                operator = MatrixFreeOperator(plane, PlaneElasticity(100.0, 0.3, thickness=0.5))
+                translation = np.tile([1.0, 0.0], plane.nodes_count)
+                for lumping in ("consistent",) + tuple(LUMPINGS):
+                    mass = operator.mass(2.0, lumping)
+                    self.assertAlmostEqual(2.0 * 0.5 * 6.0, translation @ mass @ translation, msg=lumping)
+                    self.assertTrue(np.allclose(0.0, (mass - mass.T).data))
+                hrz = operator.mass(2.0, "hrz").diagonal()
+                self.assertTrue(np.all(hrz > 0.0))
+                if order == 2:
+                    # corners of IsoQuad8 are negative, the ones of IsoTri6 are zeros
+                    lumped = operator.mass(2.0, "row_sum").diagonal()
+                    if connectivity is triangles:
+                        self.assertTrue(np.any(np.isclose(0.0, lumped)))
+                    else:
+                        self.assertTrue(np.any(lumped < 0.0))
+
+    def test_elements(self):
+        # textbook matrices of unit area elements: 36 M for IsoQuad4, 12 M for IsoTri3, 180 M for IsoTri6
+        quad = np.array([[4, 2, 1, 2], [2, 4, 2, 1], [1, 2, 4, 2], [2, 1, 2, 4]]) / 36.0
+        tri3 = (np.ones((3, 3)) + np.eye(3)) / 12.0
+        corners = 7.0 * np.eye(3) - np.ones((3, 3))
+        midsides = 16.0 * (np.eye(3) + np.ones((3, 3)))
+        opposite = -4.0 * np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]])  # midsides 3, 4, 5 are of edges 01, 12, 20
+        tri6 = np.block([[corners, opposite], [opposite.T, midsides]]) / 180.0
+        cases = (
+            ([[0, 0], [2, 0], [2, 0.5], [0, 0.5]], [0, 1, 2, 3], quad),
+            ([[0, 0], [2, 0], [0, 1]], [0, 1, 2], tri3),
+            ([[0, 0], [2, 0], [0, 1], [1, 0], [1, 0.5], [0, 0.5]], [0, 1, 2, 3, 4, 5], tri6)
+        )
+        for coordinates, element, expected in cases:
+            mesh = Mesh.from_arrays(np.array(coordinates, dtype=float), np.array([element]))
+            operator = MatrixFreeOperator(mesh, Poisson())
+            self.assertTrue(np.allclose(expected, operator.mass().toarray()), len(element))
+            diagonal = np.diag(expected)
+            hrz = operator.mass(lumping="hrz").diagonal()
+            self.assertTrue(np.allclose(diagonal / diagonal.sum(), hrz), len(element))
+
+    def test_fixed(self):
+        grid = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        operator = MatrixFreeOperator(grid, PlaneElasticity(100.0, 0.3), fixed=[0, 1])
+        mass = operator.mass()
+        self.assertEqual(0.0, abs(mass[:2]).sum() + abs(mass[:, :2]).sum())
+        with self.assertRaises(Exception):
+            operator.mass(lumping="diagonal")
+
+
+class TestModalSolver(TestCase):
+    def setUp(self) -> None:
+        self.frame = PlaneFrame(young=1000.0, area=0.01, inertia=1e-6)
+        self.length = 2.0
+        self.density = 3.0
+        # Euler-Bernoulli bending frequencies of a slender cantilever
+        roots = np.array([1.875104, 4.694091, 7.854757])
+        self.expected = roots ** 4 * 1000.0 * 1e-6 / (self.density * 0.01 * self.length ** 4)
+
+    def cantilever(self, angle: float, lumping: str):
+        members = 60
+        direction = np.array([np.cos(angle), np.sin(angle)])
+        coordinates = np.linspace(0.0, self.length, members + 1)[:, None] * direction
+        connectivity = np.stack((np.arange(members), np.arange(1, members + 1)), axis=1)
+        stiffness = self.frame.assemble(coordinates, connectivity).tolil()
+        mass = self.frame.assemble_mass(coordinates, connectivity, self.density, lumping).tolil()
+        for dof in range(3):
+            stiffness[dof, :] = 0.0
+            stiffness[:, dof] = 0.0
+            stiffness[dof, dof] = 1.0
+            mass[dof, :] = 0.0
+            mass[:, dof] = 0.0
+        return ModalSolver(stiffness.tocsr(), mass.tocsr())
+
+    def test_cantilever(self):
+        for angle, lumping in ((0.0, "consistent"), (0.7, "hrz"), (-2.0, "row_sum")):
+            solver = self.cantilever(angle, lumping)
+            eigenvalues, modes, statistics = solver.solve(3)
+            self.assertTrue(np.allclose(self.expected, eigenvalues, rtol=1e-2), lumping)
+            self.assertTrue(np.allclose(np.eye(3), modes.T @ solver.mass @ modes, atol=1e-8))
+            self.assertFalse(statistics.cached)
+            self.assertGreater(statistics.substitutions, 0)
+        frequencies = ModalSolver.frequencies(eigenvalues)
+        self.assertAlmostEqual(np.sqrt(self.expected[0]) / (2.0 * np.pi), frequencies[0], delta=1e-2 * frequencies[0])
+
+    def test_shifts(self):
+        solver = self.cantilever(0.0, "consistent")
+        lowest, _, _ = solver.solve(6)
+        _, _, statistics = solver.solve(4)
+        self.assertTrue(statistics.cached)  # the factor of the shift is reused
+        shift = 0.5 * (lowest[3] + lowest[4])
+        around, _, statistics = solver.solve(2, shift)
+        self.assertFalse(statistics.cached)
+        self.assertTrue(np.allclose(lowest[3:5], around))
+        self.assertTrue(solver.solve(2, shift)[2].cached)
+
+    def test_free_plate(self):
+        grid = PlaneGridCreator(0, 0, 4.0, 1.0, 9, 3).create()
+        solver = ModalSolver.from_operator(MatrixFreeOperator(grid, PlaneElasticity(100.0, 0.3)), 2.0, "hrz")
+        eigenvalues, modes, statistics = solver.solve(5, shift=-1.0)
+        self.assertTrue(np.allclose(0.0, eigenvalues[:3], atol=1e-8))  # rigid body modes
+        self.assertGreater(eigenvalues[3], 1e-3)
+        residual = solver.stiffness @ modes - solver.mass @ modes * eigenvalues
+        self.assertTrue(np.allclose(0.0, residual, atol=1e-8))
+        self.assertGreater(statistics.assembly_time, 0.0)
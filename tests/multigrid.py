@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.physics import PlaneElasticity, Poisson
+from fem.solve.iterative import IterativeSolver
+from fem.solve.multigrid import GeometricMultigrid, hierarchy, prolongation
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.transfinite import TransfiniteGridCreator
+
+
+def bump(num: int) -> TransfiniteGridCreator:
+    return TransfiniteGridCreator(
+        top=lambda t: (t, 1.0 + 0.2 * np.sin(np.pi * t)),
+        bottom=lambda t: (t, 0.0),
+        left=lambda t: (0.0, t),
+        right=lambda t: (1.0 + 0.2 * t, t),
+        num_x=num,
+        num_y=num
+    )
+
+
+class TestGeometricMultigrid(TestCase):
+    def test_hierarchy(self):
+        meshes = hierarchy(PlaneGridCreator(0, 0, 2.0, 1.0, 17, 9))
+        self.assertListEqual([(17, 9), (9, 5), (5, 3)], [m.shape for m in meshes])
+        interpolation = prolongation(meshes[0].shape, meshes[1].shape)
+        # the bilinear interpolation reproduces coordinates of the nested grid
+        self.assertTrue(np.allclose(meshes[0].coordinates, interpolation @ meshes[1].coordinates))
+        self.assertTrue(np.allclose(1.0, interpolation.sum(axis=1)))
+        with self.assertRaises(Exception):
+            hierarchy(PlaneGridCreator(0, 0, 1.0, 1.0, 6, 5), levels=2)
+        with self.assertRaisesRegex(Exception, "first-order"):
+            hierarchy(PlaneGridCreator(0, 0, 2.0, 1.0, 17, 9, order=2))
+
+    def test_poisson(self):
+        for smoother in GeometricMultigrid.SMOOTHERS:
+            cycles = []
+            for num in (17, 33, 65):
+                meshes = hierarchy(bump(num))
+                border = np.unique(np.concatenate(meshes[0].extract_boundary(classify=False)))
+                multigrid = GeometricMultigrid(meshes, Poisson(), fixed=border, smoother=smoother)
+                rhs = multigrid.operator.constrain(multigrid.operator.load(1.0))
+                solution, residuals = multigrid.solve(rhs, tolerance=1e-8)
+                self.assertLess(residuals[-1], 1e-8)
+                exact = np.linalg.solve(multigrid.operator.to_sparse().toarray(), rhs) if num == 17 else solution
+                self.assertTrue(np.allclose(exact, solution, atol=1e-7))
+                cycles.append(len(residuals))
+            # the number of cycles doesn't grow with the size of the mesh
+            self.assertLessEqual(max(cycles) - min(cycles), 2, smoother)
+            self.assertLess(max(cycles), 15, smoother)
+
+    def test_elasticity_preconditioner(self):
+        iterations = []
+        for num in (17, 33, 65):
+            meshes = hierarchy(PlaneGridCreator(0, 0, 4.0, 1.0, 4 * num - 3, num))
+            left = np.nonzero(meshes[0].coordinates[:, 0] == 0.0)[0]
+            fixed = np.concatenate((2 * left, 2 * left + 1))
+            multigrid = GeometricMultigrid(meshes, PlaneElasticity(100.0, 0.3), fixed=fixed, smoother="block_jacobi")
+            rhs = multigrid.operator.constrain(multigrid.operator.load([0.0, -1.0]))
+            solver = IterativeSolver("cg", multigrid, tolerance=1e-8)
+            solution, statistics = solver.solve(multigrid.operator, rhs)
+            self.assertTrue(statistics.converged)
+            iterations.append(statistics.iterations)
+        self.assertLess(max(iterations), 2 * min(iterations) + 5)
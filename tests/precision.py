@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from fem.element.quadrilateral import IsoQuad4
+from fem.quadrature.quadrature import QuadraturePoint
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.mesh import Mesh
+from render.file.txt.plane import PlaneTextRenderer
+
+
+class TestPrecision(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 0.3, 0.7, 10, 10).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+
+    def test_storage(self):
+        before = self.mesh.memory_report().categories["nodes"]
+        self.mesh.precision = "single"
+        self.assertEqual("single", self.mesh.precision)
+        self.assertEqual(np.float32, self.mesh.nodes[3].coords.dtype)
+        self.assertEqual(np.float64, self.mesh.coordinates.dtype)
+        self.assertLess(self.mesh.memory_report().categories["nodes"], before)
+        copy = self.mesh.copy()
+        self.assertEqual("single", copy.precision)
+        with self.assertRaises(Exception):
+            self.mesh.precision = "half"
+
+    def test_structured(self):
+        grid = PlaneGridCreator(0, 0, 0.3, 0.7, 10, 10).create()
+        grid.precision = "single"
+        self.assertEqual(np.float32, grid.grid.dtype)
+        self.assertEqual("single", grid.copy().precision)
+        self.assertEqual(np.float32, grid.nodes[0].coords.dtype)
+
+    def test_jacobian(self):
+        self.mesh.precision = "single"
+        element = IsoQuad4(self.mesh.elements[0].nodes)
+        element.build(QuadraturePoint([0.1, 0.2], 1.0))
+        self.assertEqual(np.float64, element.derivatives().dtype)
+        self.assertAlmostEqual(0.3 / 9 * 0.7 / 9 / 4.0, element.jacobian(), delta=1e-9)
+
+    def test_text(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f"{p}.txt") for p in ("double", "single")]
+            PlaneTextRenderer(paths[0]).render(self.mesh)
+            PlaneTextRenderer(paths[1], "single").render(self.mesh)
+            self.assertLess(os.path.getsize(paths[1]), os.path.getsize(paths[0]))
+            nodes = [np.loadtxt(p, skiprows=4, max_rows=self.mesh.nodes_count) for p in paths]
+        self.assertTrue(np.array_equal(self.mesh.coordinates, nodes[0][:, :2]))
+        self.assertTrue(np.array_equal(self.mesh.coordinates.astype(np.float32), nodes[1][:, :2].astype(np.float32)))
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
+from fem.operator import MatrixFreeOperator
+from fem.physics import Poisson
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.transfinite import TransfiniteGridCreator
+from mesh.node import NodeType
+
+
+def arc(num_x: int, num_y: int, order: int) -> TransfiniteGridCreator:
+    """A quarter of the annulus between radii 1 and 2"""
+    return TransfiniteGridCreator(
+        top=lambda t: (2.0 * np.cos(np.pi / 2 * (1.0 - t)), 2.0 * np.sin(np.pi / 2 * (1.0 - t))),
+        bottom=lambda t: (np.cos(np.pi / 2 * (1.0 - t)), np.sin(np.pi / 2 * (1.0 - t))),
+        left=lambda t: (0.0, 1.0 + t),
+        right=lambda t: (1.0 + t, 0.0),
+        num_x=num_x,
+        num_y=num_y,
+        order=order
+    )
+
+
+class TestQuadraticMesh(TestCase):
+    def test_elevate_order(self):
+        mesh = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        edges = mesh.edge_index.edges.copy()
+        new = mesh.elevate_order()
+        self.assertEqual(len(edges), len(new))
+        self.assertEqual(12 + 17, mesh.nodes_count)
+        self.assertEqual((6, 8), mesh.connectivity.shape)
+        self.assertTrue(np.array_equal(edges, mesh.edge_index.edges))
+        coordinates = mesh.coordinates
+        self.assertTrue(np.allclose(0.5 * (coordinates[edges[:, 0]] + coordinates[edges[:, 1]]), coordinates[new]))
+        types = [n.node_type for n in mesh.nodes]
+        self.assertEqual(10 + 10, types.count(NodeType.BORDER))
+        self.assertListEqual(list(mesh.edge_index.valence), [mesh.power(mesh.nodes[i]) for i in new])
+        self.assertEqual(10, len(mesh.extract_boundary()[0]))  # the loop passes through corners
+        # the native output has the same nodes and elements
+        native = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3, order=2).create()
+        self.assertEqual(mesh.nodes_count, native.nodes_count)
+        self.assertEqual(20, [n.node_type for n in native.nodes].count(NodeType.BORDER))
+        elevated = {tuple(sorted(map(tuple, coordinates[row]))) for row in mesh.connectivity}
+        created = {tuple(sorted(map(tuple, native.coordinates[row]))) for row in native.connectivity}
+        self.assertSetEqual(elevated, created)
+        with self.assertRaises(Exception):
+            mesh.elevate_order()
+
+    def test_curved_boundary(self):
+        mesh = arc(5, 3, order=2).create()
+        self.assertEqual((8, 8), mesh.connectivity.shape)
+        radius = np.linalg.norm(mesh.coordinates, axis=1)
+        border = np.array([n.node_type == NodeType.BORDER for n in mesh.nodes])
+        curved = border & (mesh.coordinates.min(axis=1) > 1e-9)
+        self.assertEqual(14, np.count_nonzero(curved))
+        self.assertTrue(np.all(np.isclose(radius[curved], 1.0) | np.isclose(radius[curved], 2.0)))
+        # midpoints of chords are inside the annulus, the placement projects them on arcs
+        linear = arc(5, 3, order=1).create()
+        ends = np.linalg.norm(linear.coordinates, axis=1)[linear.edge_index.edges]
+        on_arc = np.isclose(ends[:, 0], ends[:, 1])
+
+        def project(edges, points):
+            return np.where(on_arc[:, None], points / np.linalg.norm(points, axis=1)[:, None] * ends[:, :1], points)
+
+        chords = linear.copy()
+        new = chords.elevate_order()
+        self.assertTrue(np.all(np.linalg.norm(chords.coordinates[new[on_arc]], axis=1) < ends[on_arc, 0] - 1e-3))
+        new = linear.elevate_order(placement=project)
+        self.assertTrue(np.allclose(np.linalg.norm(linear.coordinates[new[on_arc]], axis=1), ends[on_arc, 0]))
+        self.assertEqual(mesh.nodes_count, linear.nodes_count)
+
+    def test_quadratic_solution(self):
+        # 8-nodes elements reproduce a quadratic harmonic field exactly
+        mesh = PlaneGridCreator(0, 0, 2.0, 1.0, 5, 3, order=2).create()
+        coordinates = mesh.coordinates
+        exact = coordinates[:, 0] ** 2 - coordinates[:, 1] ** 2 + coordinates[:, 0] * coordinates[:, 1]
+        border = np.array([n.node_type == NodeType.BORDER for n in mesh.nodes])
+        operator = MatrixFreeOperator(mesh, Poisson(), fixed=border)
+        solution = spsolve(operator.to_sparse().tocsc(), operator.constrain(np.zeros(len(exact)), exact))
+        self.assertTrue(np.allclose(exact, solution))
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.element.quadrilateral import IsoQuad4
+from fem.quadrature.legendre import QuadrilateralQuadrature
+from fem.quality import element_quality
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.transfinite import TransfiniteGridCreator
+
+
+class TestElementQuality(TestCase):
+    def test_rectangles(self):
+        mesh = PlaneGridCreator(0, 0, 4.0, 1.0, 5, 3).create()
+        report = element_quality(mesh)
+        self.assertTrue(np.allclose(1.0, report["scaled_jacobian"]))
+        self.assertTrue(np.allclose(2.0, report["aspect_ratio"]))
+        self.assertTrue(np.allclose(0.0, report["skew"]))
+        self.assertTrue(np.allclose(90.0, report["min_angle"]))
+        self.assertTrue(np.allclose(90.0, report["max_angle"]))
+        counts, _ = report.histogram("aspect_ratio", bins=4)
+        self.assertEqual(len(mesh.elements), np.sum(counts))
+
+    def test_skewed_patch(self):
+        creator = TransfiniteGridCreator(
+            top=lambda t: (1.0 + t, 1.0),
+            bottom=lambda t: (t, 0.0),
+            left=lambda t: (t, t),
+            right=lambda t: (1.0 + t, t),
+            num_x=4,
+            num_y=4
+        )  # a parallelogram with the angle of 45 degrees
+        mesh = creator.create()
+        report = element_quality(mesh)
+        self.assertTrue(np.allclose(np.sqrt(0.5), report["scaled_jacobian"]))
+        self.assertTrue(np.allclose(45.0, report["min_angle"]))
+        self.assertTrue(np.allclose(135.0, report["max_angle"]))
+        self.assertTrue(np.allclose(np.sqrt(0.5), report["skew"]))
+
+    def test_worst_and_jacobian(self):
+        mesh = PlaneGridCreator(0, 0, 3.0, 3.0, 4, 4).create()
+        mesh.nodes[5].coords = [1.4, 1.3]
+        report = element_quality(mesh)
+        worst = report.worst("scaled_jacobian", 4)
+        self.assertSetEqual({0, 1, 3, 4}, set(worst))
+        # the scaled Jacobian at Gauss points matches the element itself
+        element = IsoQuad4(mesh.elements[0].nodes)
+        expected = []
+        for point in QuadrilateralQuadrature(2).points():
+            element.build(point)
+            expected.append(element.jacobian())
+        coords = mesh.coordinates[mesh.connectivity[:1]]
+        gauss, _ = QuadrilateralQuadrature(2).arrays()
+        _, jacobian, _ = IsoQuad4.batch_build(coords, gauss[:, 0], gauss[:, 1])
+        self.assertTrue(np.allclose(expected, jacobian[0]))
+        self.assertIn("scaled_jacobian", str(report))
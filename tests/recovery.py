@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.operator import MatrixFreeOperator
+from fem.physics import PlaneElasticity, Poisson
+from fem.recovery import GradientRecovery
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.field import CellField, NodeField
+from mesh.mesh import Mesh
+
+
+class TestGradientRecovery(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 4.0, 3.0, 9, 7).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+        self.coordinates = self.mesh.coordinates
+        self.recovery = GradientRecovery(self.mesh, MatrixFreeOperator(self.mesh, Poisson()))
+        x, y = self.coordinates[:, 0], self.coordinates[:, 1]
+        self.inner = (x > 0.0) & (x < 4.0) & (y > 0.0) & (y < 3.0)
+
+    def test_linear(self):
+        x, y = self.coordinates[:, 0], self.coordinates[:, 1]
+        gradients = self.recovery.gradients(2.0 * x + 3.0 * y)
+        self.assertEqual((4 * self.mesh.elements_count, 2, 1), gradients.shape)
+        self.assertTrue(np.allclose((2.0, 3.0), gradients[:, :, 0]))
+        for recovered in (self.recovery.average(gradients), self.recovery.patch(gradients)):
+            self.assertIsInstance(recovered, NodeField)
+            self.assertTrue(np.allclose((2.0, 3.0), recovered.values))
+            indicators = self.recovery.indicators(gradients, recovered)
+            self.assertIsInstance(indicators, CellField)
+            self.assertTrue(np.allclose(0.0, indicators.values))
+
+    def test_quadratic(self):
+        x = self.coordinates[:, 0]
+        gradients = self.recovery.gradients(x * x)
+        patch = self.recovery.patch(gradients)
+        # gradients are superconvergent at Gauss points, so the linear fit is exact at inner nodes
+        self.assertTrue(np.allclose(2.0 * x[self.inner], patch.component(0).values[self.inner]))
+        self.assertTrue(np.allclose(0.0, patch.component(1).values))
+        average = self.recovery.average(gradients)
+        boundary = ~self.inner & (x == 0.0)
+        self.assertLess(
+            np.abs(patch.values[boundary, 0] - 0.0).max(), np.abs(average.values[boundary, 0] - 0.0).max() + 1e-12
+        )
+        indicators = self.recovery.indicators(gradients, patch)
+        self.assertTrue(np.all(indicators.values > 0.0))
+        self.assertLess(self.recovery.relative_error(gradients, patch), 0.1)
+
+    def test_stress(self):
+        physics = PlaneElasticity(200.0, 0.3)
+        recovery = GradientRecovery(self.mesh, MatrixFreeOperator(self.mesh, physics))
+        strain = 0.01
+        x, y = self.coordinates[:, 0], self.coordinates[:, 1]
+        solution = np.stack((strain * x, -0.3 * strain * y), axis=1).ravel()
+        stresses = recovery.patch(recovery.fluxes(solution), name="stress")
+        self.assertEqual((self.mesh.nodes_count, 4), stresses.values.shape)
+        self.assertTrue(np.allclose((200.0 * strain, 0.0, 0.0, 0.0), stresses.values))
@@ -0,0 +1,135 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.quality import element_quality
+from fem.transfer import FieldTransfer
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+from mesh.refinement import TEMPLATES
+from mesh.topology import EdgeIndex
+
+
+def areas(mesh: Mesh) -> np.ndarray:
+    coordinates = mesh.coordinates
+    result = np.zeros(mesh.elements_count)
+    for ids, conn in mesh._element_groups():
+        x, y = coordinates[conn, 0], coordinates[conn, 1]
+        result[ids] = 0.5 * np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1)
+    return result
+
+
+class TestRefinement(TestCase):
+    def assertConforming(self, mesh: Mesh, perimeter: float):
+        index = mesh.edge_index
+        rebuilt = EdgeIndex(mesh._corner_groups(), mesh.elements_count, mesh.nodes_count)
+        # the incremental index is the same as the rebuilt one
+        self.assertTrue(np.array_equal(rebuilt.edges, index.edges))
+        self.assertTrue(np.array_equal(rebuilt.element_edges, index.element_edges))
+        self.assertTrue(np.array_equal(rebuilt.valence, index.valence))
+        self.assertTrue(np.array_equal(np.sort(rebuilt.edge_elements, axis=1), np.sort(index.edge_elements, axis=1)))
+        # a hanging node would leave a pair of inner edges with one element
+        self.assertLessEqual(index.valence.max(), 2)
+        self.assertAlmostEqual(perimeter, np.sum(mesh.edge_lengths()[index.boundary()]))
+        self.assertTrue(np.all(areas(mesh) > 0.0))
+
+    def test_templates(self):
+        for (k, mask), rows in TEMPLATES.items():
+            square = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)] if k == 4 else [(0, 0), (1, 0), (0, 1)])
+            points = np.concatenate((square, 0.5 * (square + np.roll(square, -1, axis=0)), [square.mean(axis=0)]))
+            area = 0.0
+            for row in rows:
+                x, y = points[row, 0], points[row, 1]
+                child = 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+                self.assertGreater(child, 0.0)
+                area += child
+                # middles of refined edges are used, others aren't
+                used = {j - k for j in row if k <= j < 2 * k}
+                self.assertTrue(used <= {j for j in range(k) if mask >> j & 1})
+            self.assertAlmostEqual(1.0 if k == 4 else 0.5, area)
+
+    def test_single_element(self):
+        mesh = PlaneGridCreator(0, 0, 3.0, 3.0, 4, 4).create()
+        parents = mesh.refine([4])  # the central element
+        # 4 children, neighbors with one refined edge are split into 3 triangles, corner elements are kept
+        self.assertEqual(4 + 4 * 3 + 4, mesh.elements_count)
+        self.assertEqual(16 + 4 + 1, mesh.nodes_count)
+        self.assertListEqual([1, 3, 1, 3, 4, 3, 1, 3, 1], np.bincount(parents).tolist())
+        self.assertTrue(np.allclose(1.0, np.bincount(parents, areas(mesh))))
+        self.assertListEqual([3, 4], [conn.shape[1] for _, conn in mesh._element_groups()])
+        self.assertConforming(mesh, 12.0)
+        self.assertTrue(np.allclose((1.5, 1.5), mesh.coordinates[-1]))
+
+    def test_adaptive(self):
+        mesh = PlaneGridCreator(0, 0, 4.0, 2.0, 9, 5).create()
+        mesh.nodes[0].node_type = NodeType.FIXED
+        mesh.nodes[1].node_type = NodeType.FIXED
+        generator = np.random.default_rng(7)
+        for _ in range(4):
+            before = areas(mesh)
+            count = mesh.nodes_count
+            parents = mesh.refine(generator.random(mesh.elements_count) < 0.15)
+            self.assertTrue(np.allclose(before, np.bincount(parents, areas(mesh))))
+            self.assertConforming(mesh, 12.0)
+            # the adjacency of nodes follows elements
+            for element in mesh.elements:
+                for node in element.nodes:
+                    self.assertIn(element, mesh.get_adjacent(node))
+            self.assertEqual(sum(len(e) for e in mesh.elements), sum(mesh.power(n) for n in mesh.nodes))
+            border = {i for loop in mesh.extract_boundary(classify=False) for i in loop}
+            for i in range(count, mesh.nodes_count):
+                expected = NodeType.BORDER if i in border else NodeType.INTERNAl
+                self.assertIn(mesh.nodes[i].node_type, (expected, NodeType.FIXED))
+        fixed = [i for i, n in enumerate(mesh.nodes) if n.node_type == NodeType.FIXED]
+        # new nodes are fixed on the edge between the fixed nodes (0, 0) and (0, 0.5) only
+        self.assertTrue(np.all(mesh.coordinates[fixed, 0] == 0.0))
+        self.assertTrue(np.all(mesh.coordinates[fixed, 1] <= 0.5))
+
+    def test_closure(self):
+        # the element between three selected ones has 3 refined edges, so it is refined as well,
+        # elements with 2 adjacent refined edges are split into 3 quadrilaterals
+        mesh = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        parents = mesh.refine([0, 3, 4])
+        self.assertListEqual([4, 3, 4, 4, 4, 3], np.bincount(parents).tolist())
+        self.assertEqual(12 + 13 + 6, mesh.nodes_count)
+        self.assertEqual(4, mesh.connectivity.shape[1])
+        self.assertConforming(mesh, 10.0)
+
+    def test_triangles(self):
+        coordinates = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0), (2.0, 0.5)])
+        mesh = Mesh.from_arrays(coordinates, np.array([(0, 1, 2), (0, 2, 3), (1, 4, 2)]))
+        parents = mesh.refine([0])
+        self.assertListEqual([4, 2, 2], np.bincount(parents).tolist())
+        self.assertConforming(mesh, 3.0 + 2.0 * np.hypot(1.0, 0.5))
+        self.assertEqual(3, mesh.connectivity.shape[1])
+        placed = Mesh.from_arrays(coordinates, np.array([(0, 1, 2), (0, 2, 3), (1, 4, 2)]))
+        placed.refine([0], placement=lambda edges, points: points + (0.0, 0.01))
+        self.assertTrue(np.allclose((0.0, 0.01), placed.coordinates[5:] - mesh.coordinates[5:]))
+
+    def test_structured(self):
+        mesh = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        mesh.refine(mesh.coordinates[mesh.connectivity].mean(axis=1)[:, 0] < 1.0)
+        self.assertFalse(mesh.structured)
+        self.assertConforming(mesh, 10.0)
+        quadratic = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3, order=2).create()
+        with self.assertRaises(Exception):
+            quadratic.refine([0])
+
+    def test_mixed_mesh(self):
+        mesh = PlaneGridCreator(0, 0, 3.0, 3.0, 7, 7).create()
+        mesh.refine([10, 20])
+        self.assertEqual([3, 4], [block.nodes_number for block in mesh.blocks])
+        report = element_quality(mesh)
+        self.assertTrue(np.all(report["scaled_jacobian"] > 0.0))
+        triangles = mesh.blocks[0].elements
+        self.assertTrue(np.allclose(0.0, report["skew"][triangles]))
+        self.assertTrue(np.all(report["max_angle"][triangles] < 180.0))
+        target = PlaneGridCreator(0, 0, 3.0, 3.0, 11, 13).create()
+        transfer = FieldTransfer(mesh, target)
+        self.assertEqual(0, len(transfer.outside))
+        source = mesh.coordinates
+        expected = 1.0 + target.coordinates[:, 0] - 2.0 * target.coordinates[:, 1]
+        self.assertTrue(np.allclose(expected, transfer.transfer(1.0 + source[:, 0] - 2.0 * source[:, 1])))
+        located, _ = transfer.locator.locate(target.coordinates)
+        self.assertTrue(np.any(np.isin(located, triangles)))
@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+import numpy as np
+
+from mesh.creators.extrusion import ExtrusionCreator
+from mesh.creators.revolution import CylinderCreator, RevolutionCreator, SphericalCapCreator, \
+    TorisphericalCapCreator, cylinder_profile, flip_profile, join_profiles, torispherical_profile
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+
+
+def normals(mesh: Mesh):
+    """Normals of elements by the cross product of their first two edges and centers of elements"""
+    coordinates = mesh.coordinates
+    result = np.zeros((mesh.elements_count, 3))
+    centers = np.zeros((mesh.elements_count, 3))
+    for block in mesh.blocks:
+        points = coordinates[block.connectivity]
+        result[block.elements] = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 1])
+        centers[block.elements] = points.mean(axis=1)
+    return result, centers
+
+
+class TestSurfaceCreators(TestCase):
+    def assertSurface(self, mesh: Mesh, loops: int):
+        index = mesh.edge_index
+        self.assertLessEqual(index.valence.max(), 2)
+        self.assertEqual(loops, len(mesh.extract_boundary(classify=False)))
+        # types of nodes set by the creator are the ones of the classification by the boundary
+        undefined = np.full(mesh.nodes_count, NodeType.UNDEFINED.value)
+        self.assertTrue(np.array_equal(mesh._classify(undefined), mesh.node_types()))
+
+    def test_cylinder(self):
+        mesh = CylinderCreator(2.0, 3.0, 12, 4, z=1.0).create()
+        self.assertEqual(12 * 5, mesh.nodes_count)
+        self.assertEqual(12 * 4, mesh.elements_count)
+        coordinates = mesh.coordinates
+        self.assertTrue(np.allclose(2.0, np.hypot(coordinates[:, 0], coordinates[:, 1])))
+        self.assertAlmostEqual(1.0, coordinates[:, 2].min())
+        self.assertAlmostEqual(4.0, coordinates[:, 2].max())
+        self.assertSurface(mesh, 2)
+        directions, centers = normals(mesh)
+        self.assertTrue(np.all(np.sum(directions[:, :2] * centers[:, :2], axis=1) > 0.0))
+
+    def test_open_revolution(self):
+        mesh = RevolutionCreator(cylinder_profile(1.0, 1.0, 3), 4, angle=np.pi / 2).create()
+        self.assertEqual(3 * 5, mesh.nodes_count)
+        self.assertSurface(mesh, 1)
+        self.assertTrue(np.allclose((0.0, 1.0, 0.0), mesh.coordinates[4]))
+
+    def test_spherical_cap(self):
+        mesh = SphericalCapCreator(2.0, 1.0, 8, 5, z=3.0).create()
+        self.assertListEqual([("tri3", 8), ("quad4", 32)], [(b.name, len(b)) for b in mesh.blocks])
+        self.assertEqual(8 * 5 + 1, mesh.nodes_count)
+        center = np.array([0.0, 0.0, 3.0 + 1.0 - 2.0])
+        coordinates = mesh.coordinates
+        self.assertTrue(np.allclose(2.0, np.linalg.norm(coordinates - center, axis=1)))
+        self.assertAlmostEqual(4.0, coordinates[:, 2].max())
+        self.assertSurface(mesh, 1)
+        directions, centers = normals(mesh)
+        self.assertTrue(np.all(np.sum(directions * (centers - center), axis=1) > 0.0))
+        # the whole sphere is closed
+        sphere = SphericalCapCreator(1.0, 2.0, 6, 4).create()
+        self.assertEqual(6 * 3 + 2, sphere.nodes_count)
+        self.assertSurface(sphere, 0)
+
+    def test_torispherical_cap(self):
+        radius, crown, knuckle = 1.0, 2.0, 0.2
+        profile = torispherical_profile(radius, crown, knuckle, 4, 6)
+        self.assertEqual(11, len(profile))
+        self.assertTrue(np.allclose((radius, 0.0), profile[0]))
+        self.assertEqual(0.0, profile[-1, 0])
+        depth = crown - np.sqrt((crown - knuckle) ** 2 - (radius - knuckle) ** 2)
+        self.assertAlmostEqual(depth, profile[-1, 1])
+        self.assertTrue(np.all(np.diff(profile[:, 0]) < 0.0) and np.all(np.diff(profile[:, 1]) > 0.0))
+        self.assertTrue(np.allclose(knuckle, np.hypot(profile[:5, 0] - radius + knuckle, profile[:5, 1])))
+        self.assertTrue(np.allclose(crown, np.hypot(profile[4:, 0], profile[4:, 1] - depth + crown)))
+        mesh = TorisphericalCapCreator(radius, crown, knuckle, 16, 4, 6).create()
+        self.assertEqual(16 * 10 + 1, mesh.nodes_count)
+        self.assertSurface(mesh, 1)
+
+    def test_vessel(self):
+        head = torispherical_profile(1.0, 2.0, 0.2, 4, 6)
+        profile = join_profiles(flip_profile(head), cylinder_profile(1.0, 5.0, 11), head + (0.0, 5.0))
+        self.assertEqual(2 * 11 + 11 - 2, len(profile))
+        mesh = RevolutionCreator(profile, 24).create()
+        self.assertSurface(mesh, 0)
+        # the closed surface of the genus 0
+        self.assertEqual(2, mesh.nodes_count - len(mesh.edge_index) + mesh.elements_count)
+        self.assertFalse(mesh.materialized)
+
+    def test_extrusion(self):
+        angles = np.linspace(0.0, 2.0 * np.pi, 10, endpoint=False)
+        circle = np.column_stack((np.cos(angles), np.sin(angles)))
+        mesh = ExtrusionCreator(circle, (0.0, 0.0, 2.0), 3, closed=True).create()
+        self.assertEqual(10 * 4, mesh.nodes_count)
+        self.assertEqual(10 * 3, mesh.elements_count)
+        self.assertSurface(mesh, 2)
+        self.assertTrue(np.allclose((1.0, 0.0, 2.0), mesh.coordinates[3]))
+        strip = ExtrusionCreator(np.array([(0.0, 0.0), (1.0, 0.0), (3.0, 0.0)]), (0.0, 1.0), 2).create()
+        self.assertEqual(2, strip.coordinates.shape[1])
+        self.assertSurface(strip, 1)
+        points = strip.coordinates[strip.connectivity]
+        x, y = points[..., 0], points[..., 1]
+        areas = 0.5 * np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1)
+        self.assertTrue(np.all(areas > 0.0))
+        self.assertAlmostEqual(3.0, areas.sum())
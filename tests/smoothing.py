@@ -0,0 +1,98 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.quality import element_quality
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.transfinite import TransfiniteGridCreator
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+from mesh.smoothing import MeshSmoother, node_adjacency
+
+
+def perturbed(num_x: int, num_y: int, seed: int = 3):
+    """The uniform grid with randomly moved inner nodes and its original coordinates"""
+    mesh = PlaneGridCreator(0, 0, 2.0, 1.0, num_x, num_y).create()
+    coordinates = mesh.coordinates
+    inner = mesh.node_types() == NodeType.INTERNAl.value
+    generator = np.random.default_rng(seed)
+    moved = coordinates.copy()
+    moved[inner] += 0.3 * (generator.random((np.count_nonzero(inner), 2)) - 0.5) * (2.0 / (num_x - 1))
+    mesh.move_nodes(moved)
+    return mesh, coordinates
+
+
+class TestMeshSmoother(TestCase):
+    def test_adjacency(self):
+        mesh = PlaneGridCreator(0, 0, 2.0, 1.0, 4, 3).create()
+        adjacency = node_adjacency(mesh)
+        self.assertEqual(2 * len(mesh.edge_index), adjacency.nnz)
+        self.assertListEqual([2, 3, 2], np.diff(adjacency.indptr)[:3].tolist())
+        self.assertIs(adjacency, node_adjacency(mesh))
+
+    def test_uniform_grid(self):
+        # the uniform grid is restored by the laplacian and the area weighted smoothing
+        for method in ("laplacian", "area"):
+            mesh, original = perturbed(9, 5)
+            smoother = MeshSmoother(method, tolerance=1.0E-10, max_iterations=2000)
+            statistics = smoother.smooth(mesh)
+            self.assertTrue(statistics.converged, method)
+            self.assertTrue(np.allclose(original, mesh.coordinates, atol=1.0E-8), method)
+            self.assertTrue(mesh.structured)
+
+    def test_pinned(self):
+        mesh, _ = perturbed(9, 5)
+        before = mesh.coordinates
+        pinned = np.zeros(mesh.nodes_count, dtype=bool)
+        pinned[20] = True
+        MeshSmoother("laplacian", max_iterations=10).smooth(mesh, pinned=pinned)
+        after = mesh.coordinates
+        border = mesh.border().ravel() | pinned
+        self.assertTrue(np.array_equal(before[border], after[border]))
+        self.assertFalse(np.allclose(before[~border], after[~border]))
+        # FIXED nodes of generic meshes are pinned as well
+        generic = Mesh.from_arrays(before, mesh.connectivity)
+        generic.nodes[10].node_type = NodeType.FIXED
+        MeshSmoother("area", max_iterations=10).smooth(generic)
+        self.assertTrue(np.array_equal(before[10], generic.coordinates[10]))
+
+    def test_workers(self):
+        results = []
+        for workers in (1, 3):
+            mesh, _ = perturbed(17, 9)
+            mesh.cached("geometry", lambda: 1.0)
+            MeshSmoother("area", max_iterations=5, workers=workers).smooth(mesh)
+            results.append(mesh.coordinates)
+            self.assertNotIn("geometry", mesh._cache)
+            self.assertIn("adjacency", mesh._cache)
+        self.assertTrue(np.allclose(results[0], results[1]))
+
+    def test_jacobian(self):
+        creator = TransfiniteGridCreator(
+            top=lambda t: (t, 1.0 + 0.5 * np.sin(np.pi * t)),
+            bottom=lambda t: (t, 0.0),
+            left=lambda t: (0.3 * np.sin(np.pi * t), t),
+            right=lambda t: (1.0, t),
+            num_x=9,
+            num_y=9
+        )
+        mesh = creator.create()
+        before = element_quality(mesh)["scaled_jacobian"]
+        border = mesh.coordinates[mesh.border().ravel()]
+        statistics = MeshSmoother("jacobian", tolerance=1.0E-6, max_iterations=500).smooth(mesh)
+        after = element_quality(mesh)["scaled_jacobian"]
+        self.assertTrue(np.array_equal(border, mesh.coordinates[mesh.border().ravel()]))
+        self.assertGreater(after.min(), before.min())
+        self.assertGreater(after.mean(), before.mean())
+        self.assertGreater(statistics.iterations, 1)
+        # squares are ideal, so the descent restores the uniform grid as well
+        mesh, _ = perturbed(9, 5)
+        MeshSmoother("jacobian", tolerance=1.0E-8, max_iterations=500).smooth(mesh)
+        self.assertTrue(np.allclose(1.0, element_quality(mesh)["scaled_jacobian"], atol=1.0E-3))
+
+    def test_unsupported(self):
+        with self.assertRaises(Exception):
+            MeshSmoother("spring")
+        mesh = PlaneGridCreator(0, 0, 2.0, 1.0, 4, 3, order=2).create()
+        with self.assertRaises(Exception):
+            MeshSmoother().smooth(mesh)
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+import numpy as np
+
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.element import Element
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+from mesh.structured import StructuredMesh
+
+
+def generic(mesh: StructuredMesh) -> Mesh:
+    """Build the generic mesh with the same nodes and elements"""
+    result = Mesh()
+    nodes = [result.append_point(c, NodeType.UNDEFINED, check=False) for c in mesh.coordinates]
+    for row in mesh.connectivity:
+        result.append_element(Element([nodes[i] for i in row]))
+    return result
+
+
+class TestStructuredMesh(TestCase):
+    def setUp(self) -> None:
+        self.mesh = PlaneGridCreator(0, 0, 4.0, 3.0, 5, 4).create()
+
+    def test_lazy(self):
+        self.assertIsInstance(self.mesh, StructuredMesh)
+        self.assertEqual(20, self.mesh.nodes_count)
+        self.assertEqual(12, self.mesh.elements_count)
+        self.assertEqual(1.0, self.mesh.mean_edge_length())
+        self.assertEqual(0, len(self.mesh._nodes))
+        self.assertEqual(31, len(self.mesh.edge_index.edges))
+        self.assertEqual(0, len(self.mesh._nodes))
+        self.assertEqual(20, len(self.mesh.nodes))
+        self.assertTrue(self.mesh.structured)
+        self.assertTrue(np.allclose(generic(self.mesh).coordinates, self.mesh.coordinates))
+
+    def test_arithmetic(self):
+        reference = generic(self.mesh)
+        self.assertTrue(np.array_equal(reference.element_neighbors(), self.mesh.element_neighbors()))
+        self.assertEqual(reference.mean_edge_length(), self.mesh.mean_edge_length())
+        loop = self.mesh.extract_boundary()[0]
+        reference_loop = reference.extract_boundary()[0]
+        shift = list(reference_loop).index(loop[0])
+        self.assertListEqual(list(np.roll(reference_loop, -shift)), list(loop))
+        self.assertListEqual([4, 5, 7, 8], sorted(self.mesh.adjacent_elements(self.mesh.node_index(2, 2))))
+        self.assertListEqual([0], list(self.mesh.adjacent_elements(0)))
+        self.assertListEqual([5, 0], list(self.mesh.node_neighbors(self.mesh.node_index(1, 0)))[1:3])
+        self.assertEqual(14, np.count_nonzero(self.mesh.border()))
+
+    def test_materialized_geometry(self):
+        for node in self.mesh.nodes:
+            node.coords = [node.x, node.y, 1.0]
+        self.assertEqual(3, self.mesh.coordinates.shape[1])
+        self.assertEqual((4.0, 3.0, 0.0), self.mesh.sizes())
+        types = [n.node_type for n in self.mesh.nodes]
+        self.assertEqual(14, types.count(NodeType.BORDER))
+        self.assertTrue(self.mesh.structured)
+        self.mesh.append_element(Element(self.mesh.nodes[:3]))
+        self.assertFalse(self.mesh.structured)
+        self.assertEqual(13, len(self.mesh.elements))
+        self.assertEqual(13, len(self.mesh.element_neighbors()))
+
+    def test_copy(self):
+        copy = self.mesh.copy()
+        self.assertIsInstance(copy, StructuredMesh)
+        self.assertTrue(np.allclose(self.mesh.coordinates, copy.coordinates))
+        self.assertTrue(np.shares_memory(self.mesh.grid, copy.grid))
+        before = copy.coordinates
+        self.mesh.move_nodes(2.0 * before)
+        self.assertTrue(np.array_equal(before, copy.coordinates))
+        self.mesh.reverse_elements()
+        self.assertFalse(self.mesh.structured)
+        self.assertListEqual([1, 5, 4, 0], list(self.mesh.connectivity[0]))
+        self.assertListEqual([0, 4, 5, 1], list(copy.connectivity[0]))
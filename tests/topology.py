@@ -0,0 +1,110 @@
+from unittest import TestCase
+
+import numpy as np
+
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.creators.union import SimpleUnion
+from mesh.element import Element
+from mesh.mesh import Mesh
+from mesh.node import NodeType
+
+
+class TestEdgeIndex(TestCase):
+    def setUp(self) -> None:
+        self.num_x = 4
+        self.num_y = 3
+        self.mesh = PlaneGridCreator(0, 0, 3.0, 2.0, self.num_x, self.num_y).create()
+
+    def test_unique_edges(self):
+        index = self.mesh.edge_index
+        edges_count = self.num_x * (self.num_y - 1) + self.num_y * (self.num_x - 1)
+        self.assertEqual(edges_count, len(index))
+        self.assertTrue(np.all(index.edges[:, 0] < index.edges[:, 1]))
+        self.assertEqual(len(self.mesh.elements) * 4, np.sum(index.valence))
+        boundary_count = 2 * (self.num_x - 1) + 2 * (self.num_y - 1)
+        self.assertEqual(boundary_count, np.count_nonzero(index.boundary()))
+
+    def test_maps(self):
+        index = self.mesh.edge_index
+        connectivity = self.mesh.connectivity
+        for e, edges in enumerate(index.element_edges):
+            for j, edge in enumerate(edges):
+                pair = sorted((connectivity[e, j], connectivity[e, (j + 1) % 4]))
+                self.assertListEqual(pair, list(index.edges[edge]))
+                self.assertIn(e, index.edge_elements[edge])
+
+    def test_neighbors(self):
+        neighbors = self.mesh.element_neighbors()
+        connectivity = self.mesh.connectivity
+        for e, row in enumerate(neighbors):
+            for j, other in enumerate(row):
+                if other < 0:
+                    continue
+                self.assertIn(e, neighbors[other])
+                self.assertIn(connectivity[e, j], connectivity[other])
+                self.assertIn(connectivity[e, (j + 1) % 4], connectivity[other])
+        self.assertEqual(2 * (self.num_x - 1) + 2 * (self.num_y - 1), np.count_nonzero(neighbors < 0))
+
+    def test_mean_edge_length(self):
+        self.assertAlmostEqual(1.0, self.mesh.mean_edge_length())
+        self.assertTrue(np.allclose(self.mesh.edge_lengths(), 1.0))
+
+    def test_mixed_elements(self):
+        mesh = Mesh()
+        nodes = [mesh.append_point(c, NodeType.BORDER) for c in [(0, 0), (1, 0), (1, 1), (0, 1), (2, 0)]]
+        mesh.append_element(Element([nodes[0], nodes[1], nodes[2], nodes[3]]))
+        mesh.append_element(Element([nodes[1], nodes[4], nodes[2]]))
+        index = mesh.edge_index
+        self.assertEqual(6, len(index))
+        self.assertListEqual([-1, 1, -1, -1], list(mesh.element_neighbors()[0]))
+        self.assertListEqual([-1, -1, 0, -1], list(mesh.element_neighbors()[1]))
+        mesh.append_element(Element([nodes[2], nodes[4], mesh.append_point((2, 1), NodeType.BORDER)]))
+        self.assertEqual(8, len(mesh.edge_index))
+
+
+class TestBoundary(TestCase):
+    def test_grid_loop(self):
+        mesh = PlaneGridCreator(0, 0, 3.0, 2.0, 4, 3).create()
+        for node in mesh.nodes:
+            node.node_type = NodeType.UNDEFINED
+        loops = mesh.extract_boundary()
+        self.assertEqual(1, len(loops))
+        loop = loops[0]
+        self.assertEqual(10, len(loop))
+        self.assertEqual(10, len(set(loop)))
+        coordinates = mesh.coordinates
+        steps = coordinates[np.roll(loop, -1)] - coordinates[loop]
+        self.assertTrue(np.allclose(np.linalg.norm(steps, axis=1), 1.0))
+        # counterclockwise elements give a counterclockwise loop
+        area = 0.5 * np.sum(coordinates[loop, 0] * coordinates[np.roll(loop, -1), 1] -
+                            coordinates[np.roll(loop, -1), 0] * coordinates[loop, 1])
+        self.assertAlmostEqual(6.0, area)
+        types = [n.node_type for n in mesh.nodes]
+        self.assertEqual(10, types.count(NodeType.BORDER))
+        self.assertEqual(2, types.count(NodeType.INTERNAl))
+
+    def test_hole(self):
+        grid = PlaneGridCreator(0, 0, 3.0, 3.0, 4, 4).create()
+        mesh = Mesh()
+        nodes = [mesh.append_point(n.coords, NodeType.UNDEFINED, check=False) for n in grid.nodes]
+        index = {n: i for i, n in enumerate(grid.nodes)}
+        for i, e in enumerate(grid.elements):
+            if i != 4:  # the central element
+                mesh.append_element(Element([nodes[index[n]] for n in e.nodes]))
+        nodes[0].node_type = NodeType.FIXED
+        loops = mesh.extract_boundary()
+        self.assertListEqual([4, 12], sorted(len(loop) for loop in loops))
+        self.assertEqual(NodeType.FIXED, nodes[0].node_type)
+        self.assertTrue(all(n.node_type != NodeType.INTERNAl for n in nodes))
+
+    def test_union(self):
+        left = PlaneGridCreator(0, 0, 1.0, 1.0, 3, 3).create()
+        right = PlaneGridCreator(1.0, 0, 1.0, 1.0, 3, 3).create()
+        mesh = SimpleUnion([left, right]).create()
+        self.assertEqual(15, len(mesh.nodes))
+        types = [n.node_type for n in mesh.nodes]
+        self.assertEqual(12, types.count(NodeType.BORDER))
+        self.assertEqual(3, types.count(NodeType.INTERNAl))
+        loops = mesh.extract_boundary(classify=False)
+        self.assertEqual(1, len(loops))
+        self.assertEqual(12, len(loops[0]))
@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+import numpy as np
+
+from fem.transfer import FieldTransfer
+from mesh.creators.plane_grid import PlaneGridCreator
+
+
+class TestFieldTransfer(TestCase):
+    def setUp(self) -> None:
+        self.source = PlaneGridCreator(0, 0, 2.0, 1.0, 9, 5).create()
+        self.target = PlaneGridCreator(0, 0, 2.0, 1.0, 14, 6).create()
+
+    def test_linear_fields(self):
+        transfer = FieldTransfer(self.source, self.target)
+        self.assertEqual(0, len(transfer.outside))
+        source = self.source.coordinates
+        target = self.target.coordinates
+        values = np.stack((source[:, 0] + 2.0 * source[:, 1], 3.0 - source[:, 0]), axis=1)
+        expected = np.stack((target[:, 0] + 2.0 * target[:, 1], 3.0 - target[:, 0]), axis=1)
+        self.assertTrue(np.allclose(expected, transfer.transfer(values)))
+        fields = transfer.transfer_fields({"u": values[:, 0], "v": values})
+        self.assertEqual((len(target),), fields["u"].shape)
+        self.assertTrue(np.allclose(expected[:, 0], fields["u"]))
+        self.assertTrue(np.allclose(expected, fields["v"]))
+
+    def test_nearest_fallback(self):
+        target = PlaneGridCreator(-0.5, 0, 3.0, 1.0, 7, 3).create()
+        transfer = FieldTransfer(self.source, target)
+        coordinates = target.coordinates
+        outside = (coordinates[:, 0] < 0.0) | (coordinates[:, 0] > 2.0)
+        self.assertListEqual(list(np.flatnonzero(outside)), list(transfer.outside))
+        values = transfer.transfer(self.source.coordinates[:, 0])
+        self.assertTrue(np.allclose(np.clip(coordinates[:, 0], 0.0, 2.0), values))
+
+    def test_shared_locator(self):
+        first = FieldTransfer(self.source, self.target)
+        second = FieldTransfer(self.source, self.source, locator=first.locator)
+        values = np.arange(len(self.source.nodes), dtype=float)
+        self.assertTrue(np.allclose(values, second.transfer(values)))
+        with self.assertRaises(Exception):
+            FieldTransfer(self.target, self.source, locator=first.locator)
@@ -3,7 +3,8 @@ from unittest import TestCase
 
 import numpy as np
 
-from fem.element.transformer import PlaneBeamTransformer
+from fem.element.transformer import PlaneBeamTransformer, ShellElementTransformer
+from mesh.creators.plane_grid import PlaneGridCreator
 from mesh.node import Node, NodeType
 
 
@@ -42,3 +43,31 @@ class TestIsoQuad(TestCase):
         self.assertAlmostEqual(local_nodes[2].y, 0)
         inv = np.linalg.inv(transformer.transform_matrix())
 
+
+    def test_batch(self):
+        rng = np.random.default_rng(3)
+        coords = rng.random((5, 3, 2))
+        coords[:, 2] = 0.5 * (coords[:, 0] + coords[:, 1])
+        matrices, local, lengths = PlaneBeamTransformer.batch(coords)
+        for e in range(len(coords)):
+            nodes = [Node(coords=c, node_type=NodeType.BORDER, id=i) for i, c in enumerate(coords[e])]
+            transformer = PlaneBeamTransformer(nodes)
+            self.assertTrue(np.allclose(transformer.transform_matrix(), matrices[e]))
+            self.assertTrue(np.allclose([n.coords for n in transformer.local_nodes()], local[e]))
+        self.assertTrue(np.allclose(lengths, local[:, 1, 0]))
+        self.assertTrue(np.allclose(0.0, local[:, :, 1]))
+        self.assertTrue(np.allclose(coords, PlaneBeamTransformer.batch_to_global(matrices, coords[:, 0], local)))
+
+    def test_shell_batch(self):
+        mesh = PlaneGridCreator(0, 0, 2.0, 1.0, 5, 3).create()
+        for node in mesh.nodes:
+            node.coords = np.array([node.x, node.y * np.cos(0.3), node.y * np.sin(0.3) + 0.1 * node.x ** 2])
+        matrices, local = ShellElementTransformer.from_mesh(mesh, chunk=3)
+        for e, element in enumerate(mesh.elements):
+            transformer = ShellElementTransformer(element.nodes)
+            self.assertTrue(np.allclose(transformer.transform_matrix(), matrices[e]))
+            self.assertTrue(np.allclose([n.coords for n in transformer.local_nodes()], local[e]))
+        self.assertTrue(np.allclose(np.eye(3), np.matmul(matrices, np.swapaxes(matrices, 1, 2))))
+        self.assertTrue(np.allclose(0.0, local[:, :3, 2]))
+        plane, _ = ShellElementTransformer.batch(PlaneGridCreator(0, 0, 1.0, 1.0, 3, 3).create().coordinates[[[0, 3, 4]]])
+        self.assertTrue(np.allclose(np.eye(3), plane[0]))
@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+import numpy as np
+
+from mesh.creators.plane_grid import PlaneGridCreator
+from mesh.mesh import Mesh
+from mesh.transforms import lift, mirror, rotation, translation
+
+
+class TestTransforms(TestCase):
+    def setUp(self) -> None:
+        grid = PlaneGridCreator(0, 0, 2.0, 1.0, 3, 2).create()
+        self.mesh = Mesh.from_arrays(grid.coordinates, grid.connectivity)
+        self.coordinates = grid.coordinates
+
+    def test_helpers(self):
+        point = np.array([1.0, 2.0, 1.0])
+        self.assertTrue(np.allclose([3.0, 1.0, 1.0], translation((2.0, -1.0)) @ point))
+        self.assertTrue(np.allclose([-2.0, 1.0, 1.0], rotation(np.pi / 2) @ point))
+        self.assertTrue(np.allclose([1.0, 0.0, 1.0], rotation(np.pi, center=(1.0, 1.0)) @ point))
+        self.assertTrue(np.allclose([-1.0, 2.0, 1.0], mirror((1.0, 0.0)) @ point))
+        self.assertTrue(np.allclose([3.0, 2.0, 1.0], mirror((1.0, 0.0), (2.0, 0.0)) @ point))
+        self.assertTrue(np.allclose([1.0, 2.0, 5.0, 1.0], lift(5.0) @ point))
+        space = rotation(2.0 * np.pi / 3.0, axis=(1.0, 1.0, 1.0)) @ np.array([1.0, 0.0, 0.0, 1.0])
+        self.assertTrue(np.allclose([0.0, 1.0, 0.0, 1.0], space))
+
+    def test_matrices(self):
+        self.mesh.transform(translation((1.0, 2.0)))
+        self.assertTrue(np.allclose(self.coordinates + (1.0, 2.0), self.mesh.coordinates))
+        self.mesh.transform(2.0 * np.eye(2))
+        self.assertTrue(np.allclose(2.0 * self.coordinates + (2.0, 4.0), self.mesh.coordinates))
+        # the rotation in the space lifts plane coordinates
+        self.mesh.transform(rotation(np.pi / 2, axis=(1.0, 0.0, 0.0)))
+        self.assertEqual(3, self.mesh.coordinates.shape[1])
+        self.assertTrue(np.allclose(0.0, self.mesh.coordinates[:, 1]))
+        self.assertTrue(np.allclose(2.0 * self.coordinates[:, 1] + 4.0, self.mesh.coordinates[:, 2]))
+        with self.assertRaises(Exception):
+            self.mesh.transform(np.eye(2))
+
+    def test_lifted(self):
+        self.mesh.transform(lift(2.0))
+        # affine matrices of the plane don't fit the space, linear ones are explicit
+        with self.assertRaises(Exception):
+            self.mesh.transform(translation((5.0, 0.0)))
+        with self.assertRaises(Exception):
+            self.mesh.transform(lift(2.0))
+        self.assertEqual(3, self.mesh.coordinates.shape[1])
+        self.assertTrue(np.allclose(self.coordinates, self.mesh.coordinates[:, :2]))
+        self.mesh.transform(translation((5.0, 0.0, 1.0)))
+        self.assertTrue(np.allclose(self.coordinates + (5.0, 0.0), self.mesh.coordinates[:, :2]))
+        self.assertTrue(np.allclose(3.0, self.mesh.coordinates[:, 2]))
+        self.mesh.transform(translation((5.0, 0.0)), affine=False)  # the shear x + 5 z
+        self.assertTrue(np.allclose(self.coordinates[:, 0] + 20.0, self.mesh.coordinates[:, 0]))
+        with self.assertRaises(Exception):
+            self.mesh.transform(np.eye(2), affine=False)
+
+    def test_callable(self):
+        self.mesh.cached("geometry", lambda: 1.0)
+        self.mesh.transform(lambda c: np.column_stack((c, np.sum(c ** 2, axis=1))))
+        self.assertTrue(np.allclose(np.sum(self.coordinates ** 2, axis=1), self.mesh.coordinates[:, 2]))
+        self.assertNotIn("geometry", self.mesh._cache)
+        self.assertIn("groups", self.mesh._cache)
+        with self.assertRaises(Exception):
+            self.mesh.transform(lambda c: c[:-1])
+
+    def test_lazy_meshes(self):
+        structured = PlaneGridCreator(0, 0, 2.0, 1.0, 3, 2).create()
+        copy = self.mesh.copy()
+        for mesh in (structured, copy):
+            mesh.transform(lift(1.0))
+            self.assertTrue(np.allclose(1.0, mesh.coordinates[:, 2]))
+        self.assertTrue(structured.structured)
+        self.assertFalse(copy.materialized)